@@ -9,3 +9,4 @@ DEFAULT_NAMESPACE: str = "skaha-workload"
 DEFAULT_KUEUE: str = "skaha-local-queue"
 DEFAULT_KUEUE_PRIORITY: str = "high"
 DEFAULT_JOB_PREFIX: str = "kueuer-job"
+RUN_ID_LABEL: str = "kueuer.opencadc.org/run-id"
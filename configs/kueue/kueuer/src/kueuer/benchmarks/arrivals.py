@@ -0,0 +1,264 @@
+"""Arrival processes: when the jobs of an experiment are submitted.
+
+A process spreads the jobs of an experiment over time at a target rate,
+instead of submitting them all at once:
+
+- `burst`: every job at once, the default.
+- `poisson`: exponential gaps at `rate` jobs/s.
+- `ramp`: the rate rises linearly from 0 to twice `rate`, averaging `rate`,
+  so one experiment sweeps the load.
+- `bursts`: `rate * period` jobs at once every `period` seconds.
+- `diurnal`: Poisson whose rate follows a sine of `period` seconds, between
+  `1 - AMPLITUDE` and `1 + AMPLITUDE` times `rate`.
+
+Admission latency is then binned by the load the jobs were offered, see
+`curve`, to find the highest arrival rate Kueue sustains.
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from kueuer.benchmarks import phases, saturation, submit
+
+DEFAULT_PROCESS: str = "burst"
+DEFAULT_PERIOD: float = 60.0
+DEFAULT_BINS: int = 10
+# Relative swing of the diurnal rate around its mean.
+AMPLITUDE: float = 0.8
+
+
+def _burst(
+    count: int, rate: float, period: float, rng: random.Random
+) -> Iterator[float]:
+    yield from (0.0 for _ in range(count))
+
+
+def _poisson(
+    count: int, rate: float, period: float, rng: random.Random
+) -> Iterator[float]:
+    offset: float = 0.0
+    for _ in range(count):
+        yield offset
+        offset += rng.expovariate(rate)
+
+
+def _ramp(
+    count: int, rate: float, period: float, rng: random.Random
+) -> Iterator[float]:
+    # Rate 2 * rate * t / T submits count jobs over T = count / rate, the
+    # i-th at the inverse of the cumulative count, T * sqrt(i / count).
+    span: float = count / rate
+    for num in range(count):
+        yield span * math.sqrt(num / count)
+
+
+def _bursts(
+    count: int, rate: float, period: float, rng: random.Random
+) -> Iterator[float]:
+    size: int = max(round(rate * period), 1)
+    for num in range(count):
+        yield (num // size) * period
+
+
+def _diurnal(
+    count: int, rate: float, period: float, rng: random.Random
+) -> Iterator[float]:
+    # Thinning: candidates at the peak rate, kept in proportion to the rate.
+    peak: float = rate * (1 + AMPLITUDE)
+    offset: float = 0.0
+    emitted: int = 0
+    while emitted < count:
+        current: float = rate * (
+            1 + AMPLITUDE * math.sin(2 * math.pi * offset / period)
+        )
+        if rng.random() * peak <= current:
+            yield offset
+            emitted += 1
+        offset += rng.expovariate(peak)
+
+
+PROCESSES: Dict[str, Callable[[int, float, float, random.Random], Iterator[float]]] = {
+    "burst": _burst,
+    "poisson": _poisson,
+    "ramp": _ramp,
+    "bursts": _bursts,
+    "diurnal": _diurnal,
+}
+
+
+@dataclass(frozen=True)
+class Process:
+    """How the jobs of an experiment arrive.
+
+    Attributes:
+        name (str): One of `PROCESSES`.
+        rate (Optional[float]): Mean jobs per second, required unless `burst`.
+        period (float): Seconds between bursts, or of a diurnal cycle.
+        limit (Optional[float]): Client-side rate limit in jobs/s, see
+            `submit.TokenBucket`, None for none.
+        seed (Optional[int]): Seed of the random gaps.
+    """
+
+    name: str = DEFAULT_PROCESS
+    rate: Optional[float] = None
+    period: float = DEFAULT_PERIOD
+    limit: Optional[float] = None
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.name not in PROCESSES:
+            raise ValueError(
+                f"Unknown arrival process {self.name}, use one of {list(PROCESSES)}"
+            )
+        if self.name != "burst" and not (self.rate and self.rate > 0):
+            raise ValueError(f"Arrival process {self.name} needs a positive rate")
+        if self.period <= 0 or (self.limit is not None and self.limit <= 0):
+            raise ValueError("Arrival period and limit must be positive")
+
+    @property
+    def paced(self) -> bool:
+        """True unless every job is submitted at once, as fast as possible."""
+        return self.name != "burst" or self.limit is not None
+
+    def offsets(self, count: int) -> List[float]:
+        """Seconds from the start at which each of `count` jobs is due."""
+        rng = random.Random(self.seed)
+        process = PROCESSES[self.name]
+        return list(process(count, self.rate or 0.0, self.period, rng))
+
+    def bucket(self) -> Optional[submit.TokenBucket]:
+        """Token bucket enforcing `limit`, if any."""
+        return submit.TokenBucket(self.limit) if self.limit else None
+
+    def label(self) -> str:
+        if self.name == "burst":
+            text: str = "burst"
+        else:
+            text = f"{self.name} at {self.rate} jobs/s"
+        if self.name in ("bursts", "diurnal"):
+            text += f" every {self.period}s"
+        return text + (f", limited to {self.limit} jobs/s" if self.limit else "")
+
+    def record(self) -> Dict[str, Any]:
+        """Result columns describing the process."""
+        return {
+            "arrival_process": self.name,
+            "arrival_rate": self.rate,
+            "arrival_period": self.period
+            if self.name in ("bursts", "diurnal")
+            else None,
+            "arrival_limit": self.limit,
+        }
+
+
+def _rate(offsets: List[float]) -> Optional[float]:
+    """Jobs per second over the span of their offsets, None for a burst."""
+    span: float = max(offsets) - min(offsets) if offsets else 0.0
+    return (len(offsets) - 1) / span if span > 0 else None
+
+
+def latency(timeline: phases.Timeline) -> Optional[float]:
+    """Seconds from the creation of a job until it may start: its admission
+    with Kueue, the scheduling of its pod without."""
+    ready = timeline.admitted or timeline.scheduled
+    if timeline.created is None or ready is None:
+        return None
+    return (ready - timeline.created).total_seconds()
+
+
+def curve(
+    offsets: Dict[str, float],
+    records: List[submit.Submission],
+    timelines: Dict[str, phases.Timeline],
+    bins: int = DEFAULT_BINS,
+) -> List[Dict[str, Any]]:
+    """Admission latency as a function of the offered load.
+
+    Jobs are split in `bins` groups of consecutive arrivals. Each group gets
+    the rate it was offered at, the rate it was actually submitted at, and
+    the percentiles of its admission latency, see `latency`.
+
+    Args:
+        offsets (Dict[str, float]): Scheduled offset of every job, by name.
+        records (List[submit.Submission]): Submissions, with their lag.
+        timelines (Dict[str, phases.Timeline]): Timelines from `phases.collect`.
+        bins (int): Number of groups.
+
+    Returns:
+        List[Dict[str, Any]]: One row per group, earliest first.
+    """
+    sent: Dict[str, float] = {
+        record.name: offsets[record.name] + record.lag
+        for record in records
+        if record.ok and record.name in offsets
+    }
+    names: List[str] = sorted(sent, key=lambda name: offsets[name])
+    size: int = max(math.ceil(len(names) / bins), 1)
+    points: List[Dict[str, Any]] = []
+    for start in range(0, len(names), size):
+        group: List[str] = names[start : start + size]
+        latencies: List[float] = sorted(
+            value
+            for name in group
+            if name in timelines and (value := latency(timelines[name])) is not None
+        )
+        points.append(
+            {
+                "bin": len(points),
+                "jobs": len(group),
+                "start": offsets[group[0]],
+                "offered_rate": _rate([offsets[name] for name in group]),
+                "achieved_rate": _rate([sent[name] for name in group]),
+                "latency_p50": submit.percentile(latencies, 0.50),
+                "latency_p99": submit.percentile(latencies, 0.99),
+            }
+        )
+    return points
+
+
+def sustainable(points: List[Dict[str, Any]]) -> Optional[float]:
+    """Highest offered rate before the p99 admission latency reaches
+    `saturation.LATENCY_FACTOR` times the one at the lowest offered rate."""
+    loads = sorted(
+        (point for point in points if point["offered_rate"] is not None),
+        key=lambda point: point["offered_rate"],
+    )
+    if not loads or loads[0]["latency_p99"] is None:
+        return None
+    reference: float = loads[0]["latency_p99"]
+    best: Optional[float] = None
+    for point in loads:
+        p99: Optional[float] = point["latency_p99"]
+        if (
+            p99 is not None
+            and reference
+            and p99 >= saturation.LATENCY_FACTOR * reference
+        ):
+            break
+        best = point["offered_rate"]
+    return best
+
+
+def summary(
+    offsets: Dict[str, float],
+    records: List[submit.Submission],
+    points: List[Dict[str, Any]],
+) -> Dict[str, Optional[float]]:
+    """Offered and achieved submission rates, dispatch lag and the
+    sustainable rate of an experiment, as result columns."""
+    lags: List[float] = sorted(record.lag for record in records)
+    return {
+        "offered_rate": _rate(list(offsets.values())),
+        "achieved_rate": _rate(
+            [
+                offsets[record.name] + record.lag
+                for record in records
+                if record.ok and record.name in offsets
+            ]
+        ),
+        "dispatch_lag_p50": submit.percentile(lags, 0.50),
+        "dispatch_lag_p99": submit.percentile(lags, 0.99),
+        "sustainable_rate": sustainable(points),
+    }
@@ -1,22 +1,153 @@
 """Benchmark module for comparing Kubernetes job execution with and without Kueue."""
 
+import asyncio
 import math
+import threading
 import time
+from dataclasses import asdict
 from datetime import datetime
-from time import sleep
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import typer
-from kubernetes import client, config
 
-from kueuer.benchmarks import DEFAULT_JOBSPEC_FILEPATH, analyze, k8s, track
-from kueuer.utils import io
+from kueuer.benchmarks import (
+    DEFAULT_JOBSPEC_FILEPATH,
+    analyze,
+    arrivals,
+    campaign,
+    confidence,
+    k8s,
+    metadata,
+    mixes,
+    phases,
+    quiesce,
+    saturation,
+    scenario,
+    submit,
+    track,
+)
+from kueuer.utils import io, kube, stats
 from kueuer.utils.logging import logger
 
 benchmark_cli: typer.Typer = typer.Typer(help="Launch Benchmarks")
 
 
-def experiment(
+def run_id(count: int, use_kueue: bool) -> str:
+    """Run id of an experiment, also the prefix of its job names."""
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return f"{'kueue' if use_kueue else 'direct'}-{timestamp}-{count}"
+
+
+async def _launch(
+    job: Dict[str, Any],
+    prefix: str,
+    count: int,
+    concurrency: int,
+    arrival: Optional[arrivals.Process],
+    mix: Optional[mixes.Mix] = None,
+) -> Tuple[submit.Report, Dict[str, float], Dict[str, mixes.Draw]]:
+    """Submit the jobs of an experiment, returning the scheduled offset of
+    every job when an arrival process paces them or a mix shapes them, and
+    the draw of every job of a mix."""
+    arrival = arrival or arrivals.Process()
+    if not arrival.paced and mix is None:
+        return await k8s.apply(job, prefix, count, concurrency), {}, {}
+    if arrival.paced:
+        logger.info("Arrivals: %s", arrival.label())
+    sampled = mix.sample(count) if mix is not None else None
+    report, offsets = await k8s.launch(
+        job, prefix, count, arrival, concurrency, sampled
+    )
+    draws: Dict[str, mixes.Draw] = {
+        f"{prefix}-{num}": draw for num, draw in enumerate(sampled or [])
+    }
+    return report, offsets, draws
+
+
+def _shapes(
+    result: Dict[str, Any],
+    mix: Optional[mixes.Mix],
+    draws: Dict[str, mixes.Draw],
+    timelines: Dict[str, phases.Timeline],
+    times: Dict[str, Any],
+    shapesfile: Optional[str],
+) -> None:
+    """Add the admission latency of every shape class of a mix to a result,
+    and save its breakdown by shape class."""
+    if mix is None:
+        return
+    rows = mixes.breakdown(draws, timelines, times)
+    result["job_mix"] = mix.name
+    for row in rows:
+        for key in ("jobs", "latency_p50", "latency_p99"):
+            result[f"shape_{row['shape']}_{key}"] = row[key]
+        logger.info(
+            "Shape %-10s %s jobs, admitted p50 %ss, p99 %ss, max %ss",
+            row["shape"],
+            row["jobs"],
+            row["latency_p50"],
+            row["latency_p99"],
+            row["latency_max"],
+        )
+    if shapesfile:
+        io.save_performance_to_csv(
+            [{"run_id": result["run_id"], **row} for row in rows], shapesfile
+        )
+
+
+def _timings(
+    result: Dict[str, Any],
+    times: Dict[str, Any],
+    timelines: Dict[str, phases.Timeline],
+    draws: Dict[str, mixes.Draw],
+    jobsfile: str,
+) -> None:
+    """Append the timings of every job of an experiment to `jobsfile`."""
+    rows: List[Dict[str, Any]] = []
+    for name in sorted(timelines.keys() | times.keys()):
+        timing = times.get(name)
+        rows.append(
+            {
+                "run_id": result["run_id"],
+                "use_kueue": result["use_kueue"],
+                "job_count": result["job_count"],
+                "shape": draws[name].shape if name in draws else None,
+                "duration": timing[2] if timing else None,
+                **timelines.get(name, phases.Timeline(name)).record(),
+            }
+        )
+    io.save_jobs_to_csv(rows, jobsfile)
+
+
+def _load(
+    result: Dict[str, Any],
+    arrival: Optional[arrivals.Process],
+    offsets: Dict[str, float],
+    submission: submit.Report,
+    timelines: Dict[str, phases.Timeline],
+    loadfile: Optional[str],
+) -> None:
+    """Add the offered and achieved rates of paced arrivals to a result, and
+    save its admission latency by offered load."""
+    if arrival is None or not arrival.paced or not offsets:
+        return
+    points = arrivals.curve(offsets, submission.records, timelines)
+    result.update(arrival.record())
+    result.update(arrivals.summary(offsets, submission.records, points))
+    if loadfile:
+        io.save_performance_to_csv(
+            [{"run_id": result["run_id"], **point} for point in points], loadfile
+        )
+    logger.info(
+        "Offered %s jobs/s, achieved %s jobs/s, sustainable up to %s jobs/s",
+        result["offered_rate"],
+        result["achieved_rate"],
+        result["sustainable_rate"],
+    )
+
+
+async def run_experiment(
     count: int,
     duration: int,
     cores: int,
@@ -27,9 +158,23 @@ def experiment(
     use_kueue: bool = False,
     kueue: Optional[str] = None,
     priority: Optional[str] = None,
+    concurrency: int = submit.DEFAULT_CONCURRENCY,
+    timeout: Optional[int] = None,
+    jobsfile: Optional[str] = None,
+    drain: bool = True,
+    prefix: Optional[str] = None,
+    arrival: Optional[arrivals.Process] = None,
+    loadfile: Optional[str] = None,
+    mix: Optional[mixes.Mix] = None,
+    shapesfile: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Run a single experiment with the specified configuration.
 
+    The job watch is established before the first job is submitted and runs
+    alongside the submission, so jobs finishing early are timed as they
+    happen. Without `drain`, the caller waits for the pods to be removed,
+    e.g. with `settle`, and can overlap that with other work.
+
     Args:
         job_count: Number of jobs to create
         job_duration: Duration of each job in seconds
@@ -41,12 +186,24 @@ def experiment(
         use_kueue: Whether to use Kueue for job queueing
         kueue_queue: Kueue queue name (required if use_kueue is True)
         kueue_priority: Kueue priority (optional, used if use_kueue is True)
+        concurrency: Maximum number of job creation requests in flight
+        timeout: Seconds to track jobs before giving up, unbounded if None
+        jobsfile: Path to append per-job timings to, not saved if None
+        drain: Wait until the pods of the experiment are removed
+        prefix: Run id of the experiment, see `run_id`
+        arrival: When each job is submitted, all at once if None
+        loadfile: Path to append the admission latency by offered load of
+            paced arrivals to, not saved if None
+        mix: Shapes and durations of the jobs, replacing `duration`, `cores`,
+            `ram` and `storage`, see `mixes.Mix`
+        shapesfile: Path to append the results by shape class of a mix to,
+            not saved if None
 
     Returns:
         Dict containing experiment results and timing information
     """
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    prefix = f"{'kueue' if use_kueue else 'direct'}-{timestamp}-{count}"
+    prefix = prefix or run_id(count, use_kueue)
     logger.info("=" * 80)
     logger.info("Starting experiment with %d jobs, duration %ds", count, duration)
     logger.info("Configuration: %s", "With Kueue" if use_kueue else "Direct Kubernetes")
@@ -63,26 +220,65 @@ def experiment(
 
     # Start measuring time
     start_time = time.time()
+    listed: int = sum(kube.transferred.values())
+    connections: Dict[str, int] = kube.connections()
 
-    # Execute the launcher
-    k8s.run(
-        filepath=filepath,
-        namespace=namespace,
-        prefix=prefix,
-        jobs=count,
-        duration=duration,
-        cores=cores,
-        ram=ram,
-        storage=storage,
-        kueue=kueue,
-        priority=priority,
+    # Watch the jobs before they exist, then submit them while tracking
+    loop = asyncio.get_running_loop()
+    tracker = track.JobTracker(prefix, "Complete")
+    ready = threading.Event()
+    stop = threading.Event()
+    tracking = loop.run_in_executor(
+        None,
+        partial(
+            track.jobs,
+            namespace,
+            prefix,
+            "Complete",
+            run_id=prefix,
+            tracker=tracker,
+            timeout=timeout,
+            expected=[f"{prefix}-{num}" for num in range(count)],
+            ready=ready,
+            stop=stop,
+        ),
     )
+    try:
+        while not ready.is_set() and not tracking.done():
+            await asyncio.sleep(0.01)
+        if not ready.is_set():
+            await tracking
+
+        # Execute the launcher
+        job = k8s.manifest(
+            filepath,
+            namespace,
+            duration,
+            cores,
+            ram,
+            storage,
+            kueue,
+            priority,
+            run_id=prefix,
+        )
+        submission, offsets, draws = await _launch(
+            job, prefix, count, concurrency, arrival, mix
+        )
+    except BaseException:
+        # The watch would otherwise wait for jobs that were never submitted
+        stop.set()
+        raise
+    tracker.abandon(record.name for record in submission.records if not record.ok)
+    if tracker.finished:
+        stop.set()
 
     # Track jobs to completion and get timing statistics
     logger.info("Jobs launched, tracking completion...")
-    times = track.jobs(namespace, prefix, "Complete")
+    times = await tracking
     logger.info("All jobs completed, computing statistics...")
-    stats = track.compute_statistics(times)
+    stats = tracker.statistics.result()
+    # Jobs, workloads and pods still exist until the cleanup below.
+    timelines = await loop.run_in_executor(None, phases.collect, namespace, prefix)
 
     # End time measurement
     end_time = time.time()
@@ -91,6 +287,7 @@ def experiment(
     # Prepare result
     result: Dict[str, Optional[Any]] = {
         "timestamp": timestamp,
+        "run_id": prefix,
         "job_count": count,
         "use_kueue": use_kueue,
         "kueue_queue": kueue if use_kueue else None,
@@ -118,18 +315,133 @@ def experiment(
         "std_dev_time_from_creation_completion": stats.get(
             "std_dev_time_from_creation_completion"
         ),
+        "p90_time_from_creation_completion": stats.get(
+            "p90_time_from_creation_completion"
+        ),
+        "p95_time_from_creation_completion": stats.get(
+            "p95_time_from_creation_completion"
+        ),
+        "p99_time_from_creation_completion": stats.get(
+            "p99_time_from_creation_completion"
+        ),
+        "max_time_from_creation_completion": stats.get(
+            "max_time_from_creation_completion"
+        ),
+        **submission.summary(),
+        **tracker.summary(),
+        **phases.summary(timelines),
     }
+    _load(result, arrival, offsets, submission, timelines, loadfile)
+    _shapes(result, mix, draws, timelines, times, shapesfile)
+
+    if jobsfile:
+        _timings(result, times, timelines, draws, jobsfile)
 
     logger.info("Experiment completed in %.2fs", total_execution_time)
+    logger.info("Submission throughput: %.2f jobs/s", submission.throughput)
     total = result["total_time_from_first_creation_to_last_completion"]
     logger.info("Total time from first creation to last completion: %.2fs", total)
+    for name, _begin, _end in phases.PHASES:
+        logger.info(
+            "Phase %-10s p50 %ss, p90 %ss, p99 %ss",
+            name,
+            result[f"phase_{name}_p50"],
+            result[f"phase_{name}_p90"],
+            result[f"phase_{name}_p99"],
+        )
 
     # Cleanup jobs
     logger.info("Cleaning up jobs...")
-    k8s.delete_jobs(namespace, prefix)
+    cleanup_start = time.time()
+    await loop.run_in_executor(
+        None,
+        partial(
+            k8s.delete_jobs,
+            namespace,
+            prefix,
+            run_id=prefix,
+            concurrency=concurrency,
+            wait=False,
+        ),
+    )
+    result["cleanup_time"] = time.time() - cleanup_start
+    result["objects_listed"] = sum(kube.transferred.values()) - listed
+    for key, value in kube.connections().items():
+        result[f"api_{key}"] = value - connections[key]
+    logger.info(
+        "API requests: %s over %s new connections (%s reused)",
+        result["api_requests"],
+        result["api_connections"],
+        result["api_reused"],
+    )
+    if drain:
+        await settle(result)
     return result
 
 
+async def settle(
+    result: Dict[str, Any],
+    wait: int = 0,
+    baseline: Optional[quiesce.Snapshot] = None,
+    clusterqueue: Optional[str] = None,
+    timeout: float = quiesce.DEFAULT_TIMEOUT,
+) -> None:
+    """Wait for the pods of an experiment to drain and the cluster to settle.
+
+    Args:
+        result: Experiment result, its `drain_time` and `settle_time` are set
+        wait: Minimum time to wait in seconds
+        baseline: Load before benchmarking, only the pods of the experiment
+            are waited for if None
+        clusterqueue: ClusterQueue whose usage must return to the baseline
+        timeout: Longest time to wait for the cluster to settle in seconds
+    """
+    loop = asyncio.get_running_loop()
+    start = time.time()
+    namespace: str = result["namespace"]
+
+    async def quiet() -> None:
+        result["drain_time"] = await loop.run_in_executor(
+            None, partial(k8s.drain, namespace, run_id=result["run_id"])
+        )
+        settled: Optional[float] = 0.0
+        if baseline is not None:
+            settled = await loop.run_in_executor(
+                None,
+                partial(quiesce.wait, namespace, baseline, clusterqueue, timeout),
+            )
+        result["settle_time"] = time.time() - start if settled is not None else None
+
+    await asyncio.gather(asyncio.sleep(wait), quiet())
+
+
+async def snapshot(
+    clusterqueue: Optional[str], controller: Optional[str], resultsfile: str
+) -> str:
+    """Capture the cluster configuration and save it next to the results.
+
+    Args:
+        clusterqueue: ClusterQueue the experiments submit to
+        controller: Kueue controller configuration file, read from the
+            cluster if None
+        resultsfile: Path of the results
+
+    Returns:
+        Content hash of the configuration, for the `metadata_hash` column
+    """
+    captured = await asyncio.get_running_loop().run_in_executor(
+        None, metadata.capture, clusterqueue, controller
+    )
+    digest = metadata.digest(captured)
+    io.save_metadata(digest, captured, resultsfile)
+    return digest
+
+
+def experiment(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+    """Run a single experiment to completion, see `run_experiment`."""
+    return asyncio.run(run_experiment(*args, **kwargs))
+
+
 def benchmark(
     counts: List[int],
     duration: int,
@@ -142,6 +454,19 @@ def benchmark(
     priority: Optional[str],
     resultsfile: str,
     wait: int,
+    concurrency: int = submit.DEFAULT_CONCURRENCY,
+    timeout: Optional[int] = None,
+    settle_timeout: float = quiesce.DEFAULT_TIMEOUT,
+    repeat: int = 1,
+    min_repeat: int = 3,
+    tolerance: float = confidence.DEFAULT_TOLERANCE,
+    level: float = stats.DEFAULT_CONFIDENCE,
+    search: bool = False,
+    resolution: float = saturation.DEFAULT_RESOLUTION,
+    resume: bool = False,
+    controller: Optional[str] = None,
+    arrival: Optional[arrivals.Process] = None,
+    mix: Optional[mixes.Mix] = None,
 ) -> List[Dict[str, Any]]:
     """
     Run a complete benchmark comparing direct Kubernetes jobs vs Kueue jobs.
@@ -156,40 +481,154 @@ def benchmark(
         template_file: Path to the job template file
         kueue_queue: Kueue queue name
         kueue_priority: Kueue priority
-        results_file: Path to save results CSV
-        wait_between_runs: Time to wait between experiment runs in seconds
+        results_file: Path to save results CSV, per-job timings are saved next
+            to it
+        wait_between_runs: Minimum time to wait between experiment runs in seconds
+        concurrency: Maximum number of job creation requests in flight
+        timeout: Seconds to track each experiment before giving up
+        settle_timeout: Longest time to wait for the cluster to settle between
+            experiment runs in seconds
+        repeat: Maximum number of repetitions of every experiment, confidence
+            intervals are saved next to the results when above 1
+        min_repeat: Repetitions before checking the confidence intervals
+        tolerance: Stop repeating an experiment once the confidence interval of
+            every metric is narrower than this fraction of its mean, 0 to
+            always run `repeat` repetitions
+        level: Confidence level of the intervals
+        search: Search the saturation point between the smallest and largest
+            job count instead of running every count, it is saved next to the
+            results
+        resolution: Relative precision of the saturation point
+        resume: Continue the campaign saved next to the results, skipping
+            finished experiments and deleting the jobs of interrupted ones
+        controller: Kueue controller configuration file, read from the cluster
+            if None, see `metadata.capture`
+        arrival: When the jobs of each experiment are submitted, all at once
+            if None, the admission latency by load is saved next to the results
+        mix: Shapes and durations of the jobs, every job alike if None, the
+            results by shape class are saved next to the results
+
+    Raises:
+        ValueError: If the campaign to resume was run with another configuration
 
     Returns:
         List of dictionaries containing all experiment results
     """
-    results: List[Dict[str, Optional[Any]]] = []
-
-    # Ensure job counts are sorted
-    counts = sorted(counts)
-
-    for count in counts:
-        # Run without Kueue
-        result = experiment(
-            count=count,
+    return asyncio.run(
+        _benchmark(
+            counts=counts,
             duration=duration,
             cores=cores,
             ram=ram,
             storage=storage,
             namespace=namespace,
             filepath=filepath,
-            use_kueue=False,
+            kueue=kueue,
+            priority=priority,
+            resultsfile=resultsfile,
+            wait=wait,
+            concurrency=concurrency,
+            timeout=timeout,
+            settle_timeout=settle_timeout,
+            repeat=repeat,
+            min_repeat=min_repeat,
+            tolerance=tolerance,
+            level=level,
+            search=search,
+            resolution=resolution,
+            resume=resume,
+            controller=controller,
+            arrival=arrival,
+            mix=mix,
         )
-        results.append(result)
+    )
+
+
+async def _benchmark(
+    counts: List[int],
+    duration: int,
+    cores: int,
+    ram: int,
+    storage: int,
+    namespace: str,
+    filepath: str,
+    kueue: Optional[str],
+    priority: Optional[str],
+    resultsfile: str,
+    wait: int,
+    concurrency: int,
+    timeout: Optional[int],
+    settle_timeout: float,
+    repeat: int,
+    min_repeat: int,
+    tolerance: float,
+    level: float,
+    search: bool,
+    resolution: float,
+    resume: bool,
+    controller: Optional[str],
+    arrival: Optional[arrivals.Process] = None,
+    mix: Optional[mixes.Mix] = None,
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Optional[Any]]] = []
+    state = campaign.begin(
+        io.sibling(resultsfile, ".campaign.json"),
+        {
+            "counts": sorted(counts),
+            "duration": duration,
+            "cores": cores,
+            "ram": ram,
+            "storage": storage,
+            "namespace": namespace,
+            "filepath": filepath,
+            "kueue": kueue,
+            "priority": priority,
+            "repeat": repeat,
+            "min_repeat": min_repeat,
+            "tolerance": tolerance,
+            "level": level,
+            "search": search,
+            "resolution": resolution,
+            # Only paced campaigns record it, so older ones still resume
+            **(arrival.record() if arrival and arrival.paced else {}),
+            **({"mix": asdict(mix)} if mix else {}),
+        },
+        resume,
+    )
+    await asyncio.get_running_loop().run_in_executor(None, state.cleanup, namespace)
 
-        # Save intermediate results
-        io.save_performance_to_csv(results, resultsfile)
+    # Load on the cluster before benchmarking, to wait for between experiments
+    loop = asyncio.get_running_loop()
+    clusterqueue = (
+        await loop.run_in_executor(None, k8s.clusterqueue, kueue, namespace)
+        if kueue
+        else None
+    )
+    baseline = await loop.run_in_executor(
+        None, quiesce.snapshot, namespace, clusterqueue
+    )
+    logger.info("Baseline: %s", baseline)
+    digest = await snapshot(clusterqueue, controller, resultsfile)
 
-        # Wait between experiments
-        logger.info("Waiting %ss before next experiment...", wait)
-        sleep(wait)
+    # Results are saved once the cluster settled after them, for settle_time
+    previous: Optional[Dict[str, Any]] = None
 
-        # Run with Kueue
-        kueue_result = experiment(
+    async def run(count: int, use_kueue: bool, repetition: int) -> Dict[str, Any]:
+        nonlocal previous
+        result = state.result(count, use_kueue, repetition)
+        if result is not None:
+            logger.info("Skipping finished %s", result["run_id"])
+            results.append(result)
+            return result
+        if previous is not None:
+            logger.info("Waiting for the cluster to settle...")
+            await settle(previous, wait, baseline, clusterqueue, settle_timeout)
+            io.save_results([previous], resultsfile)
+            state.finish(previous)
+        logger.info("Repetition %s of %s jobs, kueue=%s", repetition, count, use_kueue)
+        prefix = run_id(count, use_kueue)
+        state.start(prefix)
+        result = await run_experiment(
             count=count,
             duration=duration,
             cores=cores,
@@ -197,23 +636,109 @@ def benchmark(
             storage=storage,
             namespace=namespace,
             filepath=filepath,
-            use_kueue=True,
-            kueue=kueue,
-            priority=priority,
+            use_kueue=use_kueue,
+            kueue=kueue if use_kueue else None,
+            priority=priority if use_kueue else None,
+            concurrency=concurrency,
+            timeout=timeout,
+            jobsfile=io.sibling(resultsfile, ".jobs.csv.gz"),
+            drain=False,
+            prefix=prefix,
+            arrival=arrival,
+            loadfile=io.sibling(resultsfile, ".load.csv"),
+            mix=mix,
+            shapesfile=io.sibling(resultsfile, ".shapes.csv"),
         )
-        results.append(kueue_result)
-
-        # Save intermediate results
-        io.save_performance_to_csv(results, resultsfile)
+        result["repetition"] = repetition
+        result["metadata_hash"] = digest
+        results.append(result)
+        previous = result
+        return result
 
-        # Wait between experiments
-        if count != counts[-1]:  # Don't wait after the last experiment
-            logger.info("Waiting %s seconds before next experiment...", wait)
-            sleep(wait)
+    if search:
+        await _search(run, results, min(counts), max(counts), resolution, resultsfile)
+    else:
+        await _sweep(run, results, counts, repeat, min_repeat, tolerance, level)
 
+    if previous is not None:  # Don't wait for the cluster to settle after the last
+        await settle(previous)
+        io.save_results([previous], resultsfile)
+        state.finish(previous)
+    if repeat > 1 and not search:
+        io.save_performance_to_csv(
+            [
+                interval.record()
+                for count in sorted(set(counts))
+                for use_kueue in (False, True)
+                for interval in confidence.intervals(results, count, use_kueue, level)
+            ],
+            io.sibling(resultsfile, ".ci.csv"),
+        )
     return results
 
 
+async def _sweep(
+    run: Callable[[int, bool, int], Awaitable[Dict[str, Any]]],
+    results: List[Dict[str, Any]],
+    counts: List[int],
+    repeat: int,
+    min_repeat: int,
+    tolerance: float,
+    level: float,
+) -> None:
+    """Run every job count, repeating cells until their intervals are tight."""
+    for count in sorted(counts):
+        # Cells of this job count that still need repetitions
+        pending: List[bool] = [False, True]
+        for repetition in range(repeat):
+            # Alternate which cell goes first so drift affects both alike
+            for use_kueue in pending if repetition % 2 == 0 else pending[::-1]:
+                await run(count, use_kueue, repetition)
+            if repetition + 1 < min_repeat or not tolerance:
+                continue
+            pending = confidence.remaining(results, count, pending, tolerance, level)
+            if not pending:
+                break
+
+
+async def _search(
+    run: Callable[[int, bool, int], Awaitable[Dict[str, Any]]],
+    results: List[Dict[str, Any]],
+    lower: int,
+    upper: int,
+    resolution: float,
+    resultsfile: str,
+) -> None:
+    """Search the saturation point of direct and Kueue jobs."""
+    found: List[saturation.Saturation] = []
+    for use_kueue in (False, True):
+
+        async def probe(count: int, use_kueue: bool = use_kueue) -> saturation.Probe:
+            result = await run(count, use_kueue, 0)
+            return saturation.Probe(
+                count=count,
+                throughput=confidence.metric(result, "throughput"),
+                p99=result.get("p99_time_from_creation_completion"),
+            )
+
+        found.append(
+            await saturation.search(probe, lower, upper, use_kueue, resolution)
+        )
+    for point in found:
+        logger.info(
+            "Saturation (kueue=%s): %s jobs/s at %s jobs, saturated at %s jobs, "
+            "p99 latency doubled at %s jobs",
+            point.use_kueue,
+            point.max_throughput,
+            point.max_throughput_count,
+            point.knee,
+            point.p99_doubled,
+        )
+    io.save_performance_to_csv(
+        [point.record() for point in found], io.sibling(resultsfile, ".saturation.csv")
+    )
+
+
 @benchmark_cli.command("performance")
 def performance(
     filepath: str = (
@@ -273,16 +798,155 @@ def performance(
         )
     ),
     output: str = (
-        typer.Option("results.csv", "-o", "--output", help="File to save results to.")
+        typer.Option(
+            "results.db",
+            "-o",
+            "--output",
+            help="File to save results to, a CSV file if it ends with .csv.",
+        )
     ),
     wait: int = (
-        typer.Option(60, "-w", "--wait", help="Time to wait between experiments.")
+        typer.Option(
+            0, "-w", "--wait", help="Minimum time to wait between experiments."
+        )
+    ),
+    settle_timeout: float = (
+        typer.Option(
+            quiesce.DEFAULT_TIMEOUT,
+            "--settle-timeout",
+            help="Longest time to wait for the cluster to settle between experiments.",
+        )
+    ),
+    search: bool = (
+        typer.Option(
+            False,
+            "--search",
+            help="Search the saturation point between 2^el and 2^eh jobs instead "
+            "of running every power of two.",
+        )
+    ),
+    resolution: float = (
+        typer.Option(
+            saturation.DEFAULT_RESOLUTION,
+            "--resolution",
+            help="Relative precision of the saturation point with --search.",
+        )
+    ),
+    controller: Optional[str] = (
+        typer.Option(
+            None,
+            "--controller",
+            help="Kueue controller configuration to record with the results, "
+            "read from the cluster by default.",
+        )
+    ),
+    resume: bool = (
+        typer.Option(
+            False,
+            "--resume",
+            help="Continue the campaign saved next to the output, skipping "
+            "finished experiments.",
+        )
+    ),
+    repeat: int = (
+        typer.Option(
+            1,
+            "-R",
+            "--repeat",
+            help="Maximum repetitions of every experiment, interleaving direct "
+            "and Kueue runs.",
+        )
+    ),
+    min_repeat: int = (
+        typer.Option(
+            3,
+            "--min-repeat",
+            help="Repetitions before stopping on the confidence intervals.",
+        )
+    ),
+    tolerance: float = (
+        typer.Option(
+            confidence.DEFAULT_TOLERANCE,
+            "--tolerance",
+            help="Stop repeating once every confidence interval is narrower than "
+            "this fraction of its mean, 0 to always repeat.",
+        )
+    ),
+    confidence_level: float = (
+        typer.Option(
+            stats.DEFAULT_CONFIDENCE,
+            "--confidence",
+            help="Confidence level of the bootstrap intervals.",
+        )
+    ),
+    concurrency: int = (
+        typer.Option(
+            submit.DEFAULT_CONCURRENCY,
+            "--concurrency",
+            help="Maximum number of job creation requests in flight.",
+        )
+    ),
+    timeout: Optional[int] = (
+        typer.Option(
+            None,
+            "-t",
+            "--timeout",
+            help="Seconds to track each experiment before giving up, unbounded "
+            "by default.",
+        )
+    ),
+    arrival: str = (
+        typer.Option(
+            arrivals.DEFAULT_PROCESS,
+            "--arrival",
+            help="Arrival process of the jobs: burst, poisson, ramp, bursts or "
+            "diurnal.",
+        )
+    ),
+    rate: Optional[float] = (
+        typer.Option(
+            None, "--rate", help="Mean job arrivals per second, except for burst."
+        )
+    ),
+    period: float = (
+        typer.Option(
+            arrivals.DEFAULT_PERIOD,
+            "--period",
+            help="Seconds between bursts, or of a diurnal cycle.",
+        )
+    ),
+    limit: Optional[float] = (
+        typer.Option(
+            None,
+            "--limit",
+            help="Client-side limit of job submissions per second, a token bucket.",
+        )
+    ),
+    seed: Optional[int] = (
+        typer.Option(None, "--seed", help="Seed of the random arrival gaps.")
+    ),
+    mix: Optional[str] = (
+        typer.Option(
+            None,
+            "--mix",
+            help="YAML file of job shapes and durations to draw the jobs from, "
+            "replacing -d, -c, -r and -s, see mixes.py.",
+        )
     ),
 ):
     """Compare native K8s job scheduling vs. Kueue."""
+    try:
+        process = arrivals.Process(arrival, rate, period, limit, seed)
+        shapes = mixes.load(mix) if mix else None
+    except (OSError, ValueError) as error:
+        logger.error("%s", error)
+        raise typer.Exit(code=1)
     counts = [2**i for i in range(e0, exponent + 1)]
     logger.info("Starting benchmark with the following configuration:")
-    logger.info("Jobs     : %s", counts)
+    if search:
+        logger.info("Jobs     : search from %s to %s", counts[0], counts[-1])
+    else:
+        logger.info("Jobs     : %s", counts)
     logger.info("Duration : %ss", duration)
     logger.info("Cores    : %s, RAM: %sGB, Storage: %sGB", cores, ram, storage)
     logger.info("Namespace: %s", namespace)
@@ -290,25 +954,53 @@ def performance(
     logger.info("Kueue    : %s", kueue)
     logger.info("Priority : %s", priority)
     logger.info("Output   : %s", output)
-    logger.info("Wait     : %ss", wait)
+    logger.info("Resume   : %s", resume)
+    logger.info("Wait     : %ss, settle within %ss", wait, settle_timeout)
+    logger.info(
+        "Repeat   : up to %s times, stop at %s of the mean with %s confidence",
+        repeat,
+        f"{tolerance:.0%}",
+        f"{confidence_level:.0%}",
+    )
+    logger.info("Submit   : %s concurrent requests", concurrency)
+    logger.info("Arrivals : %s", process.label())
+    logger.info("Mix      : %s", shapes.label() if shapes else "none")
+    logger.info("Timeout  : %s", f"{timeout}s" if timeout else "unbounded")
 
     if not k8s.check(namespace, kueue, priority):
         logger.error("Please check your Kueue configuration.")
         raise typer.Exit(code=1)
 
-    benchmark(
-        counts=counts,
-        duration=duration,
-        cores=cores,
-        ram=ram,
-        storage=storage,
-        namespace=namespace,
-        filepath=filepath,
-        kueue=kueue,
-        priority=priority,
-        resultsfile=output,
-        wait=wait,
-    )
+    try:
+        benchmark(
+            counts=counts,
+            duration=duration,
+            cores=cores,
+            ram=ram,
+            storage=storage,
+            namespace=namespace,
+            filepath=filepath,
+            kueue=kueue,
+            priority=priority,
+            resultsfile=output,
+            wait=wait,
+            concurrency=concurrency,
+            timeout=timeout,
+            settle_timeout=settle_timeout,
+            repeat=repeat,
+            min_repeat=min_repeat,
+            tolerance=tolerance,
+            level=confidence_level,
+            search=search,
+            resolution=resolution,
+            resume=resume,
+            controller=controller,
+            arrival=process,
+            mix=shapes,
+        )
+    except ValueError as error:
+        logger.error("%s, rerun without --resume to start over.", error)
+        raise typer.Exit(code=1)
     logger.info("Benchmark completed successfully.")
     logger.info("Results saved to %s", output)
     logger.info(
@@ -316,6 +1008,163 @@ def performance(
     )
 
 
+async def _scenario(
+    cells: List[scenario.Cell],
+    namespace: str,
+    filepath: str,
+    resultsfile: str,
+    wait: int,
+    concurrency: int,
+    timeout: Optional[int],
+    settle_timeout: float,
+    controller: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    loop = asyncio.get_running_loop()
+    # Load on the cluster before benchmarking, per ClusterQueue of the cells
+    clusterqueues: Dict[Optional[str], Optional[str]] = {None: None}
+    for cell in cells:
+        if cell.kueue not in clusterqueues:
+            clusterqueues[cell.kueue] = await loop.run_in_executor(
+                None, k8s.clusterqueue, cell.kueue, namespace
+            )
+    baselines: Dict[Optional[str], quiesce.Snapshot] = {}
+    digests: Dict[Optional[str], str] = {}
+    for clusterqueue in set(clusterqueues.values()):
+        baselines[clusterqueue] = await loop.run_in_executor(
+            None, quiesce.snapshot, namespace, clusterqueue
+        )
+        digests[clusterqueue] = await snapshot(clusterqueue, controller, resultsfile)
+
+    results: List[Dict[str, Any]] = []
+    for index, cell in enumerate(cells):
+        logger.info("Cell %s of %s: %s", index + 1, len(cells), cell.label())
+        result = await run_experiment(
+            count=cell.count,
+            duration=cell.duration,
+            cores=cell.cores,
+            ram=cell.ram,
+            storage=cell.storage,
+            namespace=namespace,
+            filepath=filepath,
+            use_kueue=cell.use_kueue,
+            kueue=cell.kueue,
+            priority=cell.priority,
+            concurrency=concurrency,
+            timeout=timeout,
+            jobsfile=io.sibling(resultsfile, ".jobs.csv.gz"),
+            drain=False,
+            arrival=cell.process(),
+            loadfile=io.sibling(resultsfile, ".load.csv"),
+            mix=cell.mixture(),
+            shapesfile=io.sibling(resultsfile, ".shapes.csv"),
+        )
+        result["metadata_hash"] = digests[clusterqueues[cell.kueue]]
+        results.append(result)
+        if index == len(cells) - 1:  # Don't wait for the cluster after the last
+            await settle(result)
+        else:
+            clusterqueue = clusterqueues[cell.kueue]
+            logger.info("Waiting for the cluster to settle...")
+            await settle(
+                result, wait, baselines[clusterqueue], clusterqueue, settle_timeout
+            )
+        io.save_results([result], resultsfile)
+    return results
+
+
+@benchmark_cli.command("scenario")
+def scenarios(
+    path: str,
+    output: str = (
+        typer.Option(
+            "results.db",
+            "-o",
+            "--output",
+            help="File to save results to, a CSV file if it ends with .csv.",
+        )
+    ),
+    wait: int = (
+        typer.Option(
+            0, "-w", "--wait", help="Minimum time to wait between experiments."
+        )
+    ),
+    settle_timeout: float = (
+        typer.Option(
+            quiesce.DEFAULT_TIMEOUT,
+            "--settle-timeout",
+            help="Longest time to wait for the cluster to settle between experiments.",
+        )
+    ),
+    concurrency: int = (
+        typer.Option(
+            submit.DEFAULT_CONCURRENCY,
+            "--concurrency",
+            help="Maximum number of job creation requests in flight.",
+        )
+    ),
+    timeout: Optional[int] = (
+        typer.Option(
+            None,
+            "-t",
+            "--timeout",
+            help="Seconds to track each experiment before giving up, unbounded "
+            "by default.",
+        )
+    ),
+    controller: Optional[str] = (
+        typer.Option(
+            None,
+            "--controller",
+            help="Kueue controller configuration to record with the results, "
+            "read from the cluster by default.",
+        )
+    ),
+    dry_run: bool = (
+        typer.Option(
+            False, "--dry-run", help="Only list the cells in the order they would run."
+        )
+    ),
+):
+    """Run the cells of a scenario file, see `kueuer.benchmarks.scenario`."""
+    try:
+        plan = scenario.load(path)
+    except (OSError, TypeError, ValueError) as error:
+        logger.error("Invalid scenario %s: %s", path, error)
+        raise typer.Exit(code=1)
+    cells = scenario.order(plan.cells)
+    logger.info("Scenario : %s, %s cells", path, len(cells))
+    logger.info("Namespace: %s", plan.namespace)
+    logger.info("Template : %s", plan.filepath)
+    logger.info("Output   : %s", output)
+    for index, cell in enumerate(cells):
+        logger.info("Cell %s: %s", index + 1, cell.label())
+    if dry_run:
+        return
+
+    for kueue, priority in sorted(
+        {(cell.kueue, cell.priority) for cell in cells if cell.use_kueue},
+        key=str,
+    ):
+        if not k8s.check(plan.namespace, kueue, priority):
+            logger.error("Please check your Kueue configuration.")
+            raise typer.Exit(code=1)
+
+    asyncio.run(
+        _scenario(
+            cells,
+            namespace=plan.namespace,
+            filepath=plan.filepath,
+            resultsfile=output,
+            wait=wait,
+            concurrency=concurrency,
+            timeout=timeout,
+            settle_timeout=settle_timeout,
+            controller=controller,
+        )
+    )
+    logger.info("Scenario completed, results saved to %s", output)
+
+
 @benchmark_cli.command("evictions")
 def eviction(
     filepath: str = (
@@ -381,10 +1230,17 @@ def eviction(
             "evictions.yaml", "-o", "--output", help="Filen to save results to."
         )
     ),
+    timeout: Optional[int] = (
+        typer.Option(
+            None,
+            "-t",
+            "--timeout",
+            help="Seconds to track evictions before giving up, unbounded by default.",
+        )
+    ),
 ):
     """Run a benchmark to test eviction behavior of Kueue in a packed cluster queue."""
-    config.load_kube_config()
-    v1 = client.CoreV1Api()
+    v1 = kube.core()
     resource_id: str = str(v1.list_namespace(limit=1).metadata.resource_version)  # type: ignore
 
     logger.info("Starting eviction benchmarks with the following configuration:")
@@ -406,6 +1262,7 @@ def eviction(
     logger.info("Kueue configuration is valid.")
 
     prefix: str = "kueue-eviction"
+    run_id: str = f"{prefix}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
     job_count = jobs
     job_core: int = math.ceil(cores / job_count)
     job_ram: int = math.ceil(ram / job_count)
@@ -436,6 +1293,8 @@ def eviction(
             storage=job_storage,
             kueue=kueue,
             priority=priority,
+            concurrency=submit.DEFAULT_CONCURRENCY,
+            run_id=run_id,
         )
 
     logger.info("All jobs launched successfully.")
@@ -443,6 +1302,7 @@ def eviction(
     results = track.evictions(
         namespace=namespace,
         revision=resource_id,
+        timeout=timeout,
     )
 
     logger.info("Saving results to %s", filepath)
@@ -457,7 +1317,13 @@ def eviction(
         logger.info("No eviction issues detected.")
     logger.info("Eviction tracking completed.")
     logger.info("Cleaning up jobs...")
-    k8s.delete_jobs(namespace, prefix)
+    k8s.delete_jobs(
+        namespace,
+        prefix,
+        run_id=run_id,
+        concurrency=submit.DEFAULT_CONCURRENCY,
+        wait=True,
+    )
     logger.info("Jobs cleaned up successfully.")
     logger.info("Eviction benchmark completed.")
     logger.info(
@@ -0,0 +1,124 @@
+"""Persist the progress of a benchmark so it can be resumed."""
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from kueuer.benchmarks import k8s, submit
+from kueuer.utils.logging import logger
+
+
+@dataclass
+class Campaign:
+    """Cells of a benchmark, the ones completed and the runs in flight.
+
+    The state is rewritten atomically after every change, so it is
+    consistent whenever the benchmark is interrupted.
+
+    Attributes:
+        path (str): File the state is saved to.
+        plan (Dict[str, Any]): Configuration of the benchmark.
+        cells (List[Dict[str, Any]]): Planned job counts and submission modes.
+        completed (List[Dict[str, Any]]): Results of the finished experiments.
+        inflight (List[str]): Run ids of experiments started but not finished.
+    """
+
+    path: str
+    plan: Dict[str, Any]
+    cells: List[Dict[str, Any]] = field(default_factory=list)
+    completed: List[Dict[str, Any]] = field(default_factory=list)
+    inflight: List[str] = field(default_factory=list)
+
+    def save(self) -> None:
+        state: Dict[str, Any] = asdict(self)
+        del state["path"]
+        temporary: str = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, default=str)
+        os.replace(temporary, self.path)
+
+    def result(
+        self, count: int, use_kueue: bool, repetition: int
+    ) -> Optional[Dict[str, Any]]:
+        """Result of a finished experiment, None if it still has to run."""
+        for result in self.completed:
+            if (
+                result["job_count"] == count
+                and result["use_kueue"] == use_kueue
+                and result.get("repetition", 0) == repetition
+            ):
+                return result
+        return None
+
+    def start(self, run_id: str) -> None:
+        """Record an experiment before its first job is submitted."""
+        self.inflight.append(run_id)
+        self.save()
+
+    def finish(self, result: Dict[str, Any]) -> None:
+        """Record the result of an experiment once it is saved."""
+        if result["run_id"] in self.inflight:
+            self.inflight.remove(result["run_id"])
+        self.completed.append(json.loads(json.dumps(result, default=str)))
+        self.save()
+
+    def cleanup(self, namespace: str) -> None:
+        """Delete the jobs of experiments interrupted in a previous session."""
+        for run_id in list(self.inflight):
+            logger.info("Cleaning up interrupted run %s", run_id)
+            k8s.delete_jobs(
+                namespace,
+                run_id,
+                run_id=run_id,
+                concurrency=submit.DEFAULT_CONCURRENCY,
+                wait=True,
+            )
+            self.inflight.remove(run_id)
+        self.save()
+
+
+def begin(path: str, plan: Dict[str, Any], resume: bool = False) -> Campaign:
+    """Start a new campaign, or resume the one saved at `path`.
+
+    Args:
+        path (str): File the state is saved to.
+        plan (Dict[str, Any]): Configuration of the benchmark.
+        resume (bool): Continue the saved campaign instead of starting over.
+
+    Raises:
+        ValueError: If the saved campaign was planned with another configuration.
+
+    Returns:
+        Campaign: State of the campaign.
+    """
+    # Round trip through JSON so the plan compares equal to a saved one
+    plan = json.loads(json.dumps(plan))
+    cells: List[Dict[str, Any]] = [
+        {"job_count": count, "use_kueue": use_kueue}
+        for count in sorted(plan.get("counts") or [])
+        for use_kueue in (False, True)
+    ]
+    if not resume or not os.path.isfile(path):
+        if resume:
+            logger.warning("No campaign to resume at %s, starting a new one", path)
+        campaign = Campaign(path=path, plan=plan, cells=cells)
+        campaign.save()
+        return campaign
+    with open(path, encoding="utf-8") as f:
+        state: Dict[str, Any] = json.load(f)
+    if state["plan"] != plan:
+        changed = sorted(
+            key
+            for key in set(plan) | set(state["plan"])
+            if plan.get(key) != state["plan"].get(key)
+        )
+        raise ValueError(f"Campaign at {path} was planned with other {changed}")
+    campaign = Campaign(path=path, **state)
+    logger.info(
+        "Resuming campaign at %s: %s experiments completed, %s interrupted",
+        path,
+        len(campaign.completed),
+        len(campaign.inflight),
+    )
+    return campaign
@@ -0,0 +1,299 @@
+"""Compare benchmark results of a candidate against a baseline."""
+
+from dataclasses import asdict, dataclass
+from statistics import fmean
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from kueuer.benchmarks import metadata
+from kueuer.utils import io, stats, store
+from kueuer.utils.logging import logger
+
+DEFAULT_THRESHOLD: float = 0.10
+DEFAULT_ALPHA: float = 0.05
+# Columns identifying a cell, blank when missing from older results.
+CELL: Tuple[str, ...] = (
+    "job_count",
+    "use_kueue",
+    "cores",
+    "ram",
+    "storage",
+    "job_duration",
+    "arrival_process",
+    "arrival_rate",
+    "job_mix",
+)
+# Metric and whether higher values are better.
+METRICS: Tuple[Tuple[str, bool], ...] = (
+    ("throughput", True),
+    ("avg_time_from_creation_completion", False),
+    ("median_time_from_creation_completion", False),
+    ("p99_time_from_creation_completion", False),
+)
+
+console = Console()
+
+
+@dataclass
+class Delta:
+    """Change of a metric in one cell, from the baseline to the candidate.
+
+    Attributes:
+        cell (str): Job count, submission mode and job shape.
+        metric (str): Name of the metric.
+        baseline (float): Mean over the baseline repetitions.
+        candidate (float): Mean over the candidate repetitions.
+        change (float): Relative change of the mean, e.g. 0.1 for +10%.
+        regression (float): Relative change in the worse direction, negative
+            for improvements.
+        p_value (Optional[float]): Permutation test of the means, None with
+            fewer than two repetitions on either side.
+        runs (Tuple[int, int]): Baseline and candidate repetitions.
+        regressed (bool): Worse than the threshold, and significant when the
+            repetitions are enough for a p-value below the significance level.
+    """
+
+    cell: str
+    metric: str
+    baseline: float
+    candidate: float
+    change: float
+    regression: float
+    p_value: Optional[float]
+    runs: Tuple[int, int]
+    regressed: bool = False
+
+
+def _configurations(filepath: str, df: pd.DataFrame) -> None:
+    """Warn when results were measured on several cluster configurations."""
+    if "metadata_hash" not in df:
+        return
+    counts = df["metadata_hash"].dropna().value_counts()
+    if len(counts) < 2:
+        return
+    snapshots = io.read_metadata(filepath)
+    logger.warning(
+        "%s holds results of %s cluster configurations, pick one with "
+        "--baseline-metadata or --candidate-metadata: %s",
+        filepath,
+        len(counts),
+        "; ".join(
+            f"{digest} ({count} runs, "
+            f"{metadata.describe(snapshots[digest]) if digest in snapshots else '?'})"
+            for digest, count in counts.items()
+        ),
+    )
+
+
+def load(filepath: str, configuration: Optional[str] = None) -> pd.DataFrame:
+    """Results of a store or CSV file, with a throughput column.
+
+    Args:
+        filepath (str): Results store or CSV file.
+        configuration (Optional[str]): Only results of the cluster snapshot
+            with this `metadata_hash`, or a prefix of it, see
+            `kueuer.benchmarks.metadata`.
+
+    Raises:
+        ValueError: If no result is left.
+    """
+    if store.supports(filepath):
+        df = pd.DataFrame.from_records(store.select(filepath))
+    else:
+        df = pd.read_csv(filepath)
+    if configuration is not None and "metadata_hash" in df:
+        df = df[df["metadata_hash"].astype(str).str.startswith(configuration)]
+    elif configuration is not None:
+        df = df.iloc[0:0]
+    if df.empty:
+        raise ValueError(f"No results in {filepath}")
+    if configuration is None:
+        _configurations(filepath, df)
+    for column in CELL:
+        if column not in df:
+            df[column] = ""
+        df[column] = df[column].astype(object).where(df[column].notna(), "")
+    df["throughput"] = df["job_count"] / df["total_execution_time"]
+    return df
+
+
+def _label(key: Tuple) -> str:
+    cell = dict(zip(CELL, key, strict=True))
+    mode: str = "kueue" if cell["use_kueue"] else "direct"
+    label: str = (
+        f"{cell['job_count']} {mode} {cell['cores']}c/{cell['ram']}G/"
+        f"{cell['storage']}G/{cell['job_duration']}s"
+    )
+    if cell["arrival_process"]:
+        label += f" {cell['arrival_process']}@{cell['arrival_rate']}/s"
+    if cell["job_mix"]:
+        label += f" mix {cell['job_mix']}"
+    return label
+
+
+def missing(baseline: pd.DataFrame, candidate: pd.DataFrame) -> List[str]:
+    """Cells of the baseline the candidate has no results for.
+
+    Args:
+        baseline (pd.DataFrame): Results before the change, see `load`.
+        candidate (pd.DataFrame): Results after the change, see `load`.
+
+    Returns:
+        List[str]: Labels of the cells, sorted.
+    """
+    before = set(baseline.groupby(list(CELL)).groups)
+    after = set(candidate.groupby(list(CELL)).groups)
+    return [_label(key) for key in sorted(before - after, key=str)]
+
+
+def deltas(
+    baseline: pd.DataFrame,
+    candidate: pd.DataFrame,
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+) -> List[Delta]:
+    """Compare every metric of the cells present in both results.
+
+    Args:
+        baseline (pd.DataFrame): Results before the change, see `load`.
+        candidate (pd.DataFrame): Results after the change, see `load`.
+        threshold (float): Largest tolerated regression, e.g. 0.1 for 10%.
+        alpha (float): Significance level of the permutation test.
+
+    Returns:
+        List[Delta]: Changes by cell and metric.
+    """
+    before = dict(iter(baseline.groupby(list(CELL))))
+    after = dict(iter(candidate.groupby(list(CELL))))
+    for key in sorted(set(after) - set(before), key=str):
+        logger.warning("Cell %s is only in the candidate, skipped", _label(key))
+    found: List[Delta] = []
+    for key in sorted(set(before) & set(after), key=str):
+        for metric, higher in METRICS:
+            old = before[key][metric].dropna().tolist()
+            new = after[key][metric].dropna().tolist()
+            if not old or not new or not fmean(old):
+                continue
+            change: float = (fmean(new) - fmean(old)) / abs(fmean(old))
+            p_value = stats.permutation_test(old, new, seed=0)
+            delta = Delta(
+                cell=_label(key),
+                metric=metric,
+                baseline=fmean(old),
+                candidate=fmean(new),
+                change=change,
+                regression=-change if higher else change,
+                p_value=p_value,
+                runs=(len(old), len(new)),
+            )
+            # Too few repetitions cannot be significant, e.g. 3 against 3 at
+            # p < 0.05, so they are held to the threshold like single runs
+            floor = stats.permutation_floor(len(old), len(new))
+            testable: bool = floor is not None and floor < alpha
+            delta.regressed = delta.regression > threshold and (
+                not testable or (p_value is not None and p_value < alpha)
+            )
+            found.append(delta)
+    return found
+
+
+def show(found: List[Delta]) -> None:
+    """Print the changes as a table, regressions in red."""
+    table = Table("Cell", "Metric", "Baseline", "Candidate", "Change", "p", "Runs")
+    for delta in found:
+        style: Optional[str] = "red" if delta.regressed else None
+        if delta.regression < 0:
+            style = "green"
+        table.add_row(
+            delta.cell,
+            delta.metric,
+            f"{delta.baseline:.3f}",
+            f"{delta.candidate:.3f}",
+            f"{delta.change:+.1%}",
+            f"{delta.p_value:.3f}" if delta.p_value is not None else "-",
+            f"{delta.runs[0]}/{delta.runs[1]}",
+            style=style,
+        )
+    console.print(table)
+
+
+def compare(
+    baseline: str,
+    candidate: str,
+    threshold: float = (
+        typer.Option(
+            DEFAULT_THRESHOLD,
+            "-t",
+            "--threshold",
+            help="Largest tolerated regression of any metric, e.g. 0.1 for 10%.",
+        )
+    ),
+    alpha: float = (
+        typer.Option(
+            DEFAULT_ALPHA,
+            "-a",
+            "--alpha",
+            help="Significance level, regressions with a higher p-value pass.",
+        )
+    ),
+    output: Optional[str] = (
+        typer.Option(None, "-o", "--output", help="CSV file to save the changes to.")
+    ),
+    before: Optional[str] = (
+        typer.Option(
+            None,
+            "--baseline-metadata",
+            help="Only baseline results of this cluster configuration, a "
+            "metadata_hash or a prefix of it.",
+        )
+    ),
+    after: Optional[str] = (
+        typer.Option(
+            None,
+            "--candidate-metadata",
+            help="Only candidate results of this cluster configuration, a "
+            "metadata_hash or a prefix of it.",
+        )
+    ),
+) -> None:
+    """Compare the results of CANDIDATE against BASELINE.
+
+    Exits with 1 if any metric of a cell regressed by more than the threshold,
+    significantly when both results have enough repetitions of the cell for
+    a test at the significance level. Exits with 2 if the results cannot be
+    read, share no cell, or the candidate lacks cells of the baseline.
+    """
+    try:
+        old, new = load(baseline, before), load(candidate, after)
+        found = deltas(old, new, threshold, alpha)
+    except (OSError, KeyError, ValueError) as error:
+        logger.error("Cannot compare %s and %s: %s", baseline, candidate, error)
+        raise typer.Exit(code=2)
+    if not found:
+        logger.error("%s and %s have no cell in common", baseline, candidate)
+        raise typer.Exit(code=2)
+    show(found)
+    if output:
+        io.save_performance_to_csv([asdict(delta) for delta in found], output)
+    regressions: Dict[str, List[str]] = {}
+    for delta in found:
+        if delta.regressed:
+            regressions.setdefault(delta.cell, []).append(delta.metric)
+    for cell, metrics in regressions.items():
+        logger.error("Regression in %s: %s", cell, ", ".join(metrics))
+    absent: List[str] = missing(old, new)
+    for cell in absent:
+        logger.error("Cell %s of the baseline is missing from the candidate", cell)
+    if absent:
+        raise typer.Exit(code=2)
+    if regressions:
+        raise typer.Exit(code=1)
+    logger.info(
+        "No regression above %s across %s cells",
+        f"{threshold:.0%}",
+        len({delta.cell for delta in found}),
+    )
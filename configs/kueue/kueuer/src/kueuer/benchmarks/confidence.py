@@ -0,0 +1,162 @@
+"""Confidence intervals of repeated experiments and when to stop repeating."""
+
+from dataclasses import asdict, dataclass
+from statistics import fmean
+from typing import Any, Dict, List, Optional, Tuple
+
+from kueuer.utils import stats
+from kueuer.utils.logging import logger
+
+DEFAULT_TOLERANCE: float = 0.10
+# Experiment metrics whose intervals decide if a cell needs more repetitions.
+METRICS: Tuple[str, ...] = (
+    "throughput",
+    "avg_time_from_creation_completion",
+    "median_time_from_creation_completion",
+)
+
+
+@dataclass
+class Interval:
+    """Bootstrap confidence interval of a metric over repeated experiments.
+
+    Attributes:
+        job_count (int): Jobs per experiment.
+        use_kueue (bool): Whether the jobs were submitted through Kueue.
+        metric (str): Name of the metric.
+        repetitions (int): Experiments the metric was measured in.
+        mean (Optional[float]): Mean of the metric.
+        low (Optional[float]): Lower bound of the interval.
+        high (Optional[float]): Upper bound of the interval.
+        confidence (float): Confidence level of the interval.
+    """
+
+    job_count: int
+    use_kueue: bool
+    metric: str
+    repetitions: int
+    mean: Optional[float]
+    low: Optional[float]
+    high: Optional[float]
+    confidence: float
+
+    @property
+    def width(self) -> Optional[float]:
+        """Width of the interval relative to the mean, None if unknown."""
+        if self.mean is None or self.low is None or self.high is None:
+            return None
+        if not self.mean:
+            return 0.0 if self.high == self.low else None
+        return (self.high - self.low) / abs(self.mean)
+
+    def record(self) -> Dict[str, Any]:
+        """Flatten the interval into one row, including its relative width."""
+        return {**asdict(self), "width": self.width}
+
+
+def metric(result: Dict[str, Any], name: str) -> Optional[float]:
+    """Value of a metric in an experiment result.
+
+    Throughput is not stored in the results, it is derived the same way as
+    `kr plot performance` does.
+    """
+    if name == "throughput":
+        elapsed: Optional[float] = result.get("total_execution_time")
+        return result["job_count"] / elapsed if elapsed else None
+    return result.get(name)
+
+
+def intervals(
+    results: List[Dict[str, Any]],
+    count: int,
+    use_kueue: bool,
+    confidence: float = stats.DEFAULT_CONFIDENCE,
+) -> List[Interval]:
+    """Confidence interval of every metric for one cell of the benchmark.
+
+    Args:
+        results (List[Dict[str, Any]]): Experiment results of the benchmark.
+        count (int): Jobs per experiment of the cell.
+        use_kueue (bool): Whether the cell submits through Kueue.
+        confidence (float): Confidence level. Defaults to 95%.
+
+    Returns:
+        List[Interval]: One interval per metric in `METRICS`.
+    """
+    cell = [
+        result
+        for result in results
+        if result["job_count"] == count and result["use_kueue"] == use_kueue
+    ]
+    found: List[Interval] = []
+    for name in METRICS:
+        values = [
+            value for value in (metric(r, name) for r in cell) if value is not None
+        ]
+        low, high = stats.bootstrap(values, confidence)
+        found.append(
+            Interval(
+                job_count=count,
+                use_kueue=use_kueue,
+                metric=name,
+                repetitions=len(cell),
+                mean=fmean(values) if values else None,
+                low=low,
+                high=high,
+                confidence=confidence,
+            )
+        )
+    return found
+
+
+def converged(found: List[Interval], tolerance: float) -> bool:
+    """True if every interval is narrower than the tolerance.
+
+    Args:
+        found (List[Interval]): Intervals of a cell, see `intervals`.
+        tolerance (float): Largest width relative to the mean, e.g. 0.1 for 10%.
+
+    Returns:
+        bool: Whether the cell has enough repetitions.
+    """
+    for interval in found:
+        width: Optional[float] = interval.width
+        logger.info(
+            "%s jobs, kueue=%s, %s: %s [%s, %s] width %s",
+            interval.job_count,
+            interval.use_kueue,
+            interval.metric,
+            interval.mean,
+            interval.low,
+            interval.high,
+            f"{width:.1%}" if width is not None else None,
+        )
+    return all(
+        interval.width is not None and interval.width <= tolerance for interval in found
+    )
+
+
+def remaining(
+    results: List[Dict[str, Any]],
+    count: int,
+    cells: List[bool],
+    tolerance: float,
+    confidence: float = stats.DEFAULT_CONFIDENCE,
+) -> List[bool]:
+    """Cells of a job count that still need repetitions.
+
+    Args:
+        results (List[Dict[str, Any]]): Experiment results of the benchmark.
+        count (int): Jobs per experiment.
+        cells (List[bool]): Cells to check, by whether they use Kueue.
+        tolerance (float): Largest width relative to the mean, e.g. 0.1 for 10%.
+        confidence (float): Confidence level. Defaults to 95%.
+
+    Returns:
+        List[bool]: The cells whose intervals are wider than the tolerance.
+    """
+    return [
+        use_kueue
+        for use_kueue in cells
+        if not converged(intervals(results, count, use_kueue, confidence), tolerance)
+    ]
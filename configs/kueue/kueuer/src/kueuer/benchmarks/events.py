@@ -0,0 +1,248 @@
+"""Record Job and Workload watch streams and measure how fast Jobs decode."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import typer
+from kubernetes import watch
+from kubernetes.watch.watch import iter_resp_lines
+
+from kueuer.benchmarks import (
+    DEFAULT_JOBSPEC_FILEPATH,
+    DEFAULT_NAMESPACE,
+    RUN_ID_LABEL,
+    k8s,
+    track,
+)
+from kueuer.utils import kube
+
+app = typer.Typer(help="Record and decode K8s Job watch streams")
+
+# Event types carrying a full Job object.
+DECODED: Tuple[str, ...] = ("ADDED", "MODIFIED", "DELETED")
+# List calls of the objects `record` watches, by kind.
+WATCHED: Dict[str, Callable[[], Callable[..., Any]]] = {
+    "jobs": lambda: kube.batch().list_namespaced_job,
+    "workloads": lambda: partial(
+        kube.custom().list_namespaced_custom_object,
+        "kueue.x-k8s.io",
+        "v1beta1",
+        plural="workloads",
+    ),
+}
+# Only used for its event decoding, which is what Watch.stream runs per line.
+_watcher = watch.Watch()
+
+
+def _time(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def synthesize(count: int, prefix: str = "kueuer-job") -> Iterator[str]:
+    """Watch event lines for jobs going from creation to completion.
+
+    Every job produces an ADDED, a running and a completed MODIFIED event, with
+    the same objects the API server would send for `kr jobs run` jobs.
+
+    Args:
+        count (int): Number of jobs.
+        prefix (str): Prefix for the job names.
+
+    Yields:
+        str: One JSON encoded watch event per line.
+    """
+    data: Dict[str, Any] = k8s.manifest(
+        DEFAULT_JOBSPEC_FILEPATH, DEFAULT_NAMESPACE, 60, 1, 1, 1, run_id=prefix
+    )
+    start: datetime = datetime.now(timezone.utc).replace(microsecond=0)
+    version: int = 1000
+    for num in range(count):
+        created: datetime = start + timedelta(seconds=num // 10)
+        finished: datetime = created + timedelta(seconds=60)
+        job: Dict[str, Any] = json.loads(json.dumps(data))
+        job["metadata"].update(
+            {
+                "name": f"{prefix}-{num}",
+                "namespace": DEFAULT_NAMESPACE,
+                "uid": f"00000000-0000-0000-0000-{num:012d}",
+                "creationTimestamp": _time(created),
+            }
+        )
+        revisions: List[Tuple[str, Dict[str, Any]]] = [
+            ("ADDED", {}),
+            ("MODIFIED", {"active": 1, "ready": 1, "startTime": _time(created)}),
+            (
+                "MODIFIED",
+                {
+                    "startTime": _time(created),
+                    "completionTime": _time(finished),
+                    "succeeded": 1,
+                    "conditions": [
+                        {
+                            "type": condition,
+                            "status": "True",
+                            "lastProbeTime": _time(finished),
+                            "lastTransitionTime": _time(finished),
+                            "reason": reason,
+                        }
+                        for condition, reason in (
+                            ("SuccessCriteriaMet", "CompletionsReached"),
+                            ("Complete", "CompletionsReached"),
+                        )
+                    ],
+                },
+            ),
+        ]
+        for kind, status in revisions:
+            version += 1
+            job["metadata"]["resourceVersion"] = str(version)
+            job["status"] = status
+            yield json.dumps({"type": kind, "object": job}, separators=(",", ":"))
+
+
+def model(line: str) -> Optional[track.JobRevision]:
+    """Decode an event the way `watch.Watch().stream` does, into a V1Job."""
+    event = _watcher.unmarshal_event(line, "V1Job")
+    if event is None or event["type"] not in DECODED:
+        return None
+    return track.JobRevision.from_model(event["object"])
+
+
+def raw(line: str) -> Optional[track.JobRevision]:
+    """Decode an event the way `track.jobs` does, reading only the needed fields."""
+    event: Dict[str, Any] = json.loads(line)
+    if event["type"] not in DECODED:
+        return None
+    return track.JobRevision.from_raw(event["object"])
+
+
+DECODERS: Dict[str, Callable[[str], Optional[track.JobRevision]]] = {
+    "model": model,
+    "raw": raw,
+}
+
+
+def measure(
+    lines: List[str], decoder: Callable[[str], Optional[track.JobRevision]]
+) -> float:
+    """Decode every line once.
+
+    Args:
+        lines (List[str]): Recorded watch event lines.
+        decoder (Callable[[str], Optional[track.JobRevision]]): Decoder to time.
+
+    Returns:
+        float: Events decoded per second.
+    """
+    now: float = perf_counter()
+    for line in lines:
+        decoder(line)
+    elapsed: float = perf_counter() - now
+    return len(lines) / elapsed if elapsed > 0 else 0.0
+
+
+@app.command("record")
+def record(
+    namespace: str = (
+        typer.Option(
+            DEFAULT_NAMESPACE, "-n", "--namespace", help="Namespace of the jobs."
+        )
+    ),
+    run_id: Optional[str] = (
+        typer.Option(
+            None,
+            "--run-id",
+            help="Only record objects with this run-id, Workloads only have it "
+            "when Kueue copies the label.",
+        )
+    ),
+    output: str = (
+        typer.Option("events.jsonl", "-o", "--output", help="File to record to.")
+    ),
+    duration: int = (
+        typer.Option(60, "-d", "--duration", help="Seconds to record for.")
+    ),
+    kind: str = (
+        typer.Option(
+            "jobs",
+            "--kind",
+            help="Objects to record, jobs or workloads, e.g. for `kr jobs replay`.",
+        )
+    ),
+) -> int:
+    """Record the Job or Kueue Workload watch stream of a namespace, one event
+    per line.
+
+    Returns:
+        int: Number of events recorded.
+    """
+    if kind not in WATCHED:
+        raise typer.BadParameter(f"Use one of {', '.join(WATCHED)}", param_hint="kind")
+    selector: Optional[str] = f"{RUN_ID_LABEL}={run_id}" if run_id else None
+    lister: Callable[..., Any] = WATCHED[kind]()
+    deadline: float = monotonic() + duration
+    recorded: int = 0
+    with open(output, "w") as fopen:
+        while monotonic() < deadline:
+            response = lister(
+                namespace=namespace,
+                label_selector=selector,
+                watch=True,
+                timeout_seconds=max(int(deadline - monotonic()), 1),
+                _preload_content=False,
+            )
+            try:
+                for line in iter_resp_lines(response):
+                    if line and not line.isspace():
+                        fopen.write(line + "\n")
+                        recorded += 1
+            finally:
+                response.close()
+                response.release_conn()
+    typer.echo(f"Recorded {recorded} events to {output}")
+    return recorded
+
+
+@app.command("decode")
+def decode(
+    source: Optional[str] = (
+        typer.Option(
+            None,
+            "-i",
+            "--input",
+            help="Recorded events, as written by `kr events record`.",
+        )
+    ),
+    count: int = (
+        typer.Option(
+            10000,
+            "-j",
+            "--jobs",
+            help="Jobs to synthesize events for when no input is given.",
+        )
+    ),
+    repeat: int = (
+        typer.Option(3, "-r", "--repeat", help="Runs per decoder, the best counts.")
+    ),
+) -> Dict[str, float]:
+    """Compare events/s between decoding into models and reading raw JSON.
+
+    Returns:
+        Dict[str, float]: Best events per second of each decoder.
+    """
+    lines: List[str]
+    if source:
+        with open(source) as fopen:
+            lines = [line for line in fopen.read().splitlines() if line.strip()]
+    else:
+        lines = list(synthesize(count))
+    rates: Dict[str, float] = {}
+    for name, decoder in DECODERS.items():
+        rates[name] = max(measure(lines, decoder) for _ in range(repeat))
+        typer.echo(f"{name:>6}: {rates[name]:>10.0f} events/s")
+    if rates["model"] > 0:
+        typer.echo(f"speedup: {rates['raw'] / rates['model']:.1f}x")
+    return rates
@@ -0,0 +1,1228 @@
+"""Stand-in Kubernetes API server with Jobs, Pods, Nodes and Kueue resources.
+
+Serves just enough of batch/v1, v1 and kueue.x-k8s.io/v1beta1 for kueuer to
+run end to end without a cluster: list with label and field selectors and
+limit/continue, watch with bookmarks and 410 Gone, create, delete and
+deletecollection. Everything lives in memory.
+
+Jobs go through a simplified lifecycle. Suspended jobs with a queue label get
+a Workload, which is admitted after `admission_delay` when it fits the quota
+of the ClusterQueue, preempting admitted workloads of lower priority if it
+does not. Workloads wait in priority order, the head blocking the ones behind
+it. The pod of an admitted or unsuspended job is placed on the first node with
+room for it, runs after `startup_delay`, and succeeds after the `--timeout` of
+its stress-ng arguments divided by `speed`.
+
+    kr fake serve --kubeconfig fake.kubeconfig --speed 10 &
+    KUBECONFIG=fake.kubeconfig kr benchmark performance -o fake.db
+"""
+
+import bisect
+import functools
+import heapq
+import itertools
+import json
+import re
+import threading
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import typer
+import yaml
+from kubernetes.utils.quantity import parse_quantity
+
+from kueuer.benchmarks import DEFAULT_KUEUE, DEFAULT_NAMESPACE
+from kueuer.utils.logging import logger
+
+app = typer.Typer(help="Stand-in Kubernetes API server for benchmarking kueuer.")
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8001
+DEFAULT_CLUSTERQUEUE: str = "skaha-cluster-queue"
+# Events kept per resource for watches to resume from, older ones are gone.
+DEFAULT_HISTORY: int = 50_000
+# Seconds a watch stays open when the client gives no timeoutSeconds.
+DEFAULT_WATCH: float = 300.0
+# Priority classes of configs/kueue/*/clusterQueue.config.yaml.
+PRIORITIES: Dict[str, int] = {"low": 10000, "medium": 100000, "high": 1000000}
+QUOTA: Tuple[str, ...] = ("cpu", "memory", "ephemeral-storage")
+FLAVOR: str = "default"
+QUEUE_LABEL: str = "kueue.x-k8s.io/queue-name"
+PRIORITY_LABEL: str = "kueue.x-k8s.io/priority-class"
+KUEUE: str = "kueue.x-k8s.io/v1beta1"
+# Plural: (apiVersion, kind, namespaced)
+KINDS: Dict[str, Tuple[str, str, bool]] = {
+    "namespaces": ("v1", "Namespace", False),
+    "nodes": ("v1", "Node", False),
+    "pods": ("v1", "Pod", True),
+    "configmaps": ("v1", "ConfigMap", True),
+    "jobs": ("batch/v1", "Job", True),
+    "workloads": (KUEUE, "Workload", True),
+    "localqueues": (KUEUE, "LocalQueue", True),
+    "clusterqueues": (KUEUE, "ClusterQueue", False),
+    "workloadpriorityclasses": (KUEUE, "WorkloadPriorityClass", False),
+}
+
+Key = Tuple[str, str]
+Requests = Dict[str, Decimal]
+
+
+class ApiError(Exception):
+    """Request the API server refuses, answered with a Status."""
+
+    def __init__(self, code: int, reason: str, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.reason = reason
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "kind": "Status",
+            "apiVersion": "v1",
+            "metadata": {},
+            "status": "Failure",
+            "message": str(self),
+            "reason": self.reason,
+            "code": self.code,
+        }
+
+
+@dataclass
+class Settings:
+    """Cluster the server pretends to be.
+
+    Attributes:
+        nodes (int): Number of worker nodes.
+        cores (int): CPU cores per node.
+        ram (int): RAM per node in GB.
+        storage (int): Ephemeral storage per node in GB.
+        quota (float): Fraction of the node totals the ClusterQueue admits.
+        admission_delay (float): Seconds before Kueue considers a new workload.
+        startup_delay (float): Seconds from pod placement to running.
+        speed (float): Factor job durations are divided by.
+        namespaces (List[str]): Namespaces, each with a LocalQueue.
+        kueue (str): Name of the LocalQueues.
+        clusterqueue (str): Name of the ClusterQueue.
+        history (int): Events kept per resource for watches.
+    """
+
+    nodes: int = 2
+    cores: int = 16
+    ram: int = 64
+    storage: int = 500
+    quota: float = 1.0
+    admission_delay: float = 0.0
+    startup_delay: float = 0.0
+    speed: float = 1.0
+    namespaces: List[str] = field(default_factory=lambda: [DEFAULT_NAMESPACE])
+    kueue: str = DEFAULT_KUEUE
+    clusterqueue: str = DEFAULT_CLUSTERQUEUE
+    history: int = DEFAULT_HISTORY
+
+    def node(self) -> Dict[str, str]:
+        """Capacity of a node."""
+        return {
+            "cpu": str(self.cores),
+            "memory": f"{self.ram}Gi",
+            "ephemeral-storage": f"{self.storage}Gi",
+        }
+
+
+def encode(obj: Dict[str, Any]) -> bytes:
+    """Compact JSON of an API object."""
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def now() -> str:
+    """Current time in RFC 3339 with microseconds."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+@functools.lru_cache(maxsize=1024)
+def parse(value: str) -> Decimal:
+    """Parse a quantity, e.g. `1Gi`, once for all the jobs alike."""
+    return Decimal(str(parse_quantity(value)))
+
+
+def requests(spec: Dict[str, Any]) -> Requests:
+    """Resources requested by the containers of a pod spec."""
+    total: Requests = {}
+    for container in spec.get("containers") or []:
+        wanted = (container.get("resources") or {}).get("requests") or {}
+        for name, value in wanted.items():
+            total[name] = total.get(name, Decimal(0)) + parse(str(value))
+    return total
+
+
+def duration(spec: Dict[str, Any]) -> float:
+    """Seconds a pod runs, the `--timeout` of its stress-ng arguments."""
+    for container in spec.get("containers") or []:
+        args: List[str] = [str(arg) for arg in container.get("args") or []]
+        if "--timeout" in args[:-1]:
+            return float(args[args.index("--timeout") + 1].rstrip("s"))
+    return 0.0
+
+
+def quantity(value: Decimal) -> str:
+    """Quantity as the API server prints it, without a needless fraction."""
+    return str(int(value)) if value == value.to_integral_value() else str(value)
+
+
+def _fits(wanted: Requests, used: Requests, limit: Requests) -> bool:
+    return all(
+        used.get(name, Decimal(0)) + value <= limit.get(name, Decimal(0))
+        for name, value in wanted.items()
+    )
+
+
+def _add(total: Requests, other: Requests, sign: int = 1) -> None:
+    for name, value in other.items():
+        total[name] = total.get(name, Decimal(0)) + sign * value
+
+
+def selector(text: Optional[str]) -> Callable[[Dict[str, str]], bool]:
+    """Matcher of a label selector with =, ==, !=, in, notin and existence."""
+    # Key, accepted values or None for existence, and whether the term is negated.
+    terms: List[Tuple[str, Optional[Set[str]], bool]] = []
+    for term in re.split(r",(?![^(]*\))", text or ""):
+        term = term.strip()
+        chosen = re.match(r"^(\S+)\s+(in|notin)\s*\((.*)\)$", term)
+        if chosen:
+            key, operator, values = chosen.groups()
+            accepted = {value.strip() for value in values.split(",")}
+            terms.append((key, accepted, operator == "notin"))
+            continue
+        negate: bool = "!=" in term or term.startswith("!")
+        if "=" in term:
+            key, value = term.replace("!=", "=").replace("==", "=").split("=", 1)
+            terms.append((key.strip(), {value.strip()}, negate))
+        elif term:
+            terms.append((term.lstrip("!").strip(), None, negate))
+
+    def matches(labels: Dict[str, str]) -> bool:
+        return all(
+            (key in labels if values is None else labels.get(key) in values) != negate
+            for key, values, negate in terms
+        )
+
+    return matches
+
+
+def fields(text: Optional[str]) -> Callable[[Dict[str, Any]], bool]:
+    """Matcher of a field selector on dotted paths, e.g. `status.phase!=Failed`."""
+    terms: List[Tuple[List[str], bool, str]] = []
+    for term in (text or "").split(","):
+        if not term.strip():
+            continue
+        negate: bool = "!=" in term
+        path, value = term.replace("!=", "=").replace("==", "=").split("=", 1)
+        terms.append((path.strip().split("."), negate, value.strip()))
+
+    def lookup(obj: Dict[str, Any], path: List[str]) -> str:
+        for part in path:
+            obj = obj.get(part) or {} if isinstance(obj, dict) else {}
+        return str(obj) if obj != {} else ""
+
+    def matches(obj: Dict[str, Any]) -> bool:
+        return all(
+            (lookup(obj, path) == value) != negate for path, negate, value in terms
+        )
+
+    return matches
+
+
+@dataclass
+class Event:
+    """A change to an object, serialized once for every watch."""
+
+    version: int
+    namespace: str
+    labels: Dict[str, str]
+    line: bytes
+
+
+@dataclass
+class Collection:
+    """Objects of one resource and their recent changes.
+
+    Attributes:
+        objects (Dict[Key, Dict[str, Any]]): Objects by namespace and name.
+        events (List[Event]): Recent changes, oldest first.
+        versions (List[int]): Resource versions of `events`, for bisecting.
+        compacted (int): Newest version dropped from the history.
+    """
+
+    objects: Dict[Key, Dict[str, Any]] = field(default_factory=dict)
+    events: List[Event] = field(default_factory=list)
+    versions: List[int] = field(default_factory=list)
+    compacted: int = 0
+
+
+class Cluster:
+    """In-memory API objects and the controllers acting on them.
+
+    Every method expects `lock` to be held, except the public API ones.
+    Timed transitions run on a scheduler thread, see `start`.
+
+    Args:
+        settings (Settings): Cluster to pretend to be.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self.lock = threading.Condition()
+        self.version: int = 1
+        self.collections: Dict[str, Collection] = {
+            plural: Collection() for plural in KINDS
+        }
+        self.timers: List[Tuple[float, int, Callable[..., None], Tuple]] = []
+        self.sequence = itertools.count()
+        self.pages: "OrderedDict[str, Tuple[List[Dict[str, Any]], str]]" = OrderedDict()
+        node = {name: parse(v) for name, v in settings.node().items()}
+        self.capacity: Requests = node
+        self.free: List[Requests] = [dict(node) for _ in range(settings.nodes)]
+        self.limit: Requests = {
+            name: value * settings.nodes * Decimal(str(settings.quota))
+            for name, value in node.items()
+        }
+        self.usage: Requests = {}
+        # Pods waiting for a node, and the ones holding node resources.
+        self.unscheduled: Deque[Tuple[Key, Requests]] = deque()
+        self.bound: Dict[Key, Tuple[int, Requests]] = {}
+        # Workloads waiting for quota, and the ones admitted.
+        self.pending: List[Tuple[int, int, Key]] = []
+        self.admitted: Dict[Key, Tuple[int, int, Requests]] = {}
+        # Pod and workload of every job.
+        self.pods: Dict[Key, Key] = {}
+        self.workloads: Dict[Key, Key] = {}
+        with self.lock:
+            self._seed()
+
+    # Storage
+
+    def _emit(self, plural: str, kind: str, obj: Dict[str, Any]) -> None:
+        """Bump the resource version of an object and record the change."""
+        self.version += 1
+        metadata: Dict[str, Any] = obj["metadata"]
+        metadata["resourceVersion"] = str(self.version)
+        collection = self.collections[plural]
+        line: bytes = encode({"type": kind, "object": obj}) + b"\n"
+        collection.events.append(
+            Event(
+                self.version,
+                metadata.get("namespace", ""),
+                dict(metadata.get("labels") or {}),
+                line,
+            )
+        )
+        collection.versions.append(self.version)
+        if len(collection.events) > 2 * self.settings.history:
+            drop: int = len(collection.events) - self.settings.history
+            collection.compacted = collection.versions[drop - 1]
+            del collection.events[:drop]
+            del collection.versions[:drop]
+        self.lock.notify_all()
+
+    def _store(self, plural: str, obj: Dict[str, Any]) -> Dict[str, Any]:
+        api_version, kind, namespaced = KINDS[plural]
+        metadata: Dict[str, Any] = obj.setdefault("metadata", {})
+        key: Key = (
+            metadata.get("namespace", "") if namespaced else "",
+            metadata["name"],
+        )
+        collection = self.collections[plural]
+        if key in collection.objects:
+            raise ApiError(409, "AlreadyExists", f'{plural} "{key[1]}" already exists')
+        obj.update(apiVersion=api_version, kind=kind)
+        metadata.setdefault("uid", str(uuid.uuid4()))
+        metadata.setdefault("creationTimestamp", now())
+        collection.objects[key] = obj
+        self._emit(plural, "ADDED", obj)
+        return obj
+
+    def _remove(self, plural: str, key: Key) -> Optional[Dict[str, Any]]:
+        obj = self.collections[plural].objects.pop(key, None)
+        if obj is None:
+            return None
+        if plural == "jobs":
+            self._cascade(key)
+        elif plural == "pods":
+            self._unbind(key)
+        elif plural == "workloads":
+            self._release(key)
+        self._emit(plural, "DELETED", obj)
+        return obj
+
+    def _get(self, plural: str, key: Key) -> Optional[Dict[str, Any]]:
+        return self.collections[plural].objects.get(key)
+
+    def _seed(self) -> None:
+        settings = self.settings
+        for index in range(settings.nodes):
+            name: str = f"fake-node-{index}"
+            self._store(
+                "nodes",
+                {
+                    "metadata": {
+                        "name": name,
+                        "labels": {
+                            "kubernetes.io/hostname": name,
+                            "skaha.opencadc.org/node-type": "worker-node",
+                        },
+                    },
+                    "status": {
+                        "capacity": settings.node(),
+                        "allocatable": settings.node(),
+                    },
+                },
+            )
+        for namespace in settings.namespaces:
+            self._store("namespaces", {"metadata": {"name": namespace}})
+            self._store(
+                "localqueues",
+                {
+                    "metadata": {"name": settings.kueue, "namespace": namespace},
+                    "spec": {"clusterQueue": settings.clusterqueue},
+                },
+            )
+        for name, value in PRIORITIES.items():
+            self._store(
+                "workloadpriorityclasses", {"metadata": {"name": name}, "value": value}
+            )
+        quotas = [
+            {"name": name, "nominalQuota": quantity(self.limit[name])} for name in QUOTA
+        ]
+        self._store(
+            "clusterqueues",
+            {
+                "metadata": {"name": settings.clusterqueue},
+                "spec": {
+                    "namespaceSelector": {},
+                    "queueingStrategy": "StrictFIFO",
+                    "resourceGroups": [
+                        {
+                            "coveredResources": list(QUOTA),
+                            "flavors": [{"name": FLAVOR, "resources": quotas}],
+                        }
+                    ],
+                    "preemption": {"withinClusterQueue": "LowerPriority"},
+                },
+                "status": {},
+            },
+        )
+
+    def _refresh(self, plural: str, obj: Dict[str, Any]) -> Dict[str, Any]:
+        """Status computed when read rather than on every change."""
+        if plural == "clusterqueues":
+            obj["status"] = {
+                "flavorsUsage": [
+                    {
+                        "name": FLAVOR,
+                        "resources": [
+                            {
+                                "name": name,
+                                "total": quantity(self.usage.get(name, Decimal(0))),
+                            }
+                            for name in QUOTA
+                        ],
+                    }
+                ],
+                "pendingWorkloads": len(self.pending),
+                "reservingWorkloads": len(self.admitted),
+                "admittedWorkloads": len(self.admitted),
+            }
+        return obj
+
+    # Timers
+
+    def _later(self, delay: float, callback: Callable[..., None], *args: Any) -> None:
+        heapq.heappush(
+            self.timers, (monotonic() + delay, next(self.sequence), callback, args)
+        )
+        self.lock.notify_all()
+
+    def _tick(self) -> None:
+        """Run due timers, forever."""
+        with self.lock:
+            while True:
+                if not self.timers:
+                    self.lock.wait()
+                    continue
+                delay: float = self.timers[0][0] - monotonic()
+                if delay > 0:
+                    self.lock.wait(delay)
+                    continue
+                _due, _order, callback, args = heapq.heappop(self.timers)
+                try:
+                    callback(*args)
+                except Exception as error:
+                    logger.exception("Fake controller failed: %s", error)
+
+    def start(self) -> None:
+        """Start running the timed transitions in the background."""
+        threading.Thread(
+            target=self._tick, name="fake-controllers", daemon=True
+        ).start()
+
+    # Jobs and pods
+
+    def _submit(self, job: Dict[str, Any]) -> None:
+        metadata: Dict[str, Any] = job["metadata"]
+        key: Key = (metadata["namespace"], metadata["name"])
+        job.setdefault("status", {})
+        labels: Dict[str, str] = metadata.get("labels") or {}
+        if job["spec"].get("suspend") and labels.get(QUEUE_LABEL):
+            self._queue(key, job)
+        elif not job["spec"].get("suspend"):
+            self._start(key, job)
+
+    def _start(self, key: Key, job: Dict[str, Any]) -> None:
+        """Start an unsuspended job, which the Job controller times from here
+        rather than from its pod running."""
+        job["spec"]["suspend"] = False
+        job["status"]["startTime"] = now()
+        self._emit("jobs", "MODIFIED", job)
+        self._pod(key, job)
+
+    def _pod(self, key: Key, job: Dict[str, Any]) -> None:
+        """Create the pod of a job and wait for a node."""
+        template: Dict[str, Any] = job["spec"]["template"]
+        uid: str = job["metadata"]["uid"]
+        labels: Dict[str, str] = dict(
+            (template.get("metadata") or {}).get("labels") or {}
+        )
+        labels.update(
+            {
+                "batch.kubernetes.io/job-name": key[1],
+                "job-name": key[1],
+                "batch.kubernetes.io/controller-uid": uid,
+                "controller-uid": uid,
+            }
+        )
+        pod: Dict[str, Any] = {
+            "metadata": {
+                "name": f"{key[1]}-{uuid.uuid4().hex[:5]}",
+                "namespace": key[0],
+                "labels": labels,
+                "ownerReferences": [
+                    {
+                        "apiVersion": "batch/v1",
+                        "kind": "Job",
+                        "name": key[1],
+                        "uid": uid,
+                        "controller": True,
+                    }
+                ],
+            },
+            "spec": dict(template["spec"]),
+            "status": {"phase": "Pending"},
+        }
+        self._store("pods", pod)
+        name: Key = (key[0], pod["metadata"]["name"])
+        self.pods[key] = name
+        self.unscheduled.append((name, requests(pod["spec"])))
+        self._place()
+
+    def _place(self) -> None:
+        """Bind waiting pods to the first node with room, in order. Like
+        kube-scheduler, pods that fit no node stay pending without holding
+        back the pods after them."""
+        waiting: Deque[Tuple[Key, Requests]] = deque()
+        # Requests that fit no node, so pods alike are not tried again
+        unfit: Set[Tuple[Tuple[str, Decimal], ...]] = set()
+        while self.unscheduled:
+            key, wanted = self.unscheduled.popleft()
+            pod = self._get("pods", key)
+            if pod is None or key in self.bound:
+                continue
+            shape = tuple(sorted(wanted.items()))
+            node: Optional[int] = None
+            if shape not in unfit:
+                node = next(
+                    (
+                        index
+                        for index, free in enumerate(self.free)
+                        if _fits(wanted, {}, free)
+                    ),
+                    None,
+                )
+            if node is None:
+                unfit.add(shape)
+                waiting.append((key, wanted))
+                continue
+            _add(self.free[node], wanted, -1)
+            self.bound[key] = (node, wanted)
+            pod["spec"]["nodeName"] = f"fake-node-{node}"
+            pod["status"]["conditions"] = [
+                {"type": "PodScheduled", "status": "True", "lastTransitionTime": now()}
+            ]
+            self._emit("pods", "MODIFIED", pod)
+            self._later(
+                self.settings.startup_delay, self._run, key, pod["metadata"]["uid"]
+            )
+        self.unscheduled = waiting
+
+    def _unbind(self, key: Key) -> None:
+        """Return the node resources held by a pod."""
+        if key in self.bound:
+            node, wanted = self.bound.pop(key)
+            _add(self.free[node], wanted)
+            self._later(0, self._place)
+
+    def _owner(self, pod: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        reference: Dict[str, Any] = pod["metadata"]["ownerReferences"][0]
+        return self._get("jobs", (pod["metadata"]["namespace"], reference["name"]))
+
+    def _run(self, key: Key, uid: str) -> None:
+        pod = self._get("pods", key)
+        if pod is None or pod["metadata"]["uid"] != uid:
+            return
+        started: str = now()
+        name: str = pod["spec"]["containers"][0]["name"]
+        pod["status"].update(
+            phase="Running",
+            startTime=started,
+            containerStatuses=[
+                {
+                    "name": name,
+                    "ready": True,
+                    "state": {"running": {"startedAt": started}},
+                }
+            ],
+        )
+        self._emit("pods", "MODIFIED", pod)
+        job = self._owner(pod)
+        if job is not None:
+            job["status"]["active"] = 1
+            self._emit("jobs", "MODIFIED", job)
+        seconds: float = duration(pod["spec"]) / self.settings.speed
+        self._later(seconds, self._succeed, key, uid)
+
+    def _succeed(self, key: Key, uid: str) -> None:
+        pod = self._get("pods", key)
+        if pod is None or pod["metadata"]["uid"] != uid:
+            return
+        finished: str = now()
+        for status in pod["status"]["containerStatuses"]:
+            started: str = status["state"]["running"]["startedAt"]
+            status["ready"] = False
+            status["state"] = {
+                "terminated": {
+                    "exitCode": 0,
+                    "reason": "Completed",
+                    "startedAt": started,
+                    "finishedAt": finished,
+                }
+            }
+        pod["status"]["phase"] = "Succeeded"
+        self._unbind(key)
+        self._emit("pods", "MODIFIED", pod)
+        job = self._owner(pod)
+        if job is None:
+            return
+        job["status"].pop("active", None)
+        job["status"].update(
+            succeeded=1,
+            completionTime=finished,
+            conditions=[
+                {
+                    "type": "Complete",
+                    "status": "True",
+                    "lastProbeTime": finished,
+                    "lastTransitionTime": finished,
+                }
+            ],
+        )
+        self._emit("jobs", "MODIFIED", job)
+        name: Optional[Key] = self.workloads.get((key[0], job["metadata"]["name"]))
+        workload = self._get("workloads", name) if name else None
+        if name and workload is not None:
+            self._condition(workload, "Finished", "True", "Succeeded", "Job finished")
+            self._release(name)
+            self._emit("workloads", "MODIFIED", workload)
+
+    def _cascade(self, key: Key) -> None:
+        """Delete the pod and workload of a deleted job."""
+        pod: Optional[Key] = self.pods.pop(key, None)
+        if pod is not None:
+            self._remove("pods", pod)
+        workload: Optional[Key] = self.workloads.pop(key, None)
+        if workload is not None:
+            self._remove("workloads", workload)
+
+    # Kueue
+
+    @staticmethod
+    def _condition(
+        obj: Dict[str, Any], kind: str, status: str, reason: str, message: str
+    ) -> None:
+        conditions: List[Dict[str, Any]] = obj["status"].setdefault("conditions", [])
+        for condition in conditions:
+            if condition["type"] == kind:
+                break
+        else:
+            condition = {"type": kind}
+            conditions.append(condition)
+        if condition.get("status") != status:
+            condition["lastTransitionTime"] = now()
+        condition.update(status=status, reason=reason, message=message)
+
+    def _queue(self, key: Key, job: Dict[str, Any]) -> None:
+        """Create the workload of a suspended job and queue it for admission."""
+        metadata: Dict[str, Any] = job["metadata"]
+        labels: Dict[str, str] = metadata.get("labels") or {}
+        priority_class: Optional[str] = labels.get(PRIORITY_LABEL)
+        priority_object = self._get(
+            "workloadpriorityclasses", ("", priority_class or "")
+        )
+        priority: int = int((priority_object or {}).get("value") or 0)
+        template: Dict[str, Any] = job["spec"]["template"]
+        workload: Dict[str, Any] = {
+            "metadata": {
+                "name": f"job-{key[1]}-{metadata['uid'][:5]}",
+                "namespace": key[0],
+                "labels": {"kueue.x-k8s.io/job-uid": metadata["uid"]},
+                "ownerReferences": [
+                    {
+                        "apiVersion": "batch/v1",
+                        "kind": "Job",
+                        "name": key[1],
+                        "uid": metadata["uid"],
+                        "controller": True,
+                    }
+                ],
+            },
+            "spec": {
+                "queueName": labels[QUEUE_LABEL],
+                "priority": priority,
+                "priorityClassName": priority_class,
+                "priorityClassSource": "kueue.x-k8s.io/workloadpriorityclass",
+                "podSets": [{"name": "main", "count": 1, "template": template}],
+            },
+            "status": {},
+        }
+        self._store("workloads", workload)
+        name: Key = (key[0], workload["metadata"]["name"])
+        self.workloads[key] = name
+        if self._get("localqueues", (key[0], labels[QUEUE_LABEL])) is None:
+            logger.debug("Workload %s has no LocalQueue, not admitted", name[1])
+            return
+        self._later(self.settings.admission_delay, self._enqueue, name, priority)
+
+    def _enqueue(self, key: Key, priority: int) -> None:
+        if self._get("workloads", key) is not None:
+            heapq.heappush(self.pending, (-priority, next(self.sequence), key))
+            self._admit()
+
+    def _admit(self) -> None:
+        """Admit waiting workloads in priority order while quota allows."""
+        while self.pending:
+            priority, _order, key = self.pending[0]
+            workload = self._get("workloads", key)
+            if workload is None or key in self.admitted:
+                heapq.heappop(self.pending)
+                continue
+            wanted: Requests = requests(
+                workload["spec"]["podSets"][0]["template"]["spec"]
+            )
+            if not _fits(wanted, self.usage, self.limit):
+                victims: Optional[List[Key]] = self._victims(-priority, wanted)
+                if victims is None:
+                    return
+                for victim in victims:
+                    self._evict(victim, workload["metadata"]["uid"])
+            heapq.heappop(self.pending)
+            self._reserve(key, workload, -priority, wanted)
+
+    def _victims(self, priority: int, wanted: Requests) -> Optional[List[Key]]:
+        """Admitted workloads of lower priority to preempt, lowest and newest
+        first, or None if preempting all of them would not make room."""
+        candidates = sorted(
+            (
+                (other, order, key)
+                for key, (other, order, _wanted) in self.admitted.items()
+                if other < priority
+            ),
+            key=lambda item: (item[0], -item[1]),
+        )
+        usage: Requests = dict(self.usage)
+        victims: List[Key] = []
+        for _priority, _order, key in candidates:
+            _add(usage, self.admitted[key][2], -1)
+            victims.append(key)
+            if _fits(wanted, usage, self.limit):
+                return victims
+        return None
+
+    def _reserve(
+        self, key: Key, workload: Dict[str, Any], priority: int, wanted: Requests
+    ) -> None:
+        _add(self.usage, wanted)
+        self.admitted[key] = (priority, next(self.sequence), wanted)
+        clusterqueue: str = self.settings.clusterqueue
+        message: str = f"Quota reserved in ClusterQueue {clusterqueue}"
+        self._condition(workload, "QuotaReserved", "True", "QuotaReserved", message)
+        self._condition(workload, "Admitted", "True", "Admitted", message)
+        for condition in workload["status"]["conditions"]:
+            if condition["type"] == "Evicted" and condition["status"] == "True":
+                previous: str = condition["message"]
+                self._condition(
+                    workload,
+                    "Evicted",
+                    "False",
+                    "QuotaReserved",
+                    f"Previously: {previous}",
+                )
+        workload["status"]["admission"] = {
+            "clusterQueue": clusterqueue,
+            "podSetAssignments": [
+                {
+                    "name": "main",
+                    "count": 1,
+                    "flavors": dict.fromkeys(QUOTA, FLAVOR),
+                    "resourceUsage": {
+                        name: quantity(value) for name, value in wanted.items()
+                    },
+                }
+            ],
+        }
+        self._emit("workloads", "MODIFIED", workload)
+        owner: Dict[str, Any] = workload["metadata"]["ownerReferences"][0]
+        job_key: Key = (key[0], owner["name"])
+        job = self._get("jobs", job_key)
+        if job is not None:
+            self._start(job_key, job)
+
+    def _release(self, key: Key) -> None:
+        """Return the quota reserved by a workload."""
+        if key in self.admitted:
+            _add(self.usage, self.admitted.pop(key)[2], -1)
+            self._later(0, self._admit)
+
+    def _evict(self, key: Key, preemptor: str) -> None:
+        """Preempt an admitted workload, suspending its job and requeueing it."""
+        workload = self._get("workloads", key)
+        if workload is None:
+            return
+        self._release(key)
+        message: str = (
+            f"Preempted to accommodate a workload (UID: {preemptor}) due to "
+            "prioritization in the ClusterQueue"
+        )
+        self._condition(workload, "Evicted", "True", "Preempted", message)
+        self._condition(workload, "Preempted", "True", "InClusterQueue", message)
+        self._condition(workload, "QuotaReserved", "False", "Pending", message)
+        self._condition(workload, "Admitted", "False", "NoReservation", message)
+        self._condition(workload, "Requeued", "True", "Preempted", message)
+        workload["status"].pop("admission", None)
+        self._emit("workloads", "MODIFIED", workload)
+        owner: Dict[str, Any] = workload["metadata"]["ownerReferences"][0]
+        job_key: Key = (key[0], owner["name"])
+        job = self._get("jobs", job_key)
+        if job is not None:
+            job["spec"]["suspend"] = True
+            job["status"].pop("active", None)
+            job["status"].pop("startTime", None)
+            self._emit("jobs", "MODIFIED", job)
+        pod: Optional[Key] = self.pods.pop(job_key, None)
+        if pod is not None:
+            self._remove("pods", pod)
+        self._later(
+            self.settings.admission_delay,
+            self._enqueue,
+            key,
+            int(workload["spec"]["priority"]),
+        )
+
+    # API
+
+    def create(self, plural: str, namespace: str, obj: Dict[str, Any]) -> bytes:
+        """Create an object, starting the lifecycle of jobs."""
+        with self.lock:
+            if KINDS[plural][2]:
+                obj.setdefault("metadata", {})["namespace"] = namespace
+            if not (obj.get("metadata") or {}).get("name"):
+                raise ApiError(422, "Invalid", "metadata.name: Required value")
+            self._store(plural, obj)
+            if plural == "jobs":
+                self._submit(obj)
+            return encode(obj)
+
+    def get(self, plural: str, namespace: str, name: str) -> bytes:
+        with self.lock:
+            obj = self._get(plural, (namespace, name))
+            if obj is None:
+                raise ApiError(404, "NotFound", f'{plural} "{name}" not found')
+            return encode(self._refresh(plural, obj))
+
+    def delete(self, plural: str, namespace: str, name: str) -> bytes:
+        """Delete an object, and the pod and workload of a job."""
+        with self.lock:
+            obj = self._remove(plural, (namespace, name))
+            if obj is None:
+                raise ApiError(404, "NotFound", f'{plural} "{name}" not found')
+            return encode(obj)
+
+    def _select(
+        self, plural: str, namespace: Optional[str], query: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        labels = selector(query.get("labelSelector"))
+        matches = fields(query.get("fieldSelector"))
+        return [
+            self._refresh(plural, obj)
+            for (scope, _name), obj in self.collections[plural].objects.items()
+            if (not namespace or scope == namespace)
+            and labels(obj["metadata"].get("labels") or {})
+            and matches(obj)
+        ]
+
+    def delete_collection(
+        self, plural: str, namespace: Optional[str], query: Dict[str, str]
+    ) -> bytes:
+        """Delete the matching objects, listing them."""
+        with self.lock:
+            items = self._select(plural, namespace, query)
+            for obj in items:
+                metadata: Dict[str, Any] = obj["metadata"]
+                self._remove(plural, (metadata.get("namespace", ""), metadata["name"]))
+            return encode(self._list(plural, items, str(self.version)))
+
+    def list(
+        self, plural: str, namespace: Optional[str], query: Dict[str, str]
+    ) -> bytes:
+        """One page of the matching objects, as of the first page."""
+        with self.lock:
+            token: Optional[str] = query.get("continue")
+            if token:
+                if token not in self.pages:
+                    raise ApiError(410, "Expired", "continue token expired")
+                items, version = self.pages.pop(token)
+            else:
+                items, version = (
+                    self._select(plural, namespace, query),
+                    str(self.version),
+                )
+            limit: int = int(query.get("limit") or 0)
+            page: Dict[str, Any] = self._list(
+                plural, items[:limit] if limit else items, version
+            )
+            rest: List[Dict[str, Any]] = items[limit:] if limit else []
+            if rest:
+                token = str(next(self.sequence))
+                self.pages[token] = (rest, version)
+                while len(self.pages) > 64:
+                    self.pages.popitem(last=False)
+                page["metadata"].update(
+                    {"continue": token, "remainingItemCount": len(rest)}
+                )
+            return encode(page)
+
+    @staticmethod
+    def _list(plural: str, items: List[Dict[str, Any]], version: str) -> Dict[str, Any]:
+        api_version, kind, _namespaced = KINDS[plural]
+        return {
+            "kind": f"{kind}List",
+            "apiVersion": api_version,
+            "metadata": {"resourceVersion": version},
+            "items": items,
+        }
+
+    def changes(
+        self,
+        plural: str,
+        since: int,
+        namespace: Optional[str],
+        labels: Callable[[Dict[str, str]], bool],
+        deadline: float,
+    ) -> Tuple[List[bytes], int]:
+        """Watch events after a resource version, waiting until the deadline.
+
+        Raises:
+            ApiError: 410 Gone if events after `since` are no longer kept.
+
+        Returns:
+            Tuple[List[bytes], int]: Matching event lines, and the version to
+                continue from.
+        """
+        collection = self.collections[plural]
+        with self.lock:
+            self.lock.wait_for(
+                lambda: (
+                    (collection.versions and collection.versions[-1] > since)
+                    or monotonic() >= deadline
+                ),
+                timeout=max(deadline - monotonic(), 0),
+            )
+            if since < collection.compacted:
+                raise ApiError(410, "Expired", f"too old resource version: {since}")
+            start: int = bisect.bisect_right(collection.versions, since)
+            events: List[Event] = collection.events[start:]
+            lines: List[bytes] = [
+                event.line
+                for event in events
+                if (not namespace or event.namespace == namespace)
+                and labels(event.labels)
+            ]
+            return lines, events[-1].version if events else since
+
+
+def route(path: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """Resource, namespace and name of an API path.
+
+    Raises:
+        ApiError: 404 for paths outside the served resources.
+    """
+    parts: List[str] = [part for part in path.split("/") if part]
+    if parts[:2] == ["api", "v1"]:
+        parts = parts[2:]
+    elif parts[:1] == ["apis"] and len(parts) >= 3:
+        parts = parts[3:]
+    else:
+        raise ApiError(404, "NotFound", f"{path} not found")
+    namespace: Optional[str] = None
+    if len(parts) >= 3 and parts[0] == "namespaces":
+        namespace, parts = parts[1], parts[2:]
+    if not parts or parts[0] not in KINDS or len(parts) > 2:
+        raise ApiError(404, "NotFound", f"{path} not found")
+    return parts[0], namespace, parts[1] if len(parts) == 2 else None
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Kubernetes REST calls against the `cluster` of the server."""
+
+    protocol_version = "HTTP/1.1"
+    server: "Server"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s %s", self.address_string(), format % args)
+
+    def _reply(self, code: int, body: bytes) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> Dict[str, Any]:
+        length: int = int(self.headers.get("Content-Length") or 0)
+        data: bytes = self.rfile.read(length) if length else b""
+        return json.loads(data) if data else {}
+
+    def _query(self) -> Dict[str, str]:
+        query = parse_qs(urlparse(self.path).query)
+        return {key: values[-1] for key, values in query.items()}
+
+    def _handle(self, method: str) -> None:
+        cluster: Cluster = self.server.cluster
+        try:
+            body: Dict[str, Any] = self._body()
+            plural, namespace, name = route(urlparse(self.path).path)
+            query: Dict[str, str] = self._query()
+            if method == "GET" and name:
+                self._reply(200, cluster.get(plural, namespace or "", name))
+            elif method == "GET" and query.get("watch") in ("true", "1"):
+                self._watch(plural, namespace, query)
+            elif method == "GET":
+                self._reply(200, cluster.list(plural, namespace, query))
+            elif method == "POST" and not name:
+                self._reply(201, cluster.create(plural, namespace or "", body))
+            elif method == "DELETE" and name:
+                self._reply(200, cluster.delete(plural, namespace or "", name))
+            elif method == "DELETE":
+                self._reply(200, cluster.delete_collection(plural, namespace, query))
+            else:
+                raise ApiError(405, "MethodNotAllowed", f"{method} not allowed")
+        except ApiError as error:
+            self._reply(error.code, encode(error.status()))
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._handle("GET")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._handle("POST")
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        self._handle("DELETE")
+
+    def _chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _watch(
+        self, plural: str, namespace: Optional[str], query: Dict[str, str]
+    ) -> None:
+        """Stream events as JSON lines until the watch times out."""
+        cluster: Cluster = self.server.cluster
+        since: int = int(query.get("resourceVersion") or 0) or cluster.version
+        timeout: float = float(query.get("timeoutSeconds") or DEFAULT_WATCH)
+        deadline: float = monotonic() + timeout
+        labels = selector(query.get("labelSelector"))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        while monotonic() < deadline:
+            try:
+                lines, since = cluster.changes(
+                    plural, since, namespace, labels, deadline
+                )
+            except ApiError as error:
+                event = {"type": "ERROR", "object": error.status()}
+                self._chunk(encode(event) + b"\n")
+                break
+            if lines:
+                self._chunk(b"".join(lines))
+        else:
+            if query.get("allowWatchBookmarks") == "true":
+                api_version, kind, _namespaced = KINDS[plural]
+                bookmark = {
+                    "type": "BOOKMARK",
+                    "object": {
+                        "kind": kind,
+                        "apiVersion": api_version,
+                        "metadata": {"resourceVersion": str(since)},
+                    },
+                }
+                self._chunk(encode(bookmark) + b"\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class Server(ThreadingHTTPServer):
+    """HTTP server of a fake cluster, one thread per connection."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, settings: Settings, host: str, port: int) -> None:
+        super().__init__((host, port), Handler)
+        self.cluster = Cluster(settings)
+        self.cluster.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def kubeconfig(url: str, filepath: str) -> None:
+    """Write a kubeconfig pointing to a fake server."""
+    data: Dict[str, Any] = {
+        "apiVersion": "v1",
+        "kind": "Config",
+        "clusters": [{"name": "fake", "cluster": {"server": url}}],
+        "users": [{"name": "fake", "user": {"token": "fake"}}],
+        "contexts": [{"name": "fake", "context": {"cluster": "fake", "user": "fake"}}],
+        "current-context": "fake",
+    }
+    with open(filepath, "w", encoding="utf-8") as f:
+        yaml.safe_dump(data, f)
+
+
+@app.command("serve")
+def serve(
+    host: str = typer.Option(DEFAULT_HOST, "--host", help="Address to listen on."),
+    port: int = typer.Option(DEFAULT_PORT, "--port", help="Port to listen on."),
+    config: Optional[str] = (
+        typer.Option(
+            None, "--kubeconfig", help="Write a kubeconfig for the server to this file."
+        )
+    ),
+    nodes: int = typer.Option(2, "--nodes", help="Number of worker nodes."),
+    cores: int = typer.Option(16, "-c", "--cores", help="CPU cores per node."),
+    ram: int = typer.Option(64, "-r", "--ram", help="RAM per node in GB."),
+    storage: int = (
+        typer.Option(500, "-s", "--storage", help="Ephemeral storage per node in GB.")
+    ),
+    quota: float = (
+        typer.Option(
+            1.0, "--quota", help="Fraction of the node totals the ClusterQueue admits."
+        )
+    ),
+    admission_delay: float = (
+        typer.Option(
+            0.0,
+            "--admission-delay",
+            help="Seconds before Kueue considers a new or requeued workload.",
+        )
+    ),
+    startup_delay: float = (
+        typer.Option(
+            0.0, "--startup-delay", help="Seconds from pod placement to running."
+        )
+    ),
+    speed: float = (
+        typer.Option(
+            1.0, "--speed", help="Factor job durations are divided by, e.g. 10."
+        )
+    ),
+    namespaces: List[str] = (
+        typer.Option(  # noqa: B008
+            [DEFAULT_NAMESPACE],
+            "-n",
+            "--namespace",
+            help="Namespace with a LocalQueue, can be given multiple times.",
+        )
+    ),
+    kueue: str = (
+        typer.Option(DEFAULT_KUEUE, "-k", "--kueue", help="Name of the LocalQueues.")
+    ),
+    clusterqueue: str = (
+        typer.Option(
+            DEFAULT_CLUSTERQUEUE, "--clusterqueue", help="Name of the ClusterQueue."
+        )
+    ),
+    history: int = (
+        typer.Option(
+            DEFAULT_HISTORY,
+            "--history",
+            help="Events kept per resource, older watches get 410 Gone.",
+        )
+    ),
+):
+    """Serve a fake Kubernetes API with Kueue until interrupted."""
+    settings = Settings(
+        nodes=nodes,
+        cores=cores,
+        ram=ram,
+        storage=storage,
+        quota=quota,
+        admission_delay=admission_delay,
+        startup_delay=startup_delay,
+        speed=speed,
+        namespaces=namespaces,
+        kueue=kueue,
+        clusterqueue=clusterqueue,
+        history=history,
+    )
+    server = Server(settings, host, port)
+    if config:
+        kubeconfig(server.url, config)
+        logger.info("Wrote kubeconfig to %s", config)
+    logger.info(
+        "Fake cluster of %s nodes with %s cores, %sGB RAM and %sGB storage each",
+        nodes,
+        cores,
+        ram,
+        storage,
+    )
+    logger.info("Serving at %s, LocalQueue %s in %s", server.url, kueue, namespaces)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopping fake cluster")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    app()
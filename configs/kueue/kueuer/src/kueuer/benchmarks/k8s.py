@@ -1,18 +1,39 @@
 """Launches a job in a Kubernetes cluster."""
 
 import asyncio
-from time import time
-from typing import Any, Awaitable, Dict, List, Optional
+import json
+import math
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from time import perf_counter, sleep, time
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-import aiofiles
-import aiofiles.os
 import typer
-import yaml
-from kubernetes import client, config
+from kubernetes import client
 from kubernetes.client.rest import ApiException
 
-from kueuer.benchmarks import DEFAULT_JOBSPEC_FILEPATH
-from kueuer.utils import io
+from kueuer.benchmarks import (
+    DEFAULT_JOBSPEC_FILEPATH,
+    DEFAULT_NAMESPACE,
+    RUN_ID_LABEL,
+    arrivals,
+    mixes,
+    submit,
+    template,
+    trace,
+)
+from kueuer.utils import io, kube
 from kueuer.utils.logging import logger
 
 app = typer.Typer(help="Launch K8s Jobs")
@@ -31,9 +52,8 @@ def check(namespace: str, kueue: str, priority: str) -> bool:
     """
 
     # Check if the namespace exists
-    config.load_kube_config()
-    crd: client.CustomObjectsApi = client.CustomObjectsApi()
-    v1 = client.CoreV1Api()
+    crd: client.CustomObjectsApi = kube.custom()
+    v1 = kube.core()
     checks: Dict[str, bool] = {}
     try:
         v1.read_namespace(name=namespace)  # type: ignore
@@ -43,39 +63,37 @@ def check(namespace: str, kueue: str, priority: str) -> bool:
             logger.error("Namespace %s not found", namespace)
 
     try:
-        localkueues = crd.list_namespaced_custom_object(  # type: ignore
+        crd.get_namespaced_custom_object(  # type: ignore
             group="kueue.x-k8s.io",
             version="v1beta1",
             namespace=namespace,
             plural="localqueues",
+            name=kueue,
         )
-        for localqueue in localkueues.get("items", []):
-            if localqueue.get("metadata", {}).get("name") == kueue:
-                logger.info("LocalQueue %s found in namespace %s", kueue, namespace)
-                checks["kueue"] = True
-                break
+        logger.info("LocalQueue %s found in namespace %s", kueue, namespace)
+        checks["kueue"] = True
     except ApiException as error:
         logger.error(
             "Error checking for Kueue LocalQueue %s in namespace %s: %s",
             kueue,
             namespace,
-            error,
+            error.reason if error.status == 404 else error,
         )
 
     try:
-        priorities = crd.list_cluster_custom_object(
-            group="kueue.x-k8s.io", version="v1beta1", plural="workloadpriorityclasses"
-        )
-        for priorityclass in priorities.get("items", []):
-            if priorityclass.get("metadata", {}).get("name") == priority:
-                logger.info("Kueue PriorityClass %s found.", priority)
-                checks["priority"] = True
-                break
+        crd.get_cluster_custom_object(  # type: ignore
+            group="kueue.x-k8s.io",
+            version="v1beta1",
+            plural="workloadpriorityclasses",
+            name=priority,
+        )
+        logger.info("Kueue PriorityClass %s found.", priority)
+        checks["priority"] = True
     except ApiException as error:
         logger.error(
             "Error checking for Kueue PriorityClass %s: %s",
             priority,
-            error,
+            error.reason if error.status == 404 else error,
         )
     if len(checks) != 3:
         logger.error("Not all checks passed")
@@ -85,26 +103,26 @@ def check(namespace: str, kueue: str, priority: str) -> bool:
         return True
 
 
-def clusterqueue(kueue: str) -> Optional[str]:
+def clusterqueue(kueue: str, namespace: str = DEFAULT_NAMESPACE) -> Optional[str]:
     """Get the clusterqueue name for the given kueue.
 
     Args:
-        kueue (str): Kueue name.
+        kueue (str): Kueue LocalQueue name.
+        namespace (str): Namespace of the LocalQueue.
 
     Returns:
         Optional[str]: Clusterqueue name.
     """
-    config.load_kube_config()
-    crd: client.CustomObjectsApi = client.CustomObjectsApi()
+    crd: client.CustomObjectsApi = kube.custom()
     try:
-        queues = crd.list_cluster_custom_object(  # type: ignore
+        queue = crd.get_namespaced_custom_object(  # type: ignore
             group="kueue.x-k8s.io",
             version="v1beta1",
-            plural="clusterqueues",
+            namespace=namespace,
+            plural="localqueues",
+            name=kueue,
         )
-        for queue in queues.get("items", []):
-            if queue.get("metadata", {}).get("name") == kueue:
-                return queue.get("spec", {}).get("clusterqueue")
+        return queue.get("spec", {}).get("clusterQueue")
     except ApiException as error:
         logger.error(
             "Error checking for Kueue ClusterQueue %s: %s",
@@ -114,44 +132,178 @@ def clusterqueue(kueue: str) -> Optional[str]:
     return None
 
 
-async def apply(data: Dict[Any, Any], prefix: str, count: int) -> bool:
+async def apply(
+    data: Dict[Any, Any],
+    prefix: str,
+    count: int,
+    concurrency: int = submit.DEFAULT_CONCURRENCY,
+) -> submit.Report:
     """Kubernetes job apply.
 
     Args:
         data (Dict[Any, Any]): K8s job template.
-        name (str): Name of the job.
+        prefix (str): Prefix for the job names.
+        count (int): Number of jobs to create.
+        concurrency (int): Maximum number of API requests in flight.
 
+    Returns:
+        submit.Report: Submission latency and throughput.
     """
-    async with aiofiles.tempfile.NamedTemporaryFile(
-        delete=False, mode="w", suffix=".yaml"
-    ) as temp:
-        for num in range(count):
-            name: str = f"{prefix}-{num}"
-            data["metadata"]["name"] = name
-            for container in data["spec"]["template"]["spec"]["containers"]:
-                container["name"] = name
-            await temp.write(yaml.dump(data))
-            await temp.write("\n---\n")
-    logger.debug("Applying %s", temp.name)
-    now = time()
-    try:
-        command = f"kubectl apply -f {temp.name}"
-        proc = await asyncio.create_subprocess_shell(
-            command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await proc.communicate()
-        logger.debug("stdout: %s", stdout.decode())
-        if stderr:
-            logger.info("stderr: %s", stderr.decode())
-        if proc.returncode != 0:
-            logger.error("Error applying %s", temp.name)
-            return False
-        return True
-    finally:
-        logger.info("Took %ss to apply k8s manifest", time() - now)
-        await temp.close()
-        await aiofiles.os.remove(str(temp.name))
-        logger.debug("Deleted %s", temp.name)
+    namespace: str = data["metadata"]["namespace"]
+    bodies = template.Template(data).bodies(prefix, count)
+    logger.debug("Submitting %s jobs to namespace %s", count, namespace)
+    return await submit.jobs(bodies, namespace, concurrency=concurrency)
+
+
+async def launch(
+    data: Dict[Any, Any],
+    prefix: str,
+    count: int,
+    process: arrivals.Process,
+    concurrency: int = submit.DEFAULT_CONCURRENCY,
+    draws: Optional[Sequence[mixes.Draw]] = None,
+) -> Tuple[submit.Report, Dict[str, float]]:
+    """Kubernetes job apply, spread over time by an arrival process.
+
+    Args:
+        data (Dict[Any, Any]): K8s job template.
+        prefix (str): Prefix for the job names.
+        count (int): Number of jobs to create.
+        process (arrivals.Process): When each job is submitted.
+        concurrency (int): Maximum number of API requests in flight.
+        draws (Optional[Sequence[mixes.Draw]]): Shape and duration of every job,
+            see `mixes.Mix.sample`, those of the template if None.
+
+    Returns:
+        Tuple[submit.Report, Dict[str, float]]: Submission latency and lag,
+            and the scheduled offset of every job by name.
+    """
+    namespace: str = data["metadata"]["namespace"]
+    offsets: Dict[str, float] = {
+        f"{prefix}-{num}": offset for num, offset in enumerate(process.offsets(count))
+    }
+    templates: Dict[Tuple, template.Template] = {}
+
+    def render(num: int, name: str) -> bytes:
+        key: Tuple = ()
+        if draws is not None:
+            draw = draws[num]
+            key = (
+                draw.duration,
+                _whole(draw.cores),
+                _whole(draw.ram),
+                _whole(draw.storage),
+            )
+        if key not in templates:
+            shaped = reshape(data, *key) if key else data
+            templates[key] = template.Template(shaped)
+        return templates[key].render(name)
+
+    scheduled = (
+        (offset, namespace, name, render(num, name))
+        for num, (name, offset) in enumerate(offsets.items())
+    )
+    logger.debug("Submitting %s jobs to %s, %s", count, namespace, process.label())
+    report = await submit.schedule(scheduled, concurrency, bucket=process.bucket())
+    return report, offsets
+
+
+def manifest(
+    filepath: str,
+    namespace: str,
+    duration: int,
+    cores: float,
+    ram: float,
+    storage: float,
+    kueue: Optional[str] = None,
+    priority: Optional[str] = None,
+    run_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build the stress-ng job manifest shared by every job in a run.
+
+    Args:
+        filepath (str): K8s job template.
+        namespace (str): Namespace to launch jobs in.
+        duration (int): Duration for each job in seconds.
+        cores (float): Number of CPU cores per job.
+        ram (float): RAM in GB per job.
+        storage (float): Ephemeral storage in GB per job.
+        kueue (Optional[str]): Kueue LocalQueue, jobs are suspended if set.
+        priority (Optional[str]): Kueue WorkloadPriorityClass.
+        run_id (Optional[str]): Run-id label for the jobs and their pods.
+
+    Returns:
+        Dict[str, Any]: K8s job manifest without a name.
+    """
+    job = io.read_yaml(filepath)
+
+    # Write common job parameters
+    job["metadata"] = {}
+    job["metadata"]["labels"] = {}
+    job["metadata"]["namespace"] = namespace
+    if kueue:
+        job["metadata"]["labels"]["kueue.x-k8s.io/queue-name"] = kueue
+        job["spec"]["suspend"] = True
+    if priority:
+        job["metadata"]["labels"]["kueue.x-k8s.io/priority-class"] = priority
+    if run_id:
+        job["metadata"]["labels"][RUN_ID_LABEL] = run_id
+        podmeta: Dict[str, Any] = job["spec"]["template"].setdefault("metadata", {})
+        podmeta.setdefault("labels", {})[RUN_ID_LABEL] = run_id
+    return reshape(job, duration, cores, ram, storage, copy=False)
+
+
+def reshape(
+    data: Dict[str, Any],
+    duration: int,
+    cores: float,
+    ram: float,
+    storage: float,
+    copy: bool = True,
+) -> Dict[str, Any]:
+    """Set the stress-ng arguments and resources of every container of a job.
+
+    Args:
+        data (Dict[str, Any]): K8s job manifest, e.g. from `manifest`.
+        duration (int): Duration of the job in seconds.
+        cores (float): Number of CPU cores, stress-ng runs as many workers
+            rounded up.
+        ram (float): RAM in GB.
+        storage (float): Ephemeral storage in GB.
+        copy (bool): Change a copy of the manifest rather than the manifest.
+
+    Returns:
+        Dict[str, Any]: K8s job manifest of the new shape.
+    """
+    job: Dict[str, Any] = deepcopy(data) if copy else data
+    ram_mb: float = ram * 1024.0
+    args: List[str] = [
+        "--cpu",
+        f"{math.ceil(cores)}",
+        "--cpu-method",
+        "matrixprod",
+        "--vm",
+        "1",
+        "--vm-bytes",
+        f"{ram_mb * 0.8}M",
+        "--temp-path",
+        "/tmp",
+        "--timeout",
+        f"{duration}",
+        "--metrics-brief",
+    ]
+    for container in job["spec"]["template"]["spec"]["containers"]:
+        container["args"] = args
+        container["resources"] = {}
+        container["resources"]["limits"] = {}
+        container["resources"]["limits"]["cpu"] = f"{cores}"
+        container["resources"]["limits"]["memory"] = f"{ram_mb}Mi"
+        container["resources"]["limits"]["ephemeral-storage"] = f"{storage}Gi"
+        container["resources"]["requests"] = {}
+        container["resources"]["requests"]["cpu"] = f"{cores}"
+        container["resources"]["requests"]["memory"] = f"{ram_mb}Mi"
+        container["resources"]["requests"]["ephemeral-storage"] = f"{storage}Gi"
+    return job
 
 
 @app.command("run")
@@ -199,52 +351,236 @@ def run(
             None, "-p", "--priority", help="Kueue priority to launch jobs with."
         )
     ),
-) -> None:
+    concurrency: int = (
+        typer.Option(
+            submit.DEFAULT_CONCURRENCY,
+            "--concurrency",
+            help="Maximum number of job creation requests in flight.",
+        )
+    ),
+    run_id: Optional[str] = (
+        typer.Option(
+            None, "--run-id", help="Run-id label for the jobs, defaults to the prefix."
+        )
+    ),
+) -> submit.Report:
     """Run jobs to stress k8s cluster."""
-    ram_mb: float = ram * 1024.0
-    args: List[str] = [
-        "--cpu",
-        f"{cores}",
-        "--cpu-method",
-        "matrixprod",
-        "--vm",
-        "1",
-        "--vm-bytes",
-        f"{ram_mb * 0.8}M",
-        "--temp-path",
-        "/tmp",
-        "--timeout",
-        f"{duration}",
-        "--metrics-brief",
-    ]
-    job = io.read_yaml(filepath)
+    job = manifest(
+        filepath,
+        namespace,
+        duration,
+        cores,
+        ram,
+        storage,
+        kueue,
+        priority,
+        run_id=run_id or prefix,
+    )
+    report = asyncio.run(apply(job, prefix, jobs, concurrency))
+    logger.info(
+        "Submission throughput: %.2f jobs/s (%s jobs in %.2fs)",
+        report.throughput,
+        report.submitted,
+        report.elapsed,
+    )
+    return report
 
-    # Write common job parameters
-    job["metadata"] = {}
-    job["metadata"]["labels"] = {}
-    job["metadata"]["namespace"] = namespace
-    if kueue:
-        job["metadata"]["labels"]["kueue.x-k8s.io/queue-name"] = kueue
-        job["spec"]["suspend"] = True
-    if priority:
-        job["metadata"]["labels"]["kueue.x-k8s.io/priority-class"] = priority
-    for container in job["spec"]["template"]["spec"]["containers"]:
-        container["args"] = args
-        container["resources"] = {}
-        container["resources"]["limits"] = {}
-        container["resources"]["limits"]["cpu"] = f"{cores}"
-        container["resources"]["limits"]["memory"] = f"{ram_mb}Mi"
-        container["resources"]["limits"]["ephemeral-storage"] = f"{storage}Gi"
-        container["resources"]["requests"] = {}
-        container["resources"]["requests"]["cpu"] = f"{cores}"
-        container["resources"]["requests"]["memory"] = f"{ram_mb}Mi"
-        container["resources"]["requests"]["ephemeral-storage"] = f"{storage}Gi"
 
-    tasks: List[Awaitable[bool]] = []
-    tasks.append(apply(job, prefix, jobs))
-    loop = asyncio.get_event_loop()
-    asyncio.set_event_loop(loop)
-    loop.run_until_complete(asyncio.gather(*tasks))
+def _whole(value: float) -> Any:
+    """A whole number as an int, so quantities render as `2` rather than `2.0`."""
+    return int(value) if float(value).is_integer() else value
+
+
+def scheduled_bodies(
+    jobs: Iterable[trace.Arrival],
+    filepath: str,
+    namespace: str,
+    prefix: str,
+    kueue: Optional[str] = None,
+    priority: Optional[str] = None,
+    speed: float = 1.0,
+    run_id: Optional[str] = None,
+) -> Iterator[Tuple[float, str, str, bytes]]:
+    """Scheduled job bodies of a trace, for `submit.schedule`.
+
+    Args:
+        jobs (Iterable[trace.Arrival]): Jobs of the trace, earliest first.
+        filepath (str): K8s job template.
+        namespace (str): Namespace of jobs without a `namespace/name` queue.
+        prefix (str): Prefix for the job names.
+        kueue (Optional[str]): LocalQueue of jobs without one.
+        priority (Optional[str]): WorkloadPriorityClass of jobs without one.
+        speed (float): Factor the submit times are divided by.
+        run_id (Optional[str]): Run-id label for the jobs and their pods.
+
+    Yields:
+        Tuple[float, str, str, bytes]: Seconds from the start, namespace, name
+        and JSON body of every job.
+    """
+    templates: Dict[Tuple, template.Template] = {}
+    for num, job in enumerate(jobs):
+        space, queue = namespace, kueue
+        if job.queue:
+            space, _, queue = job.queue.rpartition("/")
+            space = space or namespace
+        shape: Dict[str, Any] = {
+            "namespace": space,
+            "duration": max(round(job.duration), 1),
+            "cores": _whole(job.cores),
+            "ram": _whole(job.ram),
+            "storage": _whole(job.storage),
+            "kueue": queue,
+            "priority": job.priority or priority,
+        }
+        key: Tuple = tuple(shape.values())
+        if key not in templates:
+            templates[key] = template.Template(
+                manifest(filepath, **shape, run_id=run_id)
+            )
+        name: str = f"{prefix}-{num}"
+        yield job.submit / speed, space, name, templates[key].render(name)
+
+
+@app.command("replay")
+def replay(
+    source: str = typer.Argument(
+        ..., help="CSV trace, or recorded Workload events (.jsonl), see trace.py."
+    ),
+    filepath: str = (
+        typer.Option(
+            DEFAULT_JOBSPEC_FILEPATH, "-f", "--filepath", help="K8s job template."
+        )
+    ),
+    namespace: str = (
+        typer.Option(
+            "default",
+            "-n",
+            "--namespace",
+            help="Namespace of jobs without a namespace/name queue.",
+        )
+    ),
+    prefix: str = typer.Option(
+        "kueuer-job", "-p", "--prefix", help="Prefix for job names."
+    ),
+    kueue: Optional[str] = (
+        typer.Option(None, "-k", "--kueue", help="Kueue queue of jobs without one.")
+    ),
+    priority: Optional[str] = (
+        typer.Option(None, "--priority", help="Kueue priority of jobs without one.")
+    ),
+    speed: float = (
+        typer.Option(
+            1.0,
+            "-x",
+            "--speed",
+            help="Factor the trace is compressed by, e.g. 60 replays an hour in "
+            "a minute. Job durations are kept.",
+        )
+    ),
+    concurrency: int = (
+        typer.Option(
+            submit.DEFAULT_CONCURRENCY,
+            "--concurrency",
+            help="Maximum number of job creation requests in flight.",
+        )
+    ),
+    run_id: Optional[str] = (
+        typer.Option(
+            None, "--run-id", help="Run-id label for the jobs, defaults to the prefix."
+        )
+    ),
+) -> submit.Report:
+    """Submit the jobs of a trace, each at its time in the trace."""
+    if speed <= 0:
+        raise typer.BadParameter("Must be positive", param_hint="speed")
+    jobs: List[trace.Arrival] = trace.load(source)
+    logger.info(
+        "Replaying %s jobs over %.0fs",
+        len(jobs),
+        jobs[-1].submit / speed if jobs else 0,
+    )
+    scheduled = scheduled_bodies(
+        jobs, filepath, namespace, prefix, kueue, priority, speed, run_id or prefix
+    )
+    return asyncio.run(submit.schedule(scheduled, concurrency))
+
+
+@app.command("render")
+def render(
+    filepath: str = (
+        typer.Option(
+            DEFAULT_JOBSPEC_FILEPATH, "-f", "--filepath", help="K8s job template."
+        )
+    ),
+    namespace: str = (
+        typer.Option(
+            "default", "-n", "--namespace", help="Namespace to launch jobs in."
+        )
+    ),
+    prefix: str = typer.Option(
+        "kueuer-job", "-p", "--prefix", help="Prefix for job names."
+    ),
+    count: int = (
+        typer.Option(
+            1, "-j", "--jobs", "--count", help="Number of job bodies to render."
+        )
+    ),
+    duration: int = (
+        typer.Option(60, "-d", "--duration", help="Duration for each job in seconds.")
+    ),
+    cores: int = (
+        typer.Option(
+            1, "-c", "--cores", help="Number of CPU cores to allocate to each job."
+        )
+    ),
+    ram: int = (
+        typer.Option(
+            1, "-r", "--ram", help="Amount of RAM to allocate to each job in GB."
+        )
+    ),
+    storage: int = (
+        typer.Option(
+            1,
+            "-s",
+            "--storage",
+            help="Amount of ephemeral-storage to allocate to each job in GB.",
+        )
+    ),
+    kueue: Optional[str] = (
+        typer.Option(None, "-k", "--kueue", help="Kueue queue to launch jobs in.")
+    ),
+    priority: Optional[str] = (
+        typer.Option(
+            None, "-p", "--priority", help="Kueue priority to launch jobs with."
+        )
+    ),
+    output: str = (
+        typer.Option(
+            "-", "-o", "--output", help="File to write JSON lines to, - for stdout."
+        )
+    ),
+) -> float:
+    """Render job bodies without a cluster to measure generation throughput.
+
+    Returns:
+        float: Rendered bodies per second.
+    """
+    now = perf_counter()
+    job = manifest(filepath, namespace, duration, cores, ram, storage, kueue, priority)
+    compiled = template.Template(job)
+    fopen: BinaryIO = sys.stdout.buffer if output == "-" else open(output, "wb")
+    try:
+        for _name, body in compiled.bodies(prefix, count):
+            fopen.write(body)
+            fopen.write(b"\n")
+    finally:
+        if fopen is not sys.stdout.buffer:
+            fopen.close()
+    elapsed: float = perf_counter() - now
+    rate: float = count / elapsed if elapsed > 0 else 0.0
+    # Stdout may carry the bodies, so the summary always goes to stderr.
+    typer.echo(f"Rendered {count} jobs in {elapsed:.3f}s ({rate:.0f} jobs/s)", err=True)
+    return rate
 
 
 @app.command("delete")
@@ -257,44 +593,160 @@ def delete_jobs(
     prefix: str = typer.Option(
         "kueuer-job", "-p", "--prefix", help="Prefix for job names."
     ),
+    run_id: Optional[str] = (
+        typer.Option(
+            None, "--run-id", help="Delete every job carrying this run-id label."
+        )
+    ),
+    concurrency: int = (
+        typer.Option(
+            submit.DEFAULT_CONCURRENCY,
+            "--concurrency",
+            help="Maximum number of delete requests in flight, if collection "
+            "deletion is not permitted.",
+        )
+    ),
+    wait: bool = (
+        typer.Option(
+            False, "--drain", help="Wait until the pods of deleted jobs are gone."
+        )
+    ),
 ) -> int:
-    """Delete jobs with given prefix in a namespace.
+    """Delete jobs with given prefix or run-id in a namespace.
+
+    With a run-id, all jobs are removed with a single deletecollection call.
+    If that is not permitted, or only a prefix is given, the jobs are deleted
+    individually with bounded concurrency.
 
     Args:
         namespace (str): Namespace to delete jobs in.
-        prefix (str): Prefix for job names.
+        prefix (str): Prefix for job names, used when run_id is not given.
+        run_id (Optional[str]): Value of the run-id label.
+        concurrency (int): Maximum number of delete requests in flight.
+        wait (bool): Wait until the pods of the deleted jobs are gone.
 
     Returns:
         int: Number of jobs deleted
     """
-    config.load_kube_config()
-    batch_v1 = client.BatchV1Api()
-    logger.info("Deleting jobs with prefix %s in namespace %s", prefix, namespace)
+    batch_v1 = kube.batch()
+    options = client.V1DeleteOptions(propagation_policy="Background")
+    selector: Optional[str] = f"{RUN_ID_LABEL}={run_id}" if run_id else None
+    now = time()
+    deleted: int = 0
     try:
-        jobs = batch_v1.list_namespaced_job(namespace)
-        jobs_to_delete: List[str] = [
-            job.metadata.name
-            for job in jobs.items
-            if job.metadata.name.startswith(prefix)
-        ]
-
-        if not jobs_to_delete:
-            logger.info("No jobs with found")
-            return 0
-        num = len(jobs_to_delete)
-        logger.info("Found %s jobs to delete", num)
-        now = time()
-        for job_name in jobs_to_delete:
-            batch_v1.delete_namespaced_job(
-                name=job_name,
-                namespace=namespace,
-                body=client.V1DeleteOptions(propagation_policy="Foreground"),
+        if selector:
+            logger.info("Deleting jobs with %s in namespace %s", selector, namespace)
+            try:
+                response = batch_v1.delete_collection_namespaced_job(
+                    namespace,
+                    label_selector=selector,
+                    body=options,
+                    _preload_content=False,
+                )
+                deleted = len(json.loads(response.data).get("items") or [])
+            except ApiException as error:
+                if error.status not in (403, 405):
+                    raise
+                logger.warning("Collection deletion not permitted, deleting jobs")
+                deleted = _delete_each(
+                    batch_v1, namespace, options, concurrency, selector=selector
+                )
+        else:
+            logger.info(
+                "Deleting jobs with prefix %s in namespace %s", prefix, namespace
+            )
+            deleted = _delete_each(
+                batch_v1, namespace, options, concurrency, prefix=prefix
             )
-        logger.info("Took %ss to delete %s jobs", time() - now, num)
-        return len(jobs_to_delete)
     except ApiException as e:
         logger.error("Exception when deleting jobs: %s", e)
+        return deleted
+    if not deleted:
+        logger.info("No jobs with found")
         return 0
+    logger.info("Took %ss to delete %s jobs", time() - now, deleted)
+    if wait:
+        drain(namespace, run_id=run_id, prefix=prefix)
+    return deleted
+
+
+def _delete_each(
+    batch_v1: client.BatchV1Api,
+    namespace: str,
+    options: client.V1DeleteOptions,
+    concurrency: int,
+    selector: Optional[str] = None,
+    prefix: Optional[str] = None,
+) -> int:
+    """Delete matching jobs one by one with bounded concurrency."""
+    names: List[str] = [
+        job.metadata.name
+        for job in kube.paginate(
+            batch_v1.list_namespaced_job, namespace, label_selector=selector
+        )
+        if prefix is None or job.metadata.name.startswith(prefix)
+    ]
+    logger.info("Found %s jobs to delete", len(names))
+
+    def delete(name: str) -> bool:
+        try:
+            batch_v1.delete_namespaced_job(name=name, namespace=namespace, body=options)
+            return True
+        except ApiException as error:
+            # Already gone, e.g. removed by ttlSecondsAfterFinished.
+            if error.status == 404:
+                return False
+            raise
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        return sum(executor.map(delete, names))
+
+
+def drain(
+    namespace: str,
+    run_id: Optional[str] = None,
+    prefix: Optional[str] = None,
+    timeout: float = 900.0,
+    interval: float = 1.0,
+) -> Optional[float]:
+    """Wait until no pods of a run remain in the namespace.
+
+    Args:
+        namespace (str): Namespace of the pods.
+        run_id (Optional[str]): Value of the run-id label on the pods.
+        prefix (Optional[str]): Job name prefix, used when run_id is not given.
+        timeout (float): Seconds to wait before giving up. Defaults to 900.
+        interval (float): Seconds between checks. Defaults to 1.
+
+    Returns:
+        Optional[float]: Seconds until the namespace was drained, None on timeout.
+    """
+    v1 = kube.core()
+    now = time()
+    while time() - now < timeout:
+        if run_id:
+            # A single item is enough to know the run is not drained yet.
+            pods = v1.list_namespaced_pod(
+                namespace, label_selector=f"{RUN_ID_LABEL}={run_id}", limit=1
+            )
+            remaining = len(pods.items)
+        else:
+            remaining = sum(
+                1
+                for pod in kube.paginate(
+                    v1.list_namespaced_pod, namespace, label_selector="job-name"
+                )
+                if (pod.metadata.labels or {})
+                .get("job-name", "")
+                .startswith(prefix or "")
+            )
+        if not remaining:
+            elapsed: float = time() - now
+            logger.info("Namespace %s drained in %.2fs", namespace, elapsed)
+            return elapsed
+        sleep(interval)
+    logger.warning("Namespace %s not drained after %ss", namespace, timeout)
+    return None
 
 
 if __name__ == "__main__":
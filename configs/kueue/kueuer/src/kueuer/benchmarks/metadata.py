@@ -0,0 +1,128 @@
+"""Snapshot of the cluster configuration a benchmark ran against."""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+import yaml
+from kubernetes.client.rest import ApiException
+
+from kueuer import resources
+from kueuer.utils import io, kube
+from kueuer.utils.logging import logger
+
+# Where the Kueue Helm chart keeps the controller configuration.
+KUEUE_NAMESPACE: str = "kueue-system"
+KUEUE_CONFIGMAP: str = "kueue-manager-config"
+KUEUE_CONFIG_KEY: str = "controller_manager_config.yaml"
+
+
+def _nodes() -> Dict[str, Any]:
+    """Node count and allocatable totals."""
+    # One page is enough to count the nodes.
+    page = kube.core().list_node(limit=1)
+    count: int = len(page.items) + int(page.metadata.remaining_item_count or 0)
+    allocatable = resources.total(field="allocatable")
+    return {
+        "count": count,
+        "allocatable": {name: item["value"] for name, item in allocatable.items()},
+    }
+
+
+def _clusterqueue(name: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Quotas and queueing configuration of a ClusterQueue."""
+    if not name:
+        return None
+    try:
+        queue = kube.custom().get_cluster_custom_object(  # type: ignore
+            group="kueue.x-k8s.io",
+            version="v1beta1",
+            plural="clusterqueues",
+            name=name,
+        )
+    except ApiException as error:
+        logger.debug("ClusterQueue %s not read: %s", name, error)
+        return None
+    spec: Dict[str, Any] = queue.get("spec") or {}
+    quotas: Dict[str, Dict[str, Any]] = {}
+    for group in spec.get("resourceGroups") or []:
+        for flavor in group.get("flavors") or []:
+            for resource in flavor.get("resources") or []:
+                quotas[f"{flavor['name']}/{resource['name']}"] = {
+                    key: resource[key]
+                    for key in ("nominalQuota", "borrowingLimit", "lendingLimit")
+                    if key in resource
+                }
+    return {
+        "name": name,
+        "queueingStrategy": spec.get("queueingStrategy"),
+        "cohort": spec.get("cohort"),
+        "preemption": spec.get("preemption"),
+        "quotas": quotas,
+    }
+
+
+def _controller(filepath: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Reconcile concurrency and API client limits of the Kueue controller.
+
+    Read from the controller ConfigMap, or from `filepath` when given, e.g.
+    `configs/kueue/prod/controller.yaml`.
+    """
+    config: Optional[Dict[str, Any]] = None
+    if filepath:
+        config = io.read_yaml(filepath)
+    else:
+        try:
+            configmap = kube.core().read_namespaced_config_map(
+                KUEUE_CONFIGMAP, KUEUE_NAMESPACE
+            )
+            config = yaml.safe_load((configmap.data or {}).get(KUEUE_CONFIG_KEY, ""))
+        except ApiException as error:
+            logger.debug("Kueue configuration not read: %s", error)
+    if not config:
+        return None
+    connection: Dict[str, Any] = config.get("clientConnection") or {}
+    return {
+        "groupKindConcurrency": (config.get("controller") or {}).get(
+            "groupKindConcurrency"
+        ),
+        "qps": connection.get("qps"),
+        "burst": connection.get("burst"),
+    }
+
+
+def capture(
+    clusterqueue: Optional[str] = None, controller: Optional[str] = None
+) -> Dict[str, Any]:
+    """Capture the cluster configuration relevant to benchmark results.
+
+    Args:
+        clusterqueue (Optional[str]): ClusterQueue the benchmark submits to.
+        controller (Optional[str]): Kueue controller configuration file, read
+            from the cluster if None.
+
+    Returns:
+        Dict[str, Any]: Nodes, ClusterQueue and Kueue controller configuration,
+            None for what could not be read.
+    """
+    return {
+        "nodes": _nodes(),
+        "clusterqueue": _clusterqueue(clusterqueue),
+        "controller": _controller(controller),
+    }
+
+
+def describe(snapshot: Dict[str, Any]) -> str:
+    """Short description of a snapshot, e.g. `4 nodes, BestEffortFIFO`."""
+    nodes: Dict[str, Any] = snapshot.get("nodes") or {}
+    queue: Dict[str, Any] = snapshot.get("clusterqueue") or {}
+    parts: List[str] = [f"{nodes.get('count', '?')} nodes"]
+    if queue:
+        parts.append(f"{queue.get('name')} {queue.get('queueingStrategy')}")
+    return ", ".join(parts)
+
+
+def digest(snapshot: Dict[str, Any]) -> str:
+    """Content hash of a snapshot, equal for equal configurations."""
+    content: str = json.dumps(snapshot, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,230 @@
+"""Job mixes: jobs of different shapes and durations in one experiment.
+
+With every job alike, Kueue's bin-packing and the head-of-line blocking of
+its FIFO queues never show. A mix is a YAML file of shape classes drawn by
+weight, and of job durations drawn from a distribution, e.g.:
+
+    seed: 0
+    duration: {distribution: lognormal, seconds: 60, sigma: 1.0, maximum: 3600}
+    shapes:
+      small: {cores: 1, ram: 2, weight: 8}
+      large:
+        cores: 8
+        ram: 32
+        storage: 10
+        weight: 2
+        duration: {distribution: pareto, seconds: 300, alpha: 1.5}
+
+Durations are `fixed` at `seconds`, `lognormal` with a median of `seconds`,
+or `pareto` with a minimum of `seconds`, optionally capped at `maximum`. A
+shape's own `duration` replaces the one of the mix. The same seed draws the
+same jobs, so experiments of a sweep and reruns share their first jobs.
+"""
+
+import math
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from kueuer.benchmarks import arrivals, phases, submit
+from kueuer.utils import io
+
+DISTRIBUTIONS = ("fixed", "lognormal", "pareto")
+
+
+@dataclass(frozen=True)
+class Duration:
+    """Distribution of job durations.
+
+    Attributes:
+        distribution (str): `fixed`, `lognormal` or `pareto`.
+        seconds (float): Fixed duration, lognormal median or Pareto minimum.
+        sigma (float): Standard deviation of the log of lognormal durations.
+        alpha (float): Shape of Pareto durations, heavier tailed when lower.
+        maximum (Optional[float]): Longest duration, None for no cap.
+    """
+
+    distribution: str = "fixed"
+    seconds: float = 60.0
+    sigma: float = 1.0
+    alpha: float = 1.5
+    maximum: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown duration distribution {self.distribution}, use one of "
+                f"{list(DISTRIBUTIONS)}"
+            )
+        if self.seconds <= 0 or self.sigma < 0 or self.alpha <= 0:
+            raise ValueError(f"Invalid duration distribution {self}")
+
+    def sample(self, rng: random.Random) -> int:
+        """Draw a duration, in whole seconds and at least one."""
+        value: float = self.seconds
+        if self.distribution == "lognormal":
+            value = rng.lognormvariate(math.log(self.seconds), self.sigma)
+        elif self.distribution == "pareto":
+            value = self.seconds * rng.paretovariate(self.alpha)
+        if self.maximum is not None:
+            value = min(value, self.maximum)
+        return max(round(value), 1)
+
+
+@dataclass(frozen=True)
+class Shape:
+    """A class of jobs of a mix.
+
+    Attributes:
+        name (str): Name of the class, e.g. `large`.
+        cores (float): CPU cores per job.
+        ram (float): RAM per job in GB.
+        storage (float): Ephemeral storage per job in GB.
+        weight (float): Relative frequency of the class.
+        duration (Optional[Duration]): Durations of its jobs, those of the
+            mix if None.
+    """
+
+    name: str
+    cores: float = 1
+    ram: float = 1
+    storage: float = 1
+    weight: float = 1
+    duration: Optional[Duration] = None
+
+
+@dataclass(frozen=True)
+class Draw:
+    """Shape class and duration drawn for one job."""
+
+    shape: str
+    cores: float
+    ram: float
+    storage: float
+    duration: int
+
+
+@dataclass
+class Mix:
+    """Shape classes and durations of the jobs of an experiment.
+
+    Attributes:
+        name (str): Name of the mix, recorded with the results.
+        shapes (List[Shape]): Shape classes, drawn by weight.
+        duration (Duration): Durations of shapes without their own.
+        seed (int): Seed of the draws.
+    """
+
+    name: str
+    shapes: List[Shape]
+    duration: Duration = field(default_factory=Duration)
+    seed: int = 0
+
+    def sample(self, count: int) -> List[Draw]:
+        """Draw the shape and duration of `count` jobs."""
+        rng = random.Random(self.seed)
+        weights: List[float] = [shape.weight for shape in self.shapes]
+        draws: List[Draw] = []
+        for shape in rng.choices(self.shapes, weights=weights, k=count):
+            duration: Duration = shape.duration or self.duration
+            draws.append(
+                Draw(
+                    shape=shape.name,
+                    cores=shape.cores,
+                    ram=shape.ram,
+                    storage=shape.storage,
+                    duration=duration.sample(rng),
+                )
+            )
+        return draws
+
+    def label(self) -> str:
+        shares: str = ", ".join(
+            f"{shape.name} {shape.cores}c/{shape.ram}G x{shape.weight}"
+            for shape in self.shapes
+        )
+        return f"{self.name} ({shares}), seed {self.seed}"
+
+
+def parse(data: Dict[str, Any], name: str = "mix") -> Mix:
+    """Read a mix from the content of a mix file.
+
+    Raises:
+        ValueError: If a shape or a distribution is invalid.
+    """
+    specs: Dict[str, Any] = data.get("shapes") or {}
+    if not specs:
+        raise ValueError("Mix has no shapes")
+    shapes: List[Shape] = []
+    try:
+        for shape, spec in specs.items():
+            spec = dict(spec or {})
+            if "duration" in spec:
+                spec["duration"] = Duration(**spec["duration"])
+            shapes.append(Shape(name=str(shape), **spec))
+            if shapes[-1].weight <= 0:
+                raise ValueError(f"Shape {shape} needs a positive weight")
+        duration = Duration(**(data.get("duration") or {}))
+    except TypeError as error:
+        raise ValueError(f"Invalid mix {name}: {error}") from error
+    return Mix(
+        name=name,
+        shapes=shapes,
+        duration=duration,
+        seed=int(data.get("seed") or 0),
+    )
+
+
+def load(filepath: str) -> Mix:
+    """Read a mix file, see `parse`, named after the file."""
+    name: str = os.path.splitext(os.path.basename(filepath))[0]
+    return parse(io.read_yaml(filepath) or {}, name)
+
+
+def breakdown(
+    draws: Dict[str, Draw],
+    timelines: Dict[str, phases.Timeline],
+    times: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Admission latency and job duration by shape class.
+
+    Args:
+        draws (Dict[str, Draw]): Draw of every job, by name.
+        timelines (Dict[str, phases.Timeline]): Timelines from `phases.collect`.
+        times (Dict[str, Any]): Creation, completion and duration of every
+            completed job, by name, as tracked.
+
+    Returns:
+        List[Dict[str, Any]]: One row per shape class, by name.
+    """
+    classes: Dict[str, List[str]] = {}
+    for name, draw in draws.items():
+        classes.setdefault(draw.shape, []).append(name)
+    rows: List[Dict[str, Any]] = []
+    for shape, names in sorted(classes.items()):
+        latencies: List[float] = sorted(
+            value
+            for name in names
+            if name in timelines
+            and (value := arrivals.latency(timelines[name])) is not None
+        )
+        durations: List[float] = sorted(
+            times[name][2] for name in names if name in times
+        )
+        rows.append(
+            {
+                "shape": shape,
+                "jobs": len(names),
+                "completed": len(durations),
+                "cores": draws[names[0]].cores,
+                "ram": draws[names[0]].ram,
+                "storage": draws[names[0]].storage,
+                "latency_p50": submit.percentile(latencies, 0.50),
+                "latency_p99": submit.percentile(latencies, 0.99),
+                "latency_max": latencies[-1] if latencies else None,
+                "duration_p50": submit.percentile(durations, 0.50),
+                "duration_p99": submit.percentile(durations, 0.99),
+            }
+        )
+    return rows
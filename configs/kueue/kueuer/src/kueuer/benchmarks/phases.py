@@ -0,0 +1,222 @@
+"""Break down job latency into the phases between creation and completion."""
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from kubernetes.client.rest import ApiException
+
+from kueuer.benchmarks import RUN_ID_LABEL
+from kueuer.benchmarks.submit import percentile
+from kueuer.benchmarks.track import timestamp
+from kueuer.utils import kube
+from kueuer.utils.logging import logger
+
+# Phase name, timestamp it starts at and timestamp it ends at.
+PHASES: Tuple[Tuple[str, str, str], ...] = (
+    ("workload", "created", "workload_created"),
+    ("queued", "workload_created", "quota_reserved"),
+    ("admission", "quota_reserved", "admitted"),
+    ("unsuspend", "admitted", "started"),
+    ("scheduling", "started", "scheduled"),
+    ("startup", "scheduled", "running"),
+    ("running", "running", "finished"),
+    ("completion", "finished", "completed"),
+    ("total", "created", "completed"),
+)
+QUANTILES: Tuple[float, ...] = (0.50, 0.90, 0.99)
+JOB_UID_LABEL: str = "kueue.x-k8s.io/job-uid"
+# Job UIDs per workload list call, keeps the selector well under URL limits.
+UID_BATCH: int = 100
+
+
+@dataclass
+class Timeline:
+    """Server-side timestamps of a job, its Kueue workload and its pod.
+
+    Attributes:
+        name (str): Name of the job.
+        created (Optional[datetime]): Job creation.
+        workload_created (Optional[datetime]): Kueue workload creation.
+        quota_reserved (Optional[datetime]): Workload QuotaReserved condition.
+        admitted (Optional[datetime]): Workload Admitted condition.
+        started (Optional[datetime]): Job start time, set when it is unsuspended.
+        scheduled (Optional[datetime]): Pod PodScheduled condition.
+        running (Optional[datetime]): First container start.
+        finished (Optional[datetime]): Last container termination.
+        completed (Optional[datetime]): Job completion time.
+    """
+
+    name: str
+    created: Optional[datetime] = None
+    workload_created: Optional[datetime] = None
+    quota_reserved: Optional[datetime] = None
+    admitted: Optional[datetime] = None
+    started: Optional[datetime] = None
+    scheduled: Optional[datetime] = None
+    running: Optional[datetime] = None
+    finished: Optional[datetime] = None
+    completed: Optional[datetime] = None
+
+    def phases(self) -> Dict[str, Optional[float]]:
+        """Seconds spent in each phase, None when a timestamp is missing.
+
+        Jobs submitted without Kueue have no workload, so only their
+        scheduling and later phases are known.
+        """
+        durations: Dict[str, Optional[float]] = {}
+        for name, begin, end in PHASES:
+            start: Optional[datetime] = getattr(self, begin)
+            stop: Optional[datetime] = getattr(self, end)
+            durations[name] = (stop - start).total_seconds() if start and stop else None
+        return durations
+
+    def record(self) -> Dict[str, Any]:
+        """Flatten the timeline into one row of timestamps and phase durations."""
+        row: Dict[str, Any] = {"job": self.name}
+        for item in fields(self)[1:]:
+            row[item.name] = getattr(self, item.name)
+        for name, value in self.phases().items():
+            row[f"phase_{name}"] = value
+        return row
+
+
+def _condition(data: Dict[str, Any], kind: str) -> Optional[datetime]:
+    """Last transition time of a True condition of a raw object."""
+    for item in (data.get("status") or {}).get("conditions") or []:
+        if item.get("type") == kind and item.get("status") == "True":
+            return timestamp(item.get("lastTransitionTime"))
+    return None
+
+
+def _owner(data: Dict[str, Any]) -> Optional[str]:
+    """UID of the Job owning a raw object."""
+    for reference in data["metadata"].get("ownerReferences") or []:
+        if reference.get("kind") == "Job":
+            return reference.get("uid")
+    return None
+
+
+def _containers(pod: Dict[str, Any]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """First container start and last container termination of a raw pod."""
+    starts: List[datetime] = []
+    ends: List[datetime] = []
+    for container in (pod.get("status") or {}).get("containerStatuses") or []:
+        state: Dict[str, Any] = container.get("state") or {}
+        current: Dict[str, Any] = state.get("terminated") or state.get("running") or {}
+        started: Optional[datetime] = timestamp(current.get("startedAt"))
+        if started:
+            starts.append(started)
+        ended: Optional[datetime] = timestamp(current.get("finishedAt"))
+        if ended:
+            ends.append(ended)
+    return (min(starts) if starts else None, max(ends) if ends else None)
+
+
+def collect(namespace: str, run_id: str) -> Dict[str, Timeline]:
+    """Correlate the jobs of a run with their Kueue workloads and pods.
+
+    Workloads and pods are matched to their job through owner references and
+    read as raw JSON. Jobs and pods are listed by their run-id label; Kueue
+    does not copy job labels to workloads, so those are selected by the
+    `kueue.x-k8s.io/job-uid` label in batches of the collected job UIDs.
+
+    Args:
+        namespace (str): Namespace of the jobs.
+        run_id (str): Value of the run-id label on the jobs and pods.
+
+    Returns:
+        Dict[str, Timeline]: Timeline of every job by name.
+    """
+    selector: str = f"{RUN_ID_LABEL}={run_id}"
+    timelines: Dict[str, Timeline] = {}
+    uids: Dict[str, Timeline] = {}
+    for job in kube.paginate(
+        kube.batch().list_namespaced_job,
+        namespace,
+        label_selector=selector,
+        _preload_content=False,
+    ):
+        metadata: Dict[str, Any] = job["metadata"]
+        status: Dict[str, Any] = job.get("status") or {}
+        timeline = Timeline(
+            name=metadata["name"],
+            created=timestamp(metadata.get("creationTimestamp")),
+            started=timestamp(status.get("startTime")),
+            completed=timestamp(status.get("completionTime"))
+            or _condition(job, "Complete"),
+        )
+        timelines[timeline.name] = timeline
+        uids[metadata["uid"]] = timeline
+
+    workloads: List[Dict[str, Any]] = []
+    keys: List[str] = list(uids)
+    try:
+        for start in range(0, len(keys), UID_BATCH):
+            batch: str = ",".join(keys[start : start + UID_BATCH])
+            workloads.extend(
+                kube.paginate(
+                    kube.custom().list_namespaced_custom_object,
+                    group="kueue.x-k8s.io",
+                    version="v1beta1",
+                    namespace=namespace,
+                    plural="workloads",
+                    label_selector=f"{JOB_UID_LABEL} in ({batch})",
+                )
+            )
+    except ApiException as error:
+        # Clusters without Kueue have no workloads to correlate.
+        logger.debug("Workloads not listed: %s", error)
+        workloads = []
+    for workload in workloads:
+        owner: Optional[Timeline] = uids.get(_owner(workload) or "")
+        if owner is None:
+            continue
+        owner.workload_created = timestamp(
+            workload["metadata"].get("creationTimestamp")
+        )
+        owner.quota_reserved = _condition(workload, "QuotaReserved")
+        owner.admitted = _condition(workload, "Admitted")
+
+    for pod in kube.paginate(
+        kube.core().list_namespaced_pod,
+        namespace,
+        label_selector=selector,
+        _preload_content=False,
+    ):
+        owner = uids.get(_owner(pod) or "")
+        if owner is None:
+            continue
+        running, finished = _containers(pod)
+        # Retried jobs have several pods, the last one to finish is kept.
+        if owner.finished and (finished is None or finished < owner.finished):
+            continue
+        owner.scheduled = _condition(pod, "PodScheduled")
+        owner.running = running
+        owner.finished = finished
+    return timelines
+
+
+def summary(timelines: Dict[str, Timeline]) -> Dict[str, Optional[float]]:
+    """Percentiles of every phase across the jobs of a run.
+
+    Args:
+        timelines (Dict[str, Timeline]): Timelines from `collect`.
+
+    Returns:
+        Dict[str, Optional[float]]: `phase_{name}_p{50,90,99}` columns, None for
+            phases no job went through.
+    """
+    durations: Dict[str, List[float]] = {name: [] for name, _begin, _end in PHASES}
+    for timeline in timelines.values():
+        for name, value in timeline.phases().items():
+            if value is not None:
+                durations[name].append(value)
+    result: Dict[str, Optional[float]] = {}
+    for name, values in durations.items():
+        values.sort()
+        for quantile in QUANTILES:
+            result[f"phase_{name}_p{int(quantile * 100)}"] = percentile(
+                values, quantile
+            )
+    return result
@@ -1,4 +1,5 @@
-from typing import Dict, Tuple
+import os
+from typing import Dict, Optional, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -6,24 +7,41 @@ import pandas as pd
 import seaborn as sns
 import typer
 
-from kueuer.utils import io
+from kueuer.utils import io, store
 
 sns.set(style="whitegrid")
 
 app = typer.Typer(help="Plot Kueue Benchmark Results")
 
 
-# Load CSV into DataFrame
-def load_results(filepath: str) -> pd.DataFrame:
+DATES: Tuple[str, ...] = (
+    "timestamp",
+    "first_creation_time",
+    "last_creation_time",
+    "first_completion_time",
+    "last_completion_time",
+)
+
+
+# Load results from a store or CSV into DataFrame
+def load_results(filepath: str, since: Optional[str] = None) -> pd.DataFrame:
+    if store.supports(filepath):
+        df = pd.DataFrame.from_records(store.select(filepath, since=since))
+        for column in DATES:
+            if column in df:
+                df[column] = pd.to_datetime(df[column])
+        return df
+    df = pd.read_csv(filepath, parse_dates=list(DATES))
+    if since is not None:
+        df = df[df["timestamp"] >= pd.to_datetime(since)]
+    return df
+
+
+# Load per-job timings into DataFrame
+def load_jobs(filepath: str) -> pd.DataFrame:
     df = pd.read_csv(
         filepath,
-        parse_dates=[
-            "timestamp",
-            "first_creation_time",
-            "last_creation_time",
-            "first_completion_time",
-            "last_completion_time",
-        ],
+        parse_dates=["created", "completed"],
     )
     return df
 
@@ -172,15 +190,111 @@ def compute_scheduling_overhead(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+# Plot the CDF of job latencies per job count, with and without Kueue
+def plot_latency_cdf(jobs: pd.DataFrame) -> None:
+    fig, axes = plt.subplots(1, 2, figsize=(14, 6), sharex=True, sharey=True)
+    for ax, use_kueue in zip(axes, [False, True], strict=True):
+        sns.ecdfplot(
+            data=jobs[jobs["use_kueue"] == use_kueue].dropna(subset=["duration"]),
+            x="duration",
+            hue="job_count",
+            palette="viridis",
+            ax=ax,
+        )
+        ax.set_xlabel("Time from Creation to Completion (s)")
+        ax.set_ylabel("Fraction of Jobs")
+        ax.set_title("With Kueue" if use_kueue else "Direct Kubernetes")
+    fig.suptitle("CDF of Job Latency")
+    plt.tight_layout()
+    plt.show()
+
+
+# Compute latency percentiles of every run
+def compute_percentiles(jobs: pd.DataFrame) -> pd.DataFrame:
+    grouped = jobs.groupby(["run_id", "use_kueue", "job_count"])["duration"]
+    percentiles = grouped.quantile([0.5, 0.9, 0.99]).unstack()
+    percentiles.columns = ["p50", "p90", "p99"]
+    percentiles["max"] = grouped.max()
+    return percentiles.reset_index()
+
+
+# Plot latency percentiles against the job count
+def plot_latency_percentiles(percentiles: pd.DataFrame) -> None:
+    data = percentiles.melt(
+        id_vars=["run_id", "use_kueue", "job_count"],
+        value_vars=["p50", "p90", "p99", "max"],
+        var_name="percentile",
+        value_name="latency",
+    )
+    plt.figure(figsize=(10, 6))
+    sns.lineplot(
+        data=data,
+        x="job_count",
+        y="latency",
+        hue="percentile",
+        style="use_kueue",
+        marker="o",
+    )
+    plt.xscale("log", base=2)
+    plt.xlabel("Number of Jobs")
+    plt.ylabel("Latency (seconds)")
+    plt.title("Job Latency Percentiles")
+    plt.tight_layout()
+    plt.show()
+
+
+# Plot the tail of the latency distribution on log scale
+def plot_tail_latency(jobs: pd.DataFrame) -> None:
+    plt.figure(figsize=(10, 6))
+    sns.ecdfplot(
+        data=jobs.dropna(subset=["duration"]),
+        x="duration",
+        hue="use_kueue",
+        complementary=True,
+    )
+    plt.yscale("log")
+    plt.xlabel("Time from Creation to Completion (s)")
+    plt.ylabel("Fraction of Jobs Slower (Log scale)")
+    plt.title("Tail Latency of Jobs")
+    plt.tight_layout()
+    plt.show()
+
+
 @app.command("performance")
-def performance(filepath: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    df = load_results(filepath)
+def performance(
+    filepath: str,
+    jobsfile: Optional[str] = (
+        typer.Option(
+            None,
+            "-j",
+            "--jobs",
+            help="Per-job timings, defaults to the file saved next to FILEPATH.",
+        )
+    ),
+    since: Optional[str] = (
+        typer.Option(
+            None,
+            "-s",
+            "--since",
+            help="Only plot experiments started at or after this timestamp, "
+            "e.g. 20250301.",
+        )
+    ),
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    df = load_results(filepath, since=since)
     df = compute_throughput(df)
     df = compute_latency(df)
     df = compute_cv(df)
     df = compute_scheduling_overhead(df)
     comparative_df = compute_comparative_metrics(df)
     plot_metric_comparison(df, "throughput", "Jobs per Second", "Throughput Comparison")
+    if "submission_throughput" in df:
+        plot_metric_comparison(
+            df,
+            "submission_throughput",
+            "Jobs per Second",
+            "Submission Throughput Comparison",
+        )
     plot_metric_comparison(
         df, "startup_latency", "Latency (seconds)", "Startup Latency Comparison"
     )
@@ -193,6 +307,13 @@ def performance(filepath: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
     plot_scaling_efficiency(df)
     plot_scheduling_overhead(df)
 
+    jobsfile = jobsfile or io.sibling(filepath, ".jobs.csv.gz")
+    if os.path.isfile(jobsfile):
+        jobs = load_jobs(jobsfile)
+        plot_latency_cdf(jobs)
+        plot_latency_percentiles(compute_percentiles(jobs))
+        plot_tail_latency(jobs)
+
     return df, comparative_df
 
 
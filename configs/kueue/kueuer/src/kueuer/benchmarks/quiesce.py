@@ -0,0 +1,213 @@
+"""Wait for the cluster to return to its idle state between experiments."""
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from time import sleep, time
+from typing import Any, Dict, List, Optional, Tuple
+
+from kubernetes.client.rest import ApiException
+from kubernetes.utils import parse_quantity
+
+from kueuer.benchmarks import RUN_ID_LABEL
+from kueuer.utils import kube
+from kueuer.utils.logging import logger
+
+DEFAULT_TIMEOUT: float = 600.0
+DEFAULT_INTERVAL: float = 2.0
+# Share of the ClusterQueue nominal quota its other users, e.g. sessions
+# started during a run, may hold above the baseline once settled.
+DEFAULT_TOLERANCE: float = 0.05
+# Pods in these phases no longer hold resources on their node.
+TERMINAL: str = "status.phase!=Succeeded,status.phase!=Failed"
+
+
+@dataclass
+class Snapshot:
+    """Load left on the cluster, compared against the load before benchmarking.
+
+    The namespace and the ClusterQueue are shared, e.g. with user sessions,
+    so pods are only those of the benchmark, by run-id label, and the
+    ClusterQueue usage may exceed its baseline by a tolerance.
+
+    Attributes:
+        pods (bool): Benchmark pods in the namespace, carrying the run-id label.
+        workloads (int): Workloads reserving quota in the ClusterQueue.
+        usage (Dict[str, Decimal]): ClusterQueue flavor usage by resource.
+        quota (Dict[str, Decimal]): ClusterQueue nominal quota by resource.
+        requests (Dict[str, Decimal]): Resources requested by the benchmark
+            pods that still hold them on their node.
+    """
+
+    pods: bool = False
+    workloads: int = 0
+    usage: Dict[str, Decimal] = field(default_factory=dict)
+    quota: Dict[str, Decimal] = field(default_factory=dict)
+    requests: Dict[str, Decimal] = field(default_factory=dict)
+
+    def _allowed(self, baseline: "Snapshot", tolerance: float) -> Dict[str, Decimal]:
+        """Highest ClusterQueue usage of a settled cluster, by resource."""
+        share = Decimal(str(tolerance))
+        return {
+            name: baseline.usage.get(name, Decimal(0))
+            + share * self.quota.get(name, Decimal(0))
+            for name in self.usage
+        }
+
+    def settled(
+        self, baseline: "Snapshot", tolerance: float = DEFAULT_TOLERANCE
+    ) -> bool:
+        """True if nothing is above the baseline, give or take `tolerance`
+        of the ClusterQueue nominal quota."""
+        return (
+            self.pods <= baseline.pods
+            and _within(self.usage, self._allowed(baseline, tolerance))
+            and _within(self.requests, baseline.requests)
+        )
+
+    def excess(
+        self, baseline: "Snapshot", tolerance: float = DEFAULT_TOLERANCE
+    ) -> List[str]:
+        """Human readable list of what is still above the baseline."""
+        busy: List[str] = []
+        if self.pods > baseline.pods:
+            busy.append("benchmark pods")
+        for label, current, initial in (
+            ("queue", self.usage, self._allowed(baseline, tolerance)),
+            ("requested", self.requests, baseline.requests),
+        ):
+            for name, value in current.items():
+                if value > initial.get(name, Decimal(0)):
+                    busy.append(f"{label} {name} {value}")
+        if busy and self.workloads > baseline.workloads:
+            busy.append(f"{self.workloads} workloads")
+        return busy
+
+
+def _within(current: Dict[str, Decimal], limit: Dict[str, Decimal]) -> bool:
+    return all(value <= limit.get(name, Decimal(0)) for name, value in current.items())
+
+
+def _quantity(value: Any) -> Decimal:
+    return Decimal(str(parse_quantity(value or "0")))
+
+
+def _clusterqueue(
+    name: Optional[str],
+) -> Tuple[int, Dict[str, Decimal], Dict[str, Decimal]]:
+    """Workloads reserving quota, flavor usage and nominal quota of a
+    ClusterQueue."""
+    if not name:
+        return 0, {}, {}
+    try:
+        queue = kube.custom().get_cluster_custom_object(  # type: ignore
+            group="kueue.x-k8s.io",
+            version="v1beta1",
+            plural="clusterqueues",
+            name=name,
+        )
+    except ApiException as error:
+        logger.debug("ClusterQueue %s not read: %s", name, error)
+        return 0, {}, {}
+    quota: Dict[str, Decimal] = {}
+    for group in (queue.get("spec") or {}).get("resourceGroups") or []:
+        for flavor in group.get("flavors") or []:
+            for resource in flavor.get("resources") or []:
+                total = quota.get(resource["name"], Decimal(0))
+                quota[resource["name"]] = total + _quantity(
+                    resource.get("nominalQuota")
+                )
+    status: Dict[str, Any] = queue.get("status") or {}
+    usage: Dict[str, Decimal] = {}
+    for flavor in status.get("flavorsUsage") or []:
+        for resource in flavor.get("resources") or []:
+            total: Decimal = usage.get(resource["name"], Decimal(0))
+            usage[resource["name"]] = total + _quantity(resource.get("total"))
+    # Admitted workloads are a subset of the ones reserving quota.
+    workloads: int = max(
+        int(status.get("reservingWorkloads") or 0),
+        int(status.get("admittedWorkloads") or 0),
+    )
+    return workloads, usage, quota
+
+
+def _requests(namespace: str) -> Dict[str, Decimal]:
+    """Resources requested by the benchmark pods of a namespace that are not
+    finished."""
+    requests: Dict[str, Decimal] = {}
+    for pod in kube.paginate(
+        kube.core().list_namespaced_pod,
+        namespace,
+        label_selector=RUN_ID_LABEL,
+        field_selector=TERMINAL,
+        _preload_content=False,
+    ):
+        for container in (pod.get("spec") or {}).get("containers") or []:
+            wanted = (container.get("resources") or {}).get("requests") or {}
+            for name, value in wanted.items():
+                requests[name] = requests.get(name, Decimal(0)) + _quantity(value)
+    return requests
+
+
+def snapshot(namespace: str, clusterqueue: Optional[str] = None) -> Snapshot:
+    """Measure the load on the cluster.
+
+    Args:
+        namespace (str): Namespace the benchmarks run in.
+        clusterqueue (Optional[str]): ClusterQueue the benchmarks submit to.
+
+    Returns:
+        Snapshot: Current load.
+    """
+    pods = kube.core().list_namespaced_pod(
+        namespace, label_selector=RUN_ID_LABEL, limit=1
+    )
+    workloads, usage, quota = _clusterqueue(clusterqueue)
+    return Snapshot(
+        # One page is enough to know if any benchmark pod is left, its
+        # remaining item count is not set for label selected lists.
+        pods=bool(pods.items),
+        workloads=workloads,
+        usage=usage,
+        quota=quota,
+        requests=_requests(namespace),
+    )
+
+
+def wait(
+    namespace: str,
+    baseline: Snapshot,
+    clusterqueue: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    interval: float = DEFAULT_INTERVAL,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> Optional[float]:
+    """Wait until the load on the cluster is back to the baseline.
+
+    Args:
+        namespace (str): Namespace the benchmarks run in.
+        baseline (Snapshot): Load before benchmarking, see `snapshot`.
+        clusterqueue (Optional[str]): ClusterQueue the benchmarks submit to.
+        timeout (float): Seconds to wait before giving up. Defaults to 600.
+        interval (float): Seconds between checks. Defaults to 2.
+        tolerance (float): Share of the ClusterQueue nominal quota its usage
+            may exceed the baseline by. Defaults to 0.05.
+
+    Returns:
+        Optional[float]: Seconds until the cluster settled, None on timeout.
+    """
+    now = time()
+    current = snapshot(namespace, clusterqueue)
+    while not current.settled(baseline, tolerance):
+        if time() - now >= timeout:
+            logger.warning(
+                "Cluster not settled after %ss: %s",
+                timeout,
+                ", ".join(current.excess(baseline, tolerance)),
+            )
+            return None
+        logger.debug("Waiting for %s", ", ".join(current.excess(baseline, tolerance)))
+        sleep(interval)
+        current = snapshot(namespace, clusterqueue)
+    elapsed: float = time() - now
+    logger.info("Cluster settled in %.2fs", elapsed)
+    return elapsed
@@ -0,0 +1,149 @@
+"""Search the job count at which a cluster saturates."""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from kueuer.utils.logging import logger
+
+DEFAULT_RESOLUTION: float = 0.10
+# p99 latency this many times the one of the smallest count is saturated.
+LATENCY_FACTOR: float = 2.0
+
+
+@dataclass
+class Probe:
+    """Measurements of one experiment of the search.
+
+    Attributes:
+        count (int): Jobs in the experiment.
+        throughput (Optional[float]): Jobs completed per second.
+        p99 (Optional[float]): 99th percentile of the job durations in seconds.
+    """
+
+    count: int
+    throughput: Optional[float]
+    p99: Optional[float]
+
+
+@dataclass
+class Saturation:
+    """Saturation point found by `search`.
+
+    Attributes:
+        use_kueue (bool): Whether the jobs were submitted through Kueue.
+        max_throughput (Optional[float]): Highest jobs/s before saturating.
+        max_throughput_count (Optional[int]): Job count reaching it.
+        knee (Optional[int]): Smallest job count found saturated, None if
+            the upper bound was reached first.
+        p99_doubled (Optional[int]): Smallest job count whose p99 latency is
+            `LATENCY_FACTOR` times the one of the smallest count.
+        reference_p99 (Optional[float]): p99 latency of the smallest count.
+        probes (List[Probe]): Experiments in the order they ran.
+    """
+
+    use_kueue: bool
+    max_throughput: Optional[float] = None
+    max_throughput_count: Optional[int] = None
+    knee: Optional[int] = None
+    p99_doubled: Optional[int] = None
+    reference_p99: Optional[float] = None
+    probes: List[Probe] = field(default_factory=list)
+
+    def record(self) -> Dict[str, Any]:
+        """Flatten the saturation point into one row, without the probes."""
+        row: Dict[str, Any] = asdict(self)
+        row["probes"] = len(self.probes)
+        return row
+
+
+def _slow(probe: Probe, reference: Probe) -> bool:
+    """True if the p99 latency of a probe doubled since the reference."""
+    if probe.p99 is None or not reference.p99:
+        return False
+    return probe.p99 >= LATENCY_FACTOR * reference.p99
+
+
+def _saturated(probe: Probe, reference: Probe, smaller: List[Probe]) -> bool:
+    """True if a probe is slow or no faster than a smaller job count."""
+    if probe.throughput is None or _slow(probe, reference):
+        return True
+    return any(
+        other.throughput is not None and probe.throughput <= other.throughput
+        for other in smaller
+        if other.count < probe.count
+    )
+
+
+async def search(
+    probe: Callable[[int], Awaitable[Probe]],
+    lower: int,
+    upper: int,
+    use_kueue: bool = False,
+    resolution: float = DEFAULT_RESOLUTION,
+) -> Saturation:
+    """Find the job count where throughput stops growing or latency doubles.
+
+    The job count doubles from `lower` until an experiment saturates, then
+    the count is bisected between the last good and the first saturated one
+    until they are within `resolution` of each other. An experiment is
+    saturated when its throughput is no higher than the one of a smaller job
+    count, or when its p99 latency is twice the one of `lower`.
+
+    Args:
+        probe (Callable[[int], Awaitable[Probe]]): Runs an experiment with the
+            given number of jobs.
+        lower (int): Smallest job count, the latency reference.
+        upper (int): Largest job count.
+        use_kueue (bool): Whether `probe` submits through Kueue.
+        resolution (float): Relative width of the final bisection interval.
+
+    Returns:
+        Saturation: Saturation point and every experiment that ran.
+    """
+    result = Saturation(use_kueue=use_kueue)
+    measured: Dict[int, Probe] = {}
+
+    async def measure(count: int) -> Probe:
+        measured[count] = await probe(count)
+        result.probes.append(measured[count])
+        logger.info(
+            "Probe %s jobs, kueue=%s: %s jobs/s, p99 %ss",
+            count,
+            use_kueue,
+            measured[count].throughput,
+            measured[count].p99,
+        )
+        return measured[count]
+
+    reference = await measure(lower)
+    result.reference_p99 = reference.p99
+    good: int = lower
+    bad: Optional[int] = None
+    # Exponential ramp up to the first saturated count
+    while good < upper:
+        count: int = min(2 * good, upper)
+        if _saturated(await measure(count), reference, list(measured.values())):
+            bad = count
+            break
+        good = count
+    # Bisection between the last good and the first saturated count
+    while bad is not None and bad - good > max(1, resolution * good):
+        count = (good + bad) // 2
+        if _saturated(await measure(count), reference, list(measured.values())):
+            bad = count
+        else:
+            good = count
+
+    result.knee = bad
+    sustained = [
+        item
+        for item in measured.values()
+        if item.throughput is not None and (bad is None or item.count < bad)
+    ]
+    if sustained:
+        best = max(sustained, key=lambda item: item.throughput or 0.0)
+        result.max_throughput = best.throughput
+        result.max_throughput_count = best.count
+    slow = [item.count for item in measured.values() if _slow(item, reference)]
+    result.p99_doubled = min(slow) if slow else None
+    return result
@@ -0,0 +1,212 @@
+"""Declarative benchmark sweeps over job shapes, counts, queues and priorities.
+
+A scenario is a YAML file of cells to run. `defaults` apply to every cell,
+`grid` expands into the cartesian product of its lists, and `cells` lists
+extra cells explicitly. Any cell field can be a list in `defaults` or
+`cells` too, e.g. `use_kueue: [false, true]` to compare both modes:
+
+    namespace: skaha-workload
+    defaults:
+      duration: 10
+      kueue: skaha-local-queue
+      priority: high
+      use_kueue: [false, true]
+    grid:
+      count: [16, 64, 256]
+      cores: [1, 4]
+      ram: [1, 8]
+    cells:
+      - {count: 1024, cores: 1, ram: 1, priority: [low, high]}
+      - {count: 512, arrival: poisson, rate: [1, 2, 4, 8]}
+      - {count: 256, mix: [mixes/uniform.yaml, mixes/heavy.yaml]}
+
+Cells with an `arrival` process other than `burst` submit their jobs over
+time at `rate` jobs/s, see `kueuer.benchmarks.arrivals`. Cells with a `mix`
+draw the shape and duration of their jobs from that file instead, see
+`kueuer.benchmarks.mixes`.
+"""
+
+import itertools
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+from kueuer.benchmarks import (
+    DEFAULT_JOBSPEC_FILEPATH,
+    DEFAULT_NAMESPACE,
+    arrivals,
+    mixes,
+)
+from kueuer.utils import io
+
+
+@dataclass(frozen=True)
+class Cell:
+    """One experiment of a scenario.
+
+    Attributes:
+        count (int): Number of jobs.
+        duration (int): Duration of each job in seconds.
+        cores (int): CPU cores per job.
+        ram (int): RAM per job in GB.
+        storage (int): Ephemeral storage per job in GB.
+        use_kueue (bool): Submit the jobs through Kueue.
+        kueue (Optional[str]): Local queue, used with Kueue.
+        priority (Optional[str]): Kueue priority class, used with Kueue.
+        arrival (str): Arrival process of the jobs, see `arrivals.PROCESSES`.
+        rate (Optional[float]): Mean job arrivals per second, except for burst.
+        period (float): Seconds between bursts, or of a diurnal cycle.
+        mix (Optional[str]): Mix file of job shapes and durations, replacing
+            `duration`, `cores`, `ram` and `storage`.
+    """
+
+    count: int
+    duration: int = 1
+    cores: int = 1
+    ram: int = 1
+    storage: int = 1
+    use_kueue: bool = False
+    kueue: Optional[str] = None
+    priority: Optional[str] = None
+    arrival: str = arrivals.DEFAULT_PROCESS
+    rate: Optional[float] = None
+    period: float = arrivals.DEFAULT_PERIOD
+    mix: Optional[str] = None
+
+    def process(self) -> arrivals.Process:
+        """Arrival process of the jobs, raising ValueError if incomplete."""
+        return arrivals.Process(self.arrival, self.rate, self.period)
+
+    def mixture(self) -> Optional[mixes.Mix]:
+        """Job mix of the cell, None if its jobs are alike."""
+        return mixes.load(self.mix) if self.mix else None
+
+    @property
+    def shape(self) -> Tuple[Any, ...]:
+        """Everything but the job count and queueing, what a node must fit."""
+        return (self.mix or "", self.cores, self.ram, self.storage, self.duration)
+
+    def label(self) -> str:
+        mode: str = (
+            f"kueue {self.kueue}/{self.priority}" if self.use_kueue else "direct"
+        )
+        process = self.process()
+        jobs: str = (
+            f"{self.count} jobs of mix {self.mix}"
+            if self.mix
+            else f"{self.count} jobs of {self.cores} cores, {self.ram}GB RAM, "
+            f"{self.storage}GB storage for {self.duration}s"
+        )
+        return f"{jobs}, {mode}" + (f", {process.label()}" if process.paced else "")
+
+
+@dataclass
+class Scenario:
+    """Cells of a scenario and where to run them.
+
+    Attributes:
+        namespace (str): Namespace to launch jobs in.
+        filepath (str): Job template.
+        cells (List[Cell]): Cells to run, in the order of the file.
+    """
+
+    namespace: str
+    filepath: str
+    cells: List[Cell]
+
+
+FIELDS: Tuple[str, ...] = tuple(item.name for item in fields(Cell))
+
+
+def _expand(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Cartesian product of the list values of a cell specification."""
+    unknown = set(spec) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown cell fields {sorted(unknown)}")
+    keys: List[str] = list(spec)
+    values = [spec[key] if isinstance(spec[key], list) else [spec[key]] for key in keys]
+    return [
+        dict(zip(keys, combination, strict=True))
+        for combination in itertools.product(*values)
+    ]
+
+
+def _cell(spec: Dict[str, Any]) -> Cell:
+    if "count" not in spec:
+        raise ValueError(f"Cell without a job count: {spec}")
+    cell = Cell(**spec)
+    if cell.use_kueue and not (cell.kueue and cell.priority):
+        raise ValueError(f"Kueue cell without a queue or priority: {spec}")
+    cell.process()
+    cell.mixture()
+    if not cell.use_kueue:
+        # Queueing fields only apply to Kueue, drop them to deduplicate cells
+        cell = Cell(**{**asdict(cell), "kueue": None, "priority": None})
+    return cell
+
+
+def parse(data: Dict[str, Any]) -> Scenario:
+    """Expand a scenario into its cells.
+
+    Args:
+        data (Dict[str, Any]): Content of a scenario file.
+
+    Raises:
+        ValueError: If a cell is incomplete or has unknown fields.
+
+    Returns:
+        Scenario: Deduplicated cells, in the order of the file.
+    """
+    defaults: Dict[str, Any] = data.get("defaults") or {}
+    specs: List[Dict[str, Any]] = []
+    grid: Dict[str, Any] = data.get("grid") or {}
+    if grid:
+        specs += _expand({**defaults, **grid})
+    for spec in data.get("cells") or []:
+        specs += _expand({**defaults, **spec})
+    cells: List[Cell] = []
+    for spec in specs:
+        cell = _cell(spec)
+        if cell not in cells:
+            cells.append(cell)
+    if not cells:
+        raise ValueError("Scenario has no cells, add a grid or cells")
+    return Scenario(
+        namespace=data.get("namespace") or DEFAULT_NAMESPACE,
+        filepath=data.get("filepath") or DEFAULT_JOBSPEC_FILEPATH,
+        cells=cells,
+    )
+
+
+def load(filepath: str) -> Scenario:
+    """Read and expand a scenario file, see `parse`."""
+    return parse(io.read_yaml(filepath) or {})
+
+
+def order(cells: List[Cell]) -> List[Cell]:
+    """Order cells to reduce churn on the cluster between experiments.
+
+    Cells with the same job shape run back to back, so nodes and quota are
+    reused by jobs alike. Within a group, job counts alternate
+    between ascending and descending from one group to the next, so the
+    largest experiments of neighbouring groups follow each other rather than
+    the cluster going from its largest to its smallest load and back. Direct
+    and Kueue runs of the same count are kept next to each other.
+
+    Args:
+        cells (List[Cell]): Cells of a scenario.
+
+    Returns:
+        List[Cell]: The same cells, in the order to run them.
+    """
+    groups: Dict[Tuple[Any, ...], List[Cell]] = {}
+    for cell in cells:
+        groups.setdefault(cell.shape, []).append(cell)
+    ordered: List[Cell] = []
+    for index, shape in enumerate(sorted(groups)):
+        group = sorted(
+            groups[shape],
+            key=lambda cell: (cell.kueue or "", cell.priority or "", cell.use_kueue),
+        )
+        # Sorting is stable, cells of the same count keep the order above
+        ordered += sorted(group, key=lambda cell: cell.count, reverse=index % 2 == 1)
+    return ordered
@@ -0,0 +1,928 @@
+"""Discrete-event simulation of Kueue admission, from its manifests.
+
+Predicts admission wait, preemptions and quota utilization of the
+ClusterQueues in `configs/kueue/*/clusterQueue.config.yaml` for a stream of
+jobs, without touching a cluster, e.g. before changing nominal quotas,
+borrowing and lending limits or the queueing strategy.
+
+What is modelled:
+
+- Flavors are tried in order for every resource group, the first one with
+  room for the workload is assigned.
+- Nominal quota, `borrowingLimit` and `lendingLimit` within a cohort. The
+  part of the nominal quota a ClusterQueue lends is shared by the cohort.
+- `BestEffortFIFO` admits any workload that fits, `StrictFIFO` waits until
+  the head of the queue fits. Workloads are ordered by priority, then by the
+  time they were queued or last evicted.
+- `withinClusterQueue`, `reclaimWithinCohort` and `borrowWithinCohort`
+  preemption. Borrowing workloads of other ClusterQueues are preempted
+  first, then lower priorities, then the most recently admitted.
+
+What is not: node placement (admitted jobs start at once), fair sharing,
+partial admission, admission checks, and the latency of the API server and
+controllers (preemptions take effect immediately).
+"""
+
+import heapq
+import itertools
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import typer
+import yaml
+from kubernetes.utils.quantity import parse_quantity
+from rich.console import Console
+from rich.table import Table
+
+from kueuer.benchmarks import (
+    DEFAULT_KUEUE,
+    DEFAULT_KUEUE_PRIORITY,
+    DEFAULT_NAMESPACE,
+    trace as traces,
+)
+from kueuer.utils import io, stats
+from kueuer.utils.logging import logger
+
+STRATEGIES: Tuple[str, ...] = ("BestEffortFIFO", "StrictFIFO")
+RESOURCES: Tuple[str, ...] = ("cpu", "memory", "ephemeral-storage")
+# Quantities are integers of milli-units, so quotas compare exactly.
+MILLI: int = 1000
+GB: int = 1024**3
+# Event kinds, after arrivals at the same time.
+FINISH: int = 0
+CYCLE: int = 1
+
+Cell = Tuple[str, str]
+
+console = Console()
+
+
+def amount(value: Any) -> int:
+    """Milli-units of a quantity, e.g. 1500 for `1.5` or `1500m`."""
+    return int(parse_quantity(str(value)) * MILLI)
+
+
+@dataclass
+class Quota:
+    """Quota of a ClusterQueue for one resource of one flavor.
+
+    Attributes:
+        nominal (int): Nominal quota.
+        borrowing (Optional[int]): Most the queue uses above nominal, None
+            for as much as the cohort lends.
+        lending (Optional[int]): Most of the nominal quota lent to the
+            cohort, None for all of it.
+    """
+
+    nominal: int
+    borrowing: Optional[int] = None
+    lending: Optional[int] = None
+
+    @property
+    def guaranteed(self) -> int:
+        """Part of the nominal quota not lent to the cohort."""
+        lent: int = self.nominal if self.lending is None else self.lending
+        return self.nominal - min(lent, self.nominal)
+
+
+@dataclass
+class ClusterQueue:
+    """Quotas and policies of a ClusterQueue.
+
+    Attributes:
+        name (str): Name of the ClusterQueue.
+        cohort (Optional[str]): Cohort it borrows from and lends to.
+        strategy (str): `BestEffortFIFO` or `StrictFIFO`.
+        groups (List[Tuple[Tuple[str, ...], Tuple[str, ...]]]): Covered
+            resources and flavors, in order, of every resource group.
+        quotas (Dict[Cell, Quota]): Quota by flavor and resource.
+        within (str): `withinClusterQueue` preemption policy.
+        reclaim (str): `reclaimWithinCohort` preemption policy.
+        borrow (str): `borrowWithinCohort` preemption policy.
+        threshold (Optional[int]): Highest priority `borrowWithinCohort`
+            preempts, None for any.
+    """
+
+    name: str
+    cohort: Optional[str] = None
+    strategy: str = "BestEffortFIFO"
+    groups: List[Tuple[Tuple[str, ...], Tuple[str, ...]]] = field(default_factory=list)
+    quotas: Dict[Cell, Quota] = field(default_factory=dict)
+    within: str = "Never"
+    reclaim: str = "Never"
+    borrow: str = "Never"
+    threshold: Optional[int] = None
+
+    @classmethod
+    def from_manifest(cls, data: Dict[str, Any]) -> "ClusterQueue":
+        spec: Dict[str, Any] = data.get("spec") or {}
+        preemption: Dict[str, Any] = spec.get("preemption") or {}
+        borrowing: Dict[str, Any] = preemption.get("borrowWithinCohort") or {}
+        queue = cls(
+            name=data["metadata"]["name"],
+            cohort=spec.get("cohort"),
+            strategy=spec.get("queueingStrategy") or "BestEffortFIFO",
+            within=preemption.get("withinClusterQueue") or "Never",
+            reclaim=preemption.get("reclaimWithinCohort") or "Never",
+            borrow=borrowing.get("policy") or "Never",
+            threshold=borrowing.get("maxPriorityThreshold"),
+        )
+        for group in spec.get("resourceGroups") or []:
+            flavors: List[str] = []
+            for flavor in group.get("flavors") or []:
+                flavors.append(flavor["name"])
+                for resource in flavor.get("resources") or []:
+                    limits = {
+                        key: amount(resource[key])
+                        for key in ("borrowingLimit", "lendingLimit")
+                        if resource.get(key) is not None
+                    }
+                    queue.quotas[(flavor["name"], resource["name"])] = Quota(
+                        nominal=amount(resource.get("nominalQuota", 0)),
+                        borrowing=limits.get("borrowingLimit"),
+                        lending=limits.get("lendingLimit"),
+                    )
+            queue.groups.append((tuple(group["coveredResources"]), tuple(flavors)))
+        return queue
+
+
+@dataclass
+class Config:
+    """Kueue objects the simulation runs against.
+
+    Attributes:
+        clusterqueues (Dict[str, ClusterQueue]): ClusterQueues by name.
+        priorities (Dict[str, int]): WorkloadPriorityClass values by name.
+        localqueues (Dict[str, str]): ClusterQueue of every LocalQueue, by
+            `namespace/name`.
+    """
+
+    clusterqueues: Dict[str, ClusterQueue] = field(default_factory=dict)
+    priorities: Dict[str, int] = field(default_factory=dict)
+    localqueues: Dict[str, str] = field(default_factory=dict)
+
+    def clusterqueue(self, queue: Optional[str]) -> str:
+        """ClusterQueue of a LocalQueue given as `namespace/name` or `name`.
+
+        Raises:
+            ValueError: If the queue is unknown or ambiguous.
+        """
+        if queue is None and len(self.clusterqueues) == 1:
+            return next(iter(self.clusterqueues))
+        if queue in self.localqueues:
+            return self.localqueues[queue]
+        found: Set[str] = {
+            target
+            for name, target in self.localqueues.items()
+            if name.split("/")[-1] == queue
+        }
+        if len(found) == 1:
+            return found.pop()
+        if queue in self.clusterqueues:
+            return str(queue)
+        raise ValueError(f"Unknown or ambiguous LocalQueue {queue}")
+
+
+def _documents(path: str) -> Iterator[Dict[str, Any]]:
+    """Kubernetes objects of a YAML file, or of every YAML file in a directory."""
+    filepaths: List[str] = [path]
+    if os.path.isdir(path):
+        filepaths = [
+            os.path.join(path, name)
+            for name in sorted(os.listdir(path))
+            if name.endswith((".yaml", ".yml"))
+        ]
+    for filepath in filepaths:
+        with open(filepath, encoding="utf-8") as f:
+            for document in yaml.safe_load_all(f):
+                if isinstance(document, dict) and document.get("kind"):
+                    yield document
+
+
+def load(paths: Iterable[str]) -> Config:
+    """Read the Kueue manifests of files or directories, e.g. `configs/kueue/prod`.
+
+    Raises:
+        ValueError: If no ClusterQueue is found.
+
+    Returns:
+        Config: ClusterQueues, priority classes and LocalQueues found.
+    """
+    config = Config()
+    for path in paths:
+        for document in _documents(path):
+            kind: str = document["kind"]
+            metadata: Dict[str, Any] = document.get("metadata") or {}
+            if kind == "ClusterQueue":
+                queue = ClusterQueue.from_manifest(document)
+                config.clusterqueues[queue.name] = queue
+            elif kind == "WorkloadPriorityClass":
+                config.priorities[metadata["name"]] = int(document["value"])
+            elif kind == "LocalQueue":
+                name: str = f"{metadata.get('namespace', 'default')}/{metadata['name']}"
+                config.localqueues[name] = document["spec"]["clusterQueue"]
+    if not config.clusterqueues:
+        raise ValueError(f"No ClusterQueue in {list(paths)}")
+    return config
+
+
+@dataclass(slots=True)
+class Workload:
+    """State of a simulated workload, kept small for millions of them.
+
+    Attributes:
+        id (int): Order of arrival.
+        queue (str): ClusterQueue.
+        priority (int): Priority value.
+        requests (Tuple[int, ...]): Milli-units of every `RESOURCES`.
+        duration (float): Seconds it runs once admitted.
+        submitted (float): Time of arrival.
+        queued (float): Time it was queued or last evicted, for ordering.
+        demand (Optional[Tuple[Tuple[Cell, int], ...]]): Quota used while admitted.
+        attempt (int): Admissions so far, to ignore finishes of evicted runs.
+    """
+
+    id: int
+    queue: str
+    priority: int
+    requests: Tuple[int, ...]
+    duration: float
+    submitted: float
+    queued: float
+    demand: Optional[Tuple[Tuple[Cell, int], ...]] = None
+    admitted: float = 0.0
+    attempt: int = 0
+
+
+@dataclass
+class Tally:
+    """Outcome of the workloads of a ClusterQueue and priority."""
+
+    submitted: int = 0
+    admitted: int = 0
+    finished: int = 0
+    preemptions: int = 0
+    waits: stats.Stream = field(default_factory=stats.Stream)
+
+
+@dataclass
+class Report:
+    """Outcome of a simulation.
+
+    Attributes:
+        queues (List[Dict[str, Any]]): Admission wait and preemptions by
+            ClusterQueue and priority.
+        usage (List[Dict[str, Any]]): Average usage of every quota.
+        events (int): Events simulated.
+        horizon (float): Simulated seconds.
+        elapsed (float): Wall-clock seconds the simulation took.
+    """
+
+    queues: List[Dict[str, Any]]
+    usage: List[Dict[str, Any]]
+    events: int
+    horizon: float
+    elapsed: float
+
+
+class Simulator:
+    """Admission of workloads to the ClusterQueues of a configuration.
+
+    Events are kept in a heap and arrivals are read lazily, so memory only
+    grows with the workloads waiting or running. Waiting workloads of a
+    ClusterQueue are grouped by priority and requests: when the first of a
+    group does not fit, none of the group does, so a scheduling cycle looks
+    at one workload per group rather than at every waiting workload.
+
+    Args:
+        config (Config): Kueue configuration.
+        strategy (Optional[str]): Queueing strategy of every ClusterQueue,
+            instead of the configured ones.
+    """
+
+    def __init__(self, config: Config, strategy: Optional[str] = None) -> None:
+        self.config = config
+        self.queues: Dict[str, ClusterQueue] = config.clusterqueues
+        if strategy:
+            for queue in self.queues.values():
+                queue.strategy = strategy
+        self.members: Dict[str, List[str]] = {}
+        self.lendable: Dict[str, Dict[Cell, int]] = {}
+        for queue in self.queues.values():
+            if queue.cohort:
+                self.members.setdefault(queue.cohort, []).append(queue.name)
+                pool = self.lendable.setdefault(queue.cohort, {})
+                for cell, quota in queue.quotas.items():
+                    pool[cell] = pool.get(cell, 0) + quota.nominal - quota.guaranteed
+        self.usage: Dict[str, Dict[Cell, int]] = {name: {} for name in self.queues}
+        self.borrowed: Dict[str, Dict[Cell, int]] = {
+            cohort: {} for cohort in self.members
+        }
+        # Time-weighted usage, and when each usage last changed.
+        self.area: Dict[str, Dict[Cell, float]] = {name: {} for name in self.queues}
+        self.since: Dict[str, Dict[Cell, float]] = {name: {} for name in self.queues}
+        # Admitted workloads by ClusterQueue, priority and id, oldest first.
+        self.running: Dict[str, Dict[int, Dict[int, Workload]]] = {
+            name: {} for name in self.queues
+        }
+        # Waiting workloads by ClusterQueue and group, and the heap of groups.
+        self.groups: Dict[str, Dict[Tuple, Deque[Workload]]] = {
+            name: {} for name in self.queues
+        }
+        self.heads: Dict[str, List[Tuple[int, float, int, Tuple]]] = {
+            name: [] for name in self.queues
+        }
+        self.events: List[Tuple[float, int, int, Optional[Workload], int]] = []
+        self.sequence = itertools.count()
+        self.dirty: Set[str] = set()
+        self.now: float = 0.0
+        self.tallies: Dict[Tuple[str, int], Tally] = {}
+        self.resolved: Dict[Optional[str], str] = {}
+
+    # Quota
+
+    def _fits(
+        self,
+        queue: ClusterQueue,
+        demand: Dict[Cell, int],
+        usage: Dict[str, Dict[Cell, int]],
+        borrowed: Dict[str, Dict[Cell, int]],
+    ) -> bool:
+        """True if a queue has room for a demand, given the usage of its cohort."""
+        own: Dict[Cell, int] = usage[queue.name]
+        for cell, value in demand.items():
+            quota: Optional[Quota] = queue.quotas.get(cell)
+            if quota is None:
+                return False
+            used: int = own.get(cell, 0)
+            if queue.cohort is None:
+                if used + value > quota.nominal:
+                    return False
+                continue
+            if (
+                quota.borrowing is not None
+                and used + value > quota.nominal + quota.borrowing
+            ):
+                return False
+            extra: int = max(0, used + value - quota.guaranteed) - max(
+                0, used - quota.guaranteed
+            )
+            pool: int = self.lendable[queue.cohort].get(cell, 0)
+            if borrowed[queue.cohort].get(cell, 0) + extra > pool:
+                return False
+        return True
+
+    def _shift(
+        self,
+        queue: ClusterQueue,
+        demand: Iterable[Tuple[Cell, int]],
+        sign: int,
+        usage: Dict[str, Dict[Cell, int]],
+        borrowed: Dict[str, Dict[Cell, int]],
+    ) -> None:
+        """Add or remove a demand from the usage of a queue and its cohort."""
+        own: Dict[Cell, int] = usage[queue.name]
+        for cell, value in demand:
+            old: int = own.get(cell, 0)
+            new: int = old + sign * value
+            own[cell] = new
+            if queue.cohort:
+                guaranteed: int = queue.quotas[cell].guaranteed
+                pool: Dict[Cell, int] = borrowed[queue.cohort]
+                pool[cell] = (
+                    pool.get(cell, 0)
+                    + max(0, new - guaranteed)
+                    - max(0, old - guaranteed)
+                )
+
+    def _use(self, queue: ClusterQueue, demand: Iterable[Tuple[Cell, int]], sign: int):
+        demand = list(demand)
+        area: Dict[Cell, float] = self.area[queue.name]
+        since: Dict[Cell, float] = self.since[queue.name]
+        for cell, _value in demand:
+            used: int = self.usage[queue.name].get(cell, 0)
+            area[cell] = area.get(cell, 0.0) + used * (self.now - since.get(cell, 0.0))
+            since[cell] = self.now
+        self._shift(queue, demand, sign, self.usage, self.borrowed)
+
+    def _demand(
+        self, queue: ClusterQueue, workload: Workload, fitting: bool = True
+    ) -> Optional[Dict[Cell, int]]:
+        """Quota a workload needs with the first flavors that fit, or with the
+        first flavors if `fitting` is False. None if nothing fits."""
+        requested: Dict[str, int] = {
+            name: value
+            for name, value in zip(RESOURCES, workload.requests, strict=True)
+            if value
+        }
+        demand: Dict[Cell, int] = {}
+        for covered, flavors in queue.groups:
+            wanted: Dict[str, int] = {
+                name: requested.pop(name) for name in covered if name in requested
+            }
+            if not wanted:
+                continue
+            for flavor in flavors:
+                option = {(flavor, name): value for name, value in wanted.items()}
+                if not fitting or self._fits(queue, option, self.usage, self.borrowed):
+                    demand.update(option)
+                    break
+            else:
+                return None
+        # Resources no group covers can never be admitted.
+        return None if requested else demand
+
+    # Preemption
+
+    def _borrowing(self, name: str, usage: Dict[str, Dict[Cell, int]]) -> bool:
+        quotas: Dict[Cell, Quota] = self.queues[name].quotas
+        return any(value > quotas[cell].nominal for cell, value in usage[name].items())
+
+    def _eligible(
+        self, queue: ClusterQueue, workload: Workload, other: Workload, reclaim: bool
+    ) -> bool:
+        """True if a policy of `queue` allows `workload` to preempt `other`."""
+        lower: bool = other.priority < workload.priority
+        if other.queue == queue.name:
+            if queue.within == "LowerOrNewerEqualPriority":
+                return lower or (
+                    other.priority == workload.priority
+                    and other.queued > workload.queued
+                )
+            return queue.within == "LowerPriority" and lower
+        if reclaim:
+            return queue.reclaim == "Any" or (
+                queue.reclaim == "LowerPriority" and lower
+            )
+        return (
+            queue.borrow == "LowerPriority"
+            and lower
+            and (queue.threshold is None or other.priority <= queue.threshold)
+        )
+
+    def _admitted(self, names: List[str], highest: float) -> Iterator[Workload]:
+        """Admitted workloads of queues up to a priority, lowest priority and
+        most recently admitted first."""
+        priorities: List[int] = sorted(
+            {
+                priority
+                for name in names
+                for priority in self.running[name]
+                if priority <= highest
+            }
+        )
+        for priority in priorities:
+            yield from heapq.merge(
+                *(
+                    reversed(self.running[name].get(priority, {}).values())
+                    for name in names
+                ),
+                key=lambda other: -other.admitted,
+            )
+
+    def _candidates(
+        self, queue: ClusterQueue, workload: Workload, demand: Dict[Cell, int]
+    ) -> Iterator[Workload]:
+        """Workloads `workload` may preempt, in the order Kueue preempts them."""
+        own: Dict[Cell, int] = self.usage[queue.name]
+        reclaim: bool = all(
+            own.get(cell, 0) + value <= queue.quotas[cell].nominal
+            for cell, value in demand.items()
+        )
+        lower: int = workload.priority - 1
+        # Borrowing workloads of the cohort go first, then those of the queue.
+        policy: str = queue.reclaim if reclaim else queue.borrow
+        if policy != "Never":
+            others: List[str] = [
+                name
+                for name in self.members.get(queue.cohort or "", [])
+                if name != queue.name and self._borrowing(name, self.usage)
+            ]
+            highest: float = float("inf") if policy == "Any" else lower
+            for other in self._admitted(others, highest):
+                if self._eligible(queue, workload, other, reclaim):
+                    yield other
+        if queue.within != "Never":
+            highest = (
+                workload.priority
+                if queue.within == "LowerOrNewerEqualPriority"
+                else lower
+            )
+            for other in self._admitted([queue.name], highest):
+                if self._eligible(queue, workload, other, reclaim):
+                    yield other
+
+    def _victims(
+        self, queue: ClusterQueue, workload: Workload, demand: Dict[Cell, int]
+    ) -> Optional[List[Workload]]:
+        """Workloads to preempt, in preemption order, to make room for a demand.
+
+        Candidates are taken in preemption order until the demand fits, then,
+        like Kueue, those the later ones made unnecessary are put back.
+        """
+        candidates = self._candidates(queue, workload, demand)
+        first: Optional[Workload] = next(candidates, None)
+        if first is None:
+            return None
+        names: List[str] = self.members.get(queue.cohort or "", [queue.name])
+        usage = {name: dict(self.usage[name]) for name in names}
+        borrowed = {cohort: dict(pool) for cohort, pool in self.borrowed.items()}
+        victims: List[Workload] = []
+        for other in itertools.chain([first], candidates):
+            if other.queue != queue.name and not self._borrowing(other.queue, usage):
+                continue
+            self._shift(
+                self.queues[other.queue], other.demand or (), -1, usage, borrowed
+            )
+            victims.append(other)
+            if self._fits(queue, demand, usage, borrowed):
+                return self._spare(queue, demand, victims, usage, borrowed)
+        return None
+
+    def _spare(
+        self,
+        queue: ClusterQueue,
+        demand: Dict[Cell, int],
+        victims: List[Workload],
+        usage: Dict[str, Dict[Cell, int]],
+        borrowed: Dict[str, Dict[Cell, int]],
+    ) -> List[Workload]:
+        """Victims without those whose eviction the demand does not need, the
+        last one always being needed."""
+        needed: List[Workload] = [victims[-1]]
+        for other in reversed(victims[:-1]):
+            requests = other.demand or ()
+            self._shift(self.queues[other.queue], requests, 1, usage, borrowed)
+            if not self._fits(queue, demand, usage, borrowed):
+                self._shift(self.queues[other.queue], requests, -1, usage, borrowed)
+                needed.append(other)
+        return needed[::-1]
+
+    # Lifecycle
+
+    def _touch(self, queue: ClusterQueue) -> None:
+        """Schedule a cycle for a queue and the queues of its cohort."""
+        if not self.dirty:
+            heapq.heappush(self.events, (self.now, next(self.sequence), CYCLE, None, 0))
+        self.dirty.update(self.members.get(queue.cohort or "", [queue.name]))
+
+    def _tally(self, workload: Workload) -> Tally:
+        key: Tuple[str, int] = (workload.queue, workload.priority)
+        if key not in self.tallies:
+            self.tallies[key] = Tally()
+        return self.tallies[key]
+
+    def _enqueue(self, workload: Workload) -> None:
+        group: Tuple = (workload.priority, workload.requests)
+        waiting = self.groups[workload.queue].setdefault(group, deque())
+        if not waiting:
+            heapq.heappush(
+                self.heads[workload.queue],
+                (-workload.priority, workload.queued, next(self.sequence), group),
+            )
+        waiting.append(workload)
+
+    def _arrive(self, arrival: traces.Arrival, index: int) -> None:
+        if arrival.queue not in self.resolved:
+            self.resolved[arrival.queue] = self.config.clusterqueue(arrival.queue)
+        priority: int = self.config.priorities.get(arrival.priority or "", 0)
+        workload = Workload(
+            id=index,
+            queue=self.resolved[arrival.queue],
+            priority=priority,
+            requests=(
+                round(arrival.cores * MILLI),
+                round(arrival.ram * GB * MILLI),
+                round(arrival.storage * GB * MILLI),
+            ),
+            duration=arrival.duration,
+            submitted=self.now,
+            queued=self.now,
+        )
+        self._tally(workload).submitted += 1
+        self._enqueue(workload)
+        self._touch(self.queues[workload.queue])
+
+    def _admit(self, workload: Workload) -> bool:
+        """Admit a workload if it fits, preempting others if it needs to."""
+        queue: ClusterQueue = self.queues[workload.queue]
+        demand = self._demand(queue, workload)
+        victims: List[Workload] = []
+        if demand is None:
+            demand = self._demand(queue, workload, fitting=False)
+            if demand is None:
+                return False
+            victims = self._victims(queue, workload, demand) or []
+            if not victims:
+                return False
+        for victim in victims:
+            self._evict(victim)
+        self._use(queue, demand.items(), 1)
+        workload.demand = tuple(demand.items())
+        workload.admitted = self.now
+        self.running[queue.name].setdefault(workload.priority, {})[workload.id] = (
+            workload
+        )
+        tally: Tally = self._tally(workload)
+        if not workload.attempt:
+            tally.admitted += 1
+            tally.waits.add(self.now - workload.submitted)
+        workload.attempt += 1
+        heapq.heappush(
+            self.events,
+            (
+                self.now + workload.duration,
+                next(self.sequence),
+                FINISH,
+                workload,
+                workload.attempt,
+            ),
+        )
+        return True
+
+    def _release(self, workload: Workload) -> None:
+        queue: ClusterQueue = self.queues[workload.queue]
+        self._use(queue, workload.demand or (), -1)
+        del self.running[queue.name][workload.priority][workload.id]
+        workload.demand = None
+        self._touch(queue)
+
+    def _evict(self, workload: Workload) -> None:
+        """Preempt an admitted workload and queue it again."""
+        self._release(workload)
+        self._tally(workload).preemptions += 1
+        workload.queued = self.now
+        self._enqueue(workload)
+
+    def _finish(self, workload: Workload, attempt: int) -> None:
+        if workload.attempt != attempt or workload.demand is None:
+            return
+        self._release(workload)
+        self._tally(workload).finished += 1
+
+    def _schedule(self, name: str) -> None:
+        """Admit the waiting workloads of a queue in order, while they fit."""
+        strict: bool = self.queues[name].strategy == "StrictFIFO"
+        heads = self.heads[name]
+        groups = self.groups[name]
+        blocked: List[Tuple[int, float, int, Tuple]] = []
+        while heads:
+            head = heapq.heappop(heads)
+            waiting = groups[head[3]]
+            if not self._admit(waiting[0]):
+                blocked.append(head)
+                if strict:
+                    break
+                continue
+            waiting.popleft()
+            if waiting:
+                first: Workload = waiting[0]
+                heapq.heappush(
+                    heads, (-first.priority, first.queued, next(self.sequence), head[3])
+                )
+            else:
+                del groups[head[3]]
+        for head in blocked:
+            heapq.heappush(heads, head)
+
+    def _cycle(self) -> None:
+        names: List[str] = sorted(self.dirty)
+        self.dirty.clear()
+        for name in names:
+            self._schedule(name)
+
+    def run(
+        self, arrivals: Iterable[traces.Arrival], until: Optional[float] = None
+    ) -> Report:
+        """Simulate the admission of a stream of jobs.
+
+        Args:
+            arrivals (Iterable[traces.Arrival]): Jobs, earliest first.
+            until (Optional[float]): Stop at this simulated time, else once
+                every job finished or nothing can be admitted anymore.
+
+        Returns:
+            Report: Admission waits, preemptions and quota usage.
+        """
+        start: float = perf_counter()
+        stream = enumerate(arrivals)
+        upcoming = next(stream, None)
+        count: int = 0
+        while self.events or upcoming is not None:
+            event_time: float = self.events[0][0] if self.events else float("inf")
+            if upcoming is not None and upcoming[1].submit <= event_time:
+                if until is not None and upcoming[1].submit > until:
+                    break
+                self.now = upcoming[1].submit
+                self._arrive(upcoming[1], upcoming[0])
+                upcoming = next(stream, None)
+            else:
+                if until is not None and event_time > until:
+                    break
+                self.now, _order, kind, workload, attempt = heapq.heappop(self.events)
+                if kind == FINISH and workload is not None:
+                    self._finish(workload, attempt)
+                else:
+                    self._cycle()
+            count += 1
+        if until is not None:
+            self.now = max(self.now, until)
+        return self.report(count, perf_counter() - start)
+
+    def report(self, events: int, elapsed: float) -> Report:
+        """Summarize the simulation up to the current time."""
+        names: Dict[int, str] = {
+            value: name for name, value in self.config.priorities.items()
+        }
+        queues: List[Dict[str, Any]] = []
+        for (queue, priority), tally in sorted(self.tallies.items()):
+            queues.append(
+                {
+                    "clusterqueue": queue,
+                    "priority": names.get(priority, str(priority)),
+                    "submitted": tally.submitted,
+                    "admitted": tally.admitted,
+                    "finished": tally.finished,
+                    "pending": tally.submitted - tally.admitted,
+                    "preemptions": tally.preemptions,
+                    **tally.waits.summary("wait_"),
+                }
+            )
+        usage: List[Dict[str, Any]] = []
+        for name, queue in sorted(self.queues.items()):
+            for cell, quota in queue.quotas.items():
+                used: int = self.usage[name].get(cell, 0)
+                since: float = self.since[name].get(cell, 0.0)
+                area: float = self.area[name].get(cell, 0.0) + used * (self.now - since)
+                average: float = area / self.now if self.now else 0.0
+                usage.append(
+                    {
+                        "clusterqueue": name,
+                        "flavor": cell[0],
+                        "resource": cell[1],
+                        "nominal": quota.nominal / MILLI,
+                        "average": average / MILLI,
+                        "utilization": average / quota.nominal
+                        if quota.nominal
+                        else None,
+                    }
+                )
+        return Report(queues, usage, events, self.now, elapsed)
+
+
+def _number(value: Optional[float], digits: int = 2) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def _quantity(resource: str, value: float) -> str:
+    """Bytes in Gi, other quantities as they are."""
+    if resource in RESOURCES[1:]:
+        return f"{value / GB:.4g}Gi"
+    return f"{value:.4g}"
+
+
+def show(report: Report) -> None:
+    """Print the waits and usage of a simulation as tables."""
+    table = Table(
+        "ClusterQueue",
+        "Priority",
+        "Submitted",
+        "Admitted",
+        "Preempted",
+        "Wait mean",
+        "p50",
+        "p90",
+        "p99",
+        "max",
+    )
+    for row in report.queues:
+        table.add_row(
+            row["clusterqueue"],
+            row["priority"],
+            str(row["submitted"]),
+            str(row["admitted"]),
+            str(row["preemptions"]),
+            *(
+                _number(row[key])
+                for key in ("wait_mean", "wait_p50", "wait_p90", "wait_p99", "wait_max")
+            ),
+        )
+    console.print(table)
+    table = Table("ClusterQueue", "Flavor", "Resource", "Nominal", "Average", "Usage")
+    for row in report.usage:
+        utilization: Optional[float] = row["utilization"]
+        table.add_row(
+            row["clusterqueue"],
+            row["flavor"],
+            row["resource"],
+            _quantity(row["resource"], row["nominal"]),
+            _quantity(row["resource"], row["average"]),
+            "-" if utilization is None else f"{utilization:.1%}",
+        )
+    console.print(table)
+
+
+def simulate(
+    configs: List[str] = typer.Argument(  # noqa: B008
+        ...,
+        help="Kueue manifests or directories of them, e.g. configs/kueue/prod.",
+    ),
+    trace: Optional[str] = (
+        typer.Option(
+            None,
+            "-t",
+            "--trace",
+            help="CSV trace, or recorded Workload events (.jsonl), to replay.",
+        )
+    ),
+    jobs: int = (
+        typer.Option(1000, "-j", "--jobs", help="Jobs to generate without a trace.")
+    ),
+    rate: float = (
+        typer.Option(
+            1.0,
+            "--rate",
+            help="Mean job submissions per second, 0 to submit all at once.",
+        )
+    ),
+    duration: float = (
+        typer.Option(600, "-d", "--duration", help="Duration of each job in seconds.")
+    ),
+    cores: float = typer.Option(1, "-c", "--cores", help="CPU cores per job."),
+    ram: float = typer.Option(1, "-r", "--ram", help="RAM per job in GB."),
+    storage: float = (
+        typer.Option(1, "-s", "--storage", help="Ephemeral storage per job in GB.")
+    ),
+    priorities: List[str] = (
+        typer.Option(  # noqa: B008
+            [DEFAULT_KUEUE_PRIORITY],
+            "-p",
+            "--priority",
+            help="Priority classes drawn at random, can be given multiple times.",
+        )
+    ),
+    queues: List[str] = (
+        typer.Option(  # noqa: B008
+            [f"{DEFAULT_NAMESPACE}/{DEFAULT_KUEUE}"],
+            "-q",
+            "--queue",
+            help="LocalQueues drawn at random, can be given multiple times.",
+        )
+    ),
+    seed: int = typer.Option(0, "--seed", help="Seed of the generated jobs."),
+    strategy: Optional[str] = (
+        typer.Option(
+            None,
+            "--strategy",
+            help="Queueing strategy of every ClusterQueue, BestEffortFIFO or "
+            "StrictFIFO, instead of the configured ones.",
+        )
+    ),
+    until: Optional[float] = (
+        typer.Option(None, "--until", help="Simulated seconds to stop after.")
+    ),
+    output: Optional[str] = (
+        typer.Option(None, "-o", "--output", help="CSV file to save the waits to.")
+    ),
+) -> None:
+    """Simulate Kueue admission of a job stream against its manifests."""
+    if strategy is not None and strategy not in STRATEGIES:
+        logger.error("Unknown strategy %s, use one of %s", strategy, STRATEGIES)
+        raise typer.Exit(code=1)
+    try:
+        config = load(configs)
+        arrivals: Iterable[traces.Arrival] = (
+            traces.load(trace)
+            if trace
+            else traces.poisson(
+                jobs, rate, cores, ram, storage, duration, priorities, queues, seed
+            )
+        )
+        report = Simulator(config, strategy).run(arrivals, until)
+    except (OSError, KeyError, ValueError) as error:
+        logger.error("Cannot simulate: %s", error)
+        raise typer.Exit(code=1)
+    show(report)
+    logger.info(
+        "Simulated %s events over %.0fs in %.2fs, %.0f events/s",
+        report.events,
+        report.horizon,
+        report.elapsed,
+        report.events / report.elapsed if report.elapsed else 0,
+    )
+    if output:
+        io.save_performance_to_csv(report.queues, output)
+        io.save_performance_to_csv(report.usage, io.sibling(output, ".usage.csv"))
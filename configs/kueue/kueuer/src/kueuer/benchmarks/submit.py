@@ -0,0 +1,320 @@
+"""Submit Kubernetes Jobs directly through the API server."""
+
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from kubernetes import client
+
+from kueuer.utils import kube
+from kueuer.utils.logging import logger
+
+DEFAULT_CONCURRENCY: int = 32
+DEFAULT_RETRIES: int = 5
+DEFAULT_TIMEOUT: float = 30.0
+# Status codes the API server returns when it is overloaded or restarting.
+RETRYABLE: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+
+@dataclass
+class Submission:
+    """Outcome of a single Job POST.
+
+    Attributes:
+        name (str): Name of the job.
+        status (int): Final HTTP status code, 0 if the request never completed.
+        attempts (int): Number of requests made, including retries.
+        latency (float): Seconds from the first attempt to the final response.
+        lag (float): Seconds the first attempt started after its scheduled
+            time, 0 unless replayed on a schedule.
+    """
+
+    name: str
+    status: int
+    attempts: int
+    latency: float
+    lag: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+@dataclass
+class Report:
+    """Aggregate outcome of a submission run.
+
+    Attributes:
+        elapsed (float): Wall clock seconds for the whole submission.
+        records (List[Submission]): One record per job.
+    """
+
+    elapsed: float = 0.0
+    records: List[Submission] = field(default_factory=list)
+
+    @property
+    def submitted(self) -> int:
+        return sum(1 for record in self.records if record.ok)
+
+    @property
+    def failed(self) -> int:
+        return len(self.records) - self.submitted
+
+    @property
+    def retries(self) -> int:
+        return sum(record.attempts - 1 for record in self.records)
+
+    @property
+    def throughput(self) -> float:
+        """Successfully submitted jobs per second."""
+        return self.submitted / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Flatten the report into benchmark result columns."""
+        latencies: List[float] = sorted(record.latency for record in self.records)
+        return {
+            "submission_time": self.elapsed,
+            "submission_throughput": self.throughput,
+            "submission_failures": self.failed,
+            "submission_retries": self.retries,
+            "submission_latency_p50": percentile(latencies, 0.50),
+            "submission_latency_p99": percentile(latencies, 0.99),
+        }
+
+
+class TokenBucket:
+    """Client-side rate limit of `rate` requests per second.
+
+    Tokens refill continuously up to `capacity`. Taking a token when none is
+    left reserves the next one, so callers wait in the order they came.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float): Most tokens saved up, the largest burst allowed.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens: float = capacity
+        self.updated: Optional[float] = None
+
+    def take(self, now: float) -> float:
+        """Take a token at time `now`, returning the seconds to wait for it."""
+        if self.updated is not None:
+            elapsed: float = now - self.updated
+            self.tokens = min(self.tokens + elapsed * self.rate, self.capacity)
+        self.updated = now
+        self.tokens -= 1
+        return max(-self.tokens / self.rate, 0.0)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    rank: int = max(math.ceil(q * len(values)) - 1, 0)
+    return values[rank]
+
+
+def _post(
+    api: client.ApiClient, url: str, body: bytes, timeout: float
+) -> Tuple[int, Optional[str]]:
+    """POST a serialized body once.
+
+    Returns:
+        Tuple[int, Optional[str]]: HTTP status and the Retry-After header.
+    """
+    headers: Dict[str, str] = {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    }
+    # auth_settings() refreshes expiring exec/OIDC tokens before returning them.
+    for auth in api.configuration.auth_settings().values():
+        if auth.get("in") == "header" and auth.get("value"):
+            headers[auth["key"]] = auth["value"]
+    response = api.rest_client.pool_manager.request(
+        "POST", url, body=body, headers=headers, timeout=timeout
+    )
+    if response.status >= 300:
+        logger.debug("POST %s returned %s: %s", url, response.status, response.data)
+    return response.status, response.headers.get("Retry-After")
+
+
+def _backoff(attempt: int, retry_after: Optional[str]) -> float:
+    """Exponential backoff, never shorter than the server's Retry-After."""
+    delay: float = min(2 ** (attempt - 1) * 0.1, 10.0)
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, float(retry_after))
+    return delay
+
+
+async def _create(
+    api: client.ApiClient,
+    executor: ThreadPoolExecutor,
+    url: str,
+    name: str,
+    body: bytes,
+    retries: int,
+    timeout: float,
+) -> Submission:
+    """POST a job, retrying on 429/5xx or connection errors."""
+    loop = asyncio.get_running_loop()
+    start: float = perf_counter()
+    status: int = 0
+    for attempt in range(1, retries + 2):
+        retry_after: Optional[str] = None
+        try:
+            status, retry_after = await loop.run_in_executor(
+                executor, _post, api, url, body, timeout
+            )
+        except Exception as error:
+            status = 0
+            logger.debug("POST %s failed: %s", name, error)
+        if status and status not in RETRYABLE:
+            break
+        if attempt > retries:
+            break
+        await asyncio.sleep(_backoff(attempt, retry_after))
+    if not 200 <= status < 300:
+        logger.error("Failed to create %s (status %s)", name, status)
+    return Submission(name, status, attempt, perf_counter() - start)
+
+
+def _client(concurrency: int) -> client.ApiClient:
+    if concurrency > kube.settings.pool_size:
+        # Requests beyond the pool size would open throwaway connections.
+        logger.info("Growing connection pool to %s for submission", concurrency)
+        kube.configure(pool_size=concurrency)
+    return kube.api_client()
+
+
+def _url(api: client.ApiClient, namespace: str) -> str:
+    return f"{api.configuration.host}/apis/batch/v1/namespaces/{namespace}/jobs"
+
+
+async def jobs(
+    bodies: Iterable[Tuple[str, bytes]],
+    namespace: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    retries: int = DEFAULT_RETRIES,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Report:
+    """Create Jobs concurrently through the batch/v1 API.
+
+    Args:
+        bodies (Iterable[Tuple[str, bytes]]): (name, JSON body) pairs.
+        namespace (str): Namespace to create the jobs in.
+        concurrency (int): Maximum number of requests in flight.
+        retries (int): Retries per job on 429/5xx or connection errors.
+        timeout (float): Per-request timeout in seconds.
+
+    Returns:
+        Report: Per-job latency records and aggregate throughput.
+    """
+    api = _client(concurrency)
+    url: str = _url(api, namespace)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    report = Report()
+    pending = iter(bodies)
+
+    async def worker() -> None:
+        # All workers share one iterator, so bodies are consumed lazily.
+        for name, body in pending:
+            report.records.append(
+                await _create(api, executor, url, name, body, retries, timeout)
+            )
+
+    now: float = perf_counter()
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        report.elapsed = perf_counter() - now
+        executor.shutdown(wait=False)
+    logger.info(
+        "Submitted %s jobs in %.2fs (%.2f jobs/s), %s failed, %s retries",
+        report.submitted,
+        report.elapsed,
+        report.throughput,
+        report.failed,
+        report.retries,
+    )
+    return report
+
+
+async def schedule(
+    arrivals: Iterable[Tuple[float, str, str, bytes]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    retries: int = DEFAULT_RETRIES,
+    timeout: float = DEFAULT_TIMEOUT,
+    bucket: Optional[TokenBucket] = None,
+) -> Report:
+    """Create Jobs each at its own time, e.g. to replay a trace.
+
+    Jobs are dispatched from a single loop that sleeps until the next one is
+    due, so they are not bunched up by workers waiting on responses. A job
+    is late when `concurrency` requests are already in flight or `bucket`
+    holds it back, its `lag` records by how much.
+
+    Args:
+        arrivals (Iterable[Tuple[float, str, str, bytes]]): (seconds from the
+            start, namespace, name, JSON body), earliest first.
+        concurrency (int): Maximum number of requests in flight.
+        retries (int): Retries per job on 429/5xx or connection errors.
+        timeout (float): Per-request timeout in seconds.
+        bucket (Optional[TokenBucket]): Client-side rate limit, None for none.
+
+    Returns:
+        Report: Per-job latency and lag records and aggregate throughput.
+    """
+    api = _client(concurrency)
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    slots = asyncio.Semaphore(concurrency)
+    report = Report()
+    urls: Dict[str, str] = {}
+    inflight: Set[asyncio.Task] = set()
+
+    async def create(namespace: str, name: str, body: bytes, lag: float) -> None:
+        try:
+            if namespace not in urls:
+                urls[namespace] = _url(api, namespace)
+            submission = await _create(
+                api, executor, urls[namespace], name, body, retries, timeout
+            )
+            submission.lag = lag
+            report.records.append(submission)
+        finally:
+            slots.release()
+
+    now: float = perf_counter()
+    start: float = loop.time()
+    try:
+        for offset, namespace, name, body in arrivals:
+            delay: float = start + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if bucket is not None:
+                await asyncio.sleep(bucket.take(loop.time()))
+            await slots.acquire()
+            lag: float = max(loop.time() - start - offset, 0.0)
+            task = asyncio.create_task(create(namespace, name, body, lag))
+            inflight.add(task)
+            task.add_done_callback(inflight.discard)
+        await asyncio.gather(*inflight)
+    finally:
+        report.elapsed = perf_counter() - now
+        executor.shutdown(wait=False)
+    lags: List[float] = sorted(record.lag for record in report.records)
+    logger.info(
+        "Submitted %s jobs in %.2fs, %s failed, dispatch lag p50 %.3fs p99 %.3fs",
+        report.submitted,
+        report.elapsed,
+        report.failed,
+        percentile(lags, 0.50) or 0.0,
+        percentile(lags, 0.99) or 0.0,
+    )
+    return report
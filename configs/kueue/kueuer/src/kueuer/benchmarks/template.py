@@ -0,0 +1,64 @@
+"""Compile a Job manifest once and stamp out serialized copies."""
+
+import copy
+import json
+from typing import Any, Dict, Iterator, List, Tuple
+
+from kubernetes import client
+
+# Stand-in for the job name while serializing. Kubernetes names are restricted
+# to DNS-1123 characters, so neither the marker nor real names need escaping.
+PLACEHOLDER: str = "kueuer-template-name-placeholder"
+
+
+class Template:
+    """A Job manifest serialized once and split around its name fields.
+
+    Every per-job body is produced by joining the pre-encoded JSON segments
+    with the job name, so no dict mutation or serialization happens per job.
+
+    Args:
+        data (Dict[str, Any]): K8s job manifest, e.g. as built by `k8s.manifest`.
+    """
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        manifest: Dict[str, Any] = copy.deepcopy(data)
+        manifest.setdefault("metadata", {})["name"] = PLACEHOLDER
+        podtemplate: Dict[str, Any] = manifest["spec"]["template"]
+        if podtemplate.get("metadata", {}).get("name"):
+            podtemplate["metadata"]["name"] = PLACEHOLDER
+        for container in podtemplate["spec"]["containers"]:
+            container["name"] = PLACEHOLDER
+        encoded: bytes = json.dumps(manifest, separators=(",", ":")).encode()
+        self.segments: List[bytes] = encoded.split(PLACEHOLDER.encode())
+
+    @classmethod
+    def from_job(cls, job: client.V1Job) -> "Template":
+        """Compile a template from a kubernetes client model.
+
+        Args:
+            job (client.V1Job): Job model, e.g. `experimental.native.Job().job()`.
+
+        Returns:
+            Template: Compiled template.
+        """
+        data: Dict[str, Any] = client.ApiClient().sanitize_for_serialization(job)
+        return cls(data)
+
+    def render(self, name: str) -> bytes:
+        """Serialized Job body for the given name."""
+        return name.encode().join(self.segments)
+
+    def bodies(
+        self, prefix: str, count: int, start: int = 0
+    ) -> Iterator[Tuple[str, bytes]]:
+        """Yield (name, body) pairs for `{prefix}-{start}` onwards.
+
+        Args:
+            prefix (str): Prefix for the job names.
+            count (int): Number of bodies to generate.
+            start (int): Index of the first job. Defaults to 0.
+        """
+        for num in range(start, start + count):
+            name: str = f"{prefix}-{num}"
+            yield name, self.render(name)
@@ -0,0 +1,227 @@
+"""Job arrival traces: when each job is submitted and what it asks for.
+
+A trace is a CSV file with one job per row, e.g.:
+
+    submit,cores,ram,storage,duration,priority,queue
+    0.0,1,4,10,600,high,skaha-workload/skaha-local-queue
+    2.5,8,32,100,3600,low,skaha-workload/skaha-local-queue
+
+`submit` is in seconds from the start of the trace, `ram` and `storage` in GB
+and `duration` in seconds. Only `submit` is required, the other columns
+default to the values of `Arrival`.
+
+Traces can also be taken from recorded Kueue Workload watch events, e.g. of
+`kr events record --kind workloads`, see `workloads`.
+"""
+
+import csv
+import json
+import random
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from kubernetes.utils.quantity import parse_quantity
+
+
+@dataclass(frozen=True)
+class Arrival:
+    """A job of a trace.
+
+    Attributes:
+        submit (float): Seconds from the start of the trace to the submission.
+        cores (float): CPU cores.
+        ram (float): RAM in GB.
+        storage (float): Ephemeral storage in GB.
+        duration (float): Seconds the job runs once started.
+        priority (Optional[str]): Kueue WorkloadPriorityClass.
+        queue (Optional[str]): Kueue LocalQueue, as `namespace/name` or `name`.
+    """
+
+    submit: float
+    cores: float = 1.0
+    ram: float = 1.0
+    storage: float = 1.0
+    duration: float = 60.0
+    priority: Optional[str] = None
+    queue: Optional[str] = None
+
+
+COLUMNS: Tuple[str, ...] = tuple(item.name for item in fields(Arrival))
+NUMERIC: Tuple[str, ...] = ("submit", "cores", "ram", "storage", "duration")
+
+
+def _arrival(row: Dict[str, Any]) -> Arrival:
+    if not row.get("submit"):
+        raise ValueError(f"Trace row without a submit time: {row}")
+    values: Dict[str, Any] = {}
+    for name in COLUMNS:
+        value = row.get(name)
+        if value is None or value == "":
+            continue
+        values[name] = float(value) if name in NUMERIC else value
+    return Arrival(**values)
+
+
+def read(filepath: str) -> List[Arrival]:
+    """Read a trace, ordered by submission.
+
+    Args:
+        filepath (str): CSV file with a `submit` column, see the module.
+
+    Raises:
+        ValueError: If a row has no submit time or a column is not a number.
+
+    Returns:
+        List[Arrival]: Jobs of the trace, earliest first.
+    """
+    with open(filepath, newline="", encoding="utf-8") as f:
+        arrivals = [_arrival(row) for row in csv.DictReader(f)]
+    return sorted(arrivals, key=lambda arrival: arrival.submit)
+
+
+def _seconds(args: List[str]) -> Optional[float]:
+    """The stress-ng `--timeout` of container arguments, if any."""
+    if "--timeout" in args[:-1]:
+        return float(args[args.index("--timeout") + 1].rstrip("s"))
+    return None
+
+
+def _condition(workload: Dict[str, Any], kind: str) -> Optional[datetime]:
+    for condition in (workload.get("status") or {}).get("conditions") or []:
+        if condition.get("type") == kind and condition.get("status") == "True":
+            return datetime.fromisoformat(condition["lastTransitionTime"])
+    return None
+
+
+def _workload(workload: Dict[str, Any], start: datetime) -> Arrival:
+    """Job of a Workload, its duration from its stress-ng arguments, else from
+    its admission to its completion."""
+    metadata: Dict[str, Any] = workload["metadata"]
+    spec: Dict[str, Any] = workload.get("spec") or {}
+    totals: Dict[str, float] = dict.fromkeys(("cpu", "memory", "ephemeral-storage"), 0)
+    seconds: Optional[float] = None
+    for podset in spec.get("podSets") or []:
+        containers = podset["template"]["spec"].get("containers") or []
+        for container in containers:
+            requests = (container.get("resources") or {}).get("requests") or {}
+            for name in totals:
+                if name in requests:
+                    value = float(parse_quantity(str(requests[name])))
+                    totals[name] += value * podset.get("count", 1)
+            seconds = seconds or _seconds(
+                [str(arg) for arg in container.get("args") or []]
+            )
+    admitted = _condition(workload, "Admitted")
+    finished = _condition(workload, "Finished")
+    if seconds is None and admitted and finished:
+        seconds = (finished - admitted).total_seconds()
+    created = datetime.fromisoformat(metadata["creationTimestamp"])
+    queue: Optional[str] = spec.get("queueName")
+    gb: float = 1024.0**3
+    return Arrival(
+        submit=(created - start).total_seconds(),
+        cores=totals["cpu"],
+        ram=totals["memory"] / gb,
+        storage=totals["ephemeral-storage"] / gb,
+        duration=Arrival.duration if seconds is None else seconds,
+        priority=spec.get("priorityClassName"),
+        queue=f"{metadata.get('namespace', 'default')}/{queue}" if queue else None,
+    )
+
+
+def workloads(filepath: str) -> List[Arrival]:
+    """Read a trace from recorded Workload watch events, one JSON per line.
+
+    Every workload counts once, with the last revision recorded. Its submit
+    time is its creation, relative to the earliest one.
+
+    Args:
+        filepath (str): Watch events, or bare Workload objects, one per line.
+
+    Returns:
+        List[Arrival]: Jobs of the workloads, earliest first.
+    """
+    latest: Dict[str, Dict[str, Any]] = {}
+    with open(filepath, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            event: Dict[str, Any] = json.loads(line)
+            workload: Dict[str, Any] = event.get("object", event)
+            if workload.get("kind") != "Workload":
+                continue
+            metadata: Dict[str, Any] = workload["metadata"]
+            latest[metadata.get("uid") or metadata["name"]] = workload
+    if not latest:
+        return []
+    start: datetime = min(
+        datetime.fromisoformat(workload["metadata"]["creationTimestamp"])
+        for workload in latest.values()
+    )
+    arrivals = [_workload(workload, start) for workload in latest.values()]
+    return sorted(arrivals, key=lambda arrival: arrival.submit)
+
+
+def load(filepath: str) -> List[Arrival]:
+    """Read a CSV trace, or recorded Workload events from a `.jsonl` file."""
+    if filepath.endswith((".jsonl", ".json")):
+        return workloads(filepath)
+    return read(filepath)
+
+
+def write(arrivals: Iterable[Arrival], filepath: str) -> int:
+    """Write a trace, returning the number of jobs written."""
+    count: int = 0
+    with open(filepath, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(COLUMNS))
+        writer.writeheader()
+        for arrival in arrivals:
+            writer.writerow(asdict(arrival))
+            count += 1
+    return count
+
+
+def poisson(
+    count: int,
+    rate: float,
+    cores: float = 1.0,
+    ram: float = 1.0,
+    storage: float = 1.0,
+    duration: float = 60.0,
+    priorities: Sequence[Optional[str]] = (None,),
+    queues: Sequence[Optional[str]] = (None,),
+    seed: Optional[int] = None,
+) -> Iterator[Arrival]:
+    """Identical jobs submitted as a Poisson process.
+
+    Args:
+        count (int): Number of jobs.
+        rate (float): Mean submissions per second, 0 to submit all at once.
+        cores (float): CPU cores per job.
+        ram (float): RAM per job in GB.
+        storage (float): Ephemeral storage per job in GB.
+        duration (float): Seconds each job runs.
+        priorities (Sequence[Optional[str]]): Priority classes, one drawn at
+            random for each job.
+        queues (Sequence[Optional[str]]): LocalQueues, one drawn at random for
+            each job.
+        seed (Optional[int]): Seed of the random draws.
+
+    Yields:
+        Arrival: Jobs, earliest first.
+    """
+    rng = random.Random(seed)
+    submit: float = 0.0
+    for _ in range(count):
+        yield Arrival(
+            submit=submit,
+            cores=cores,
+            ram=ram,
+            storage=storage,
+            duration=duration,
+            priority=rng.choice(priorities),
+            queue=rng.choice(queues),
+        )
+        if rate > 0:
+            submit += rng.expovariate(rate)
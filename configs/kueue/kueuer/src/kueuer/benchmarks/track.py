@@ -1,15 +1,23 @@
 """Track the status of Kubernetes Objects."""
 
-import statistics
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import logfire
-from kubernetes import client, config, watch
+from kubernetes import client
+
+from kueuer.benchmarks import RUN_ID_LABEL
+from kueuer.utils import kube, stats
 
 # Type alias for job tracking: (creation_time, completion_time, duration_in_seconds)
 JobTiming = Tuple[datetime, Optional[datetime], Optional[float]]
 
+# Seconds between live reports of the job durations while tracking.
+REPORT_INTERVAL: float = 10.0
+
 logfire.configure(send_to_logfire=False)
 
 
@@ -30,120 +38,421 @@ def status(job: client.V1Job, state: str) -> bool:
     return False
 
 
+class Statistics:
+    """Streaming statistics of job timings.
+
+    Timings are folded in one at a time, so memory and the cost of reading
+    the statistics do not grow with the number of jobs. Percentiles come from
+    a mergeable quantile sketch and are accurate to within 1%, and statistics
+    of several namespaces or repeated runs can be merged.
+    """
+
+    def __init__(self) -> None:
+        self.durations = stats.Stream()
+        self.first_creation: Optional[datetime] = None
+        self.last_creation: Optional[datetime] = None
+        self.first_completion: Optional[datetime] = None
+        self.last_completion: Optional[datetime] = None
+
+    def add(
+        self,
+        creation: Optional[datetime],
+        completion: Optional[datetime],
+        duration: Optional[float],
+    ) -> None:
+        if creation is not None:
+            self._creation(creation, creation)
+        if completion is not None:
+            self._completion(completion, completion)
+        if duration is not None:
+            self.durations.add(duration)
+
+    def merge(self, other: "Statistics") -> None:
+        """Add the timings of another run or namespace."""
+        if other.first_creation and other.last_creation:
+            self._creation(other.first_creation, other.last_creation)
+        if other.first_completion and other.last_completion:
+            self._completion(other.first_completion, other.last_completion)
+        self.durations.merge(other.durations)
+
+    def _creation(self, first: datetime, last: datetime) -> None:
+        if self.first_creation is None or first < self.first_creation:
+            self.first_creation = first
+        if self.last_creation is None or last > self.last_creation:
+            self.last_creation = last
+
+    def _completion(self, first: datetime, last: datetime) -> None:
+        if self.first_completion is None or first < self.first_completion:
+            self.first_completion = first
+        if self.last_completion is None or last > self.last_completion:
+            self.last_completion = last
+
+    def progress(self) -> str:
+        """One line summary of the durations so far, for live reporting."""
+        summary = self.durations.summary()
+        return f"{self.durations.count} jobs, " + ", ".join(
+            f"{key} {value:.1f}s"
+            for key, value in summary.items()
+            if key not in ("mean", "stddev") and value is not None
+        )
+
+    def result(self) -> Dict[str, Any]:
+        """Statistics as returned by `compute_statistics`, empty without timings."""
+        if (
+            self.first_creation is None
+            or self.last_completion is None
+            or not self.durations.count
+        ):
+            return {}
+        durations = self.durations
+        return {
+            "first_creation_time": self.first_creation,
+            "last_creation_time": self.last_creation,
+            "first_completion_time": self.first_completion,
+            "last_completion_time": self.last_completion,
+            "avg_time_from_creation_completion": durations.mean,
+            "total_time_from_first_creation_to_last_completion": (
+                self.last_completion - self.first_creation
+            ).total_seconds(),
+            "median_time_from_creation_completion": durations.quantile(0.50),
+            "std_dev_time_from_creation_completion": durations.stddev,
+            "p90_time_from_creation_completion": durations.quantile(0.90),
+            "p95_time_from_creation_completion": durations.quantile(0.95),
+            "p99_time_from_creation_completion": durations.quantile(0.99),
+            "max_time_from_creation_completion": durations.max,
+        }
+
+
 def compute_statistics(data: Dict[str, JobTiming]) -> Dict[str, Any]:
     """Compute Job Statistics"""
-    creations: List[datetime] = [
-        data[0] for data in data.values() if data[0] is not None
-    ]
-    completions: List[datetime] = [
-        data[1] for data in data.values() if data[1] is not None
-    ]
-    durations: List[float] = [data[2] for data in data.values() if data[2] is not None]
-
-    if not creations or not completions or not durations:
-        return {}
-
-    first_creation_time: datetime = min(creations)
-    last_creation_time: datetime = max(creations)
-    first_completion_time: datetime = min(completions)
-    last_completion_time: datetime = max(completions)
-    avg_duration: float = statistics.mean(durations)
-    total_duration: float = (last_completion_time - first_creation_time).total_seconds()
-    median_duration: float = statistics.median(durations)
-    stddev_duration: float = statistics.stdev(durations) if len(durations) > 1 else 0.0
-
-    stats: Dict[str, Any] = {
-        "first_creation_time": first_creation_time,
-        "last_creation_time": last_creation_time,
-        "first_completion_time": first_completion_time,
-        "last_completion_time": last_completion_time,
-        "avg_time_from_creation_completion": avg_duration,
-        "total_time_from_first_creation_to_last_completion": total_duration,
-        "median_time_from_creation_completion": median_duration,
-        "std_dev_time_from_creation_completion": stddev_duration,
-    }
-    return stats
+    statistics = Statistics()
+    for creation, completion, duration in data.values():
+        statistics.add(creation, completion, duration)
+    return statistics.result()
+
+
+def _workload(workloads: Dict[str, Dict[str, Any]], data: Dict[str, Any]) -> str:
+    """Record the conditions of a Kueue workload revision.
+
+    Args:
+        workloads (Dict[str, Dict[str, Any]]): Workload information by UID.
+        data (Dict[str, Any]): Workload object.
+
+    Returns:
+        str: UID of the workload.
+    """
+    uid: str = str(data["metadata"]["uid"])
+    for condition in data.get("status", {}).get("conditions", []):
+        if condition["type"] == "Admitted" and condition["status"] == "True":
+            name: str = str(data["metadata"]["name"])
+            priority: str = str(data["spec"]["priority"])
+            workloads[uid] = {
+                "name": name,
+                "priority": int(priority),
+                "admitted_at": datetime.now(),
+                "finished_at": None,
+                "requeues": 0,
+                "preemptors": [],
+            }
+            logfire.info(f"{name} admitted with priority {priority}")
+
+        if uid not in workloads:
+            # Seen before its admission, e.g. when resuming from a relist.
+            continue
+
+        if condition["type"] == "Evicted" and condition["status"] == "True":
+            preemptor: str = (
+                condition.get("message", "").split("UID: ")[1].split(")")[0].strip()
+            )
+            details: Tuple[str, datetime] = (preemptor, datetime.now())
+            if details[0] not in [
+                preemptor[0] for preemptor in workloads[uid]["preemptors"]
+            ]:
+                workloads[uid]["preemptors"].append(details)
+                logfire.info(
+                    f"{workloads.get(uid, {}).get('name')} evicted by {preemptor}"
+                )
+
+        elif condition["type"] == "Finished" and condition["status"] == "True":
+            if workloads[uid]["finished_at"] is None:
+                workloads[uid]["finished_at"] = datetime.now()
+                logfire.info(f"{workloads.get(uid, {}).get('name')} succeeded.")
+
+        elif condition["type"] == "Requeued" and condition["status"] == "True":
+            workloads[uid]["requeues"] += 1
+            logfire.info(f"{workloads.get(uid, {}).get('name')} requeued.")
+    return uid
 
 
 def evictions(
     namespace: str,
     revision: str,
+    timeout: Optional[float] = None,
 ):
     """Track the status of Kubernetes workloads.
 
     Args:
         namespace (str): Namespace of the workloads.
         revision (str): K8s resource version to start tracking from.
+        timeout (Optional[float]): Seconds to track before giving up. Defaults to
+            None, tracking until every admitted workload finished.
 
     Returns:
         Dict[str, Dict[str, Any]]: Workload information.
     """
-    config.load_kube_config()
-    crd: client.CustomObjectsApi = client.CustomObjectsApi()
-    watcher = watch.Watch()
+    crd: client.CustomObjectsApi = kube.custom()
     workloads: Dict[str, Dict[str, Any]] = {}
-    completed: int = 0
+    # Revisions and relists repeat conditions, so count each workload once.
+    completed: Set[str] = set()
     logfire.info(f"Tracking evictions in namespace '{namespace}'")
-    for event in watcher.stream(  # type: ignore
+    for kind, data in kube.informer(
         crd.list_namespaced_custom_object,  # type: ignore
         group="kueue.x-k8s.io",
         version="v1beta1",
         namespace=namespace,
         plural="workloads",
         resource_version=revision,
-        timeout_seconds=600,
+        timeout=timeout,
     ):
-        logfire.debug(f"K8s Event: {event['type']}")
-        data: Dict[str, Any] = event["object"]
-        uid: str = str(data["metadata"]["uid"])
-
-        for condition in data.get("status", {}).get("conditions", []):
-            if condition["type"] == "Admitted" and condition["status"] == "True":
-                name: str = str(data["metadata"]["name"])
-                priority: str = str(data["spec"]["priority"])
-                workloads[uid] = {
-                    "name": name,
-                    "priority": int(priority),
-                    "admitted_at": datetime.now(),
-                    "finished_at": None,
-                    "requeues": 0,
-                    "preemptors": [],
-                }
-                logfire.info(f"{name} admitted with priority {priority}")
-
-            if condition["type"] == "Evicted" and condition["status"] == "True":
-                preemptor: str = (
-                    condition.get("message", "").split("UID: ")[1].split(")")[0].strip()
-                )
-                details: Tuple[str, datetime] = (preemptor, datetime.now())
-                if details[0] not in [
-                    preemptor[0] for preemptor in workloads[uid]["preemptors"]
-                ]:
-                    workloads[uid]["preemptors"].append(details)
-                    logfire.info(
-                        f"{workloads.get(uid, {}).get('name')} evicted by {preemptor}"
-                    )
+        logfire.debug(f"K8s Event: {kind}")
+        revisions: List[Dict[str, Any]] = data if kind == kube.SYNC else [data]
+        for item in revisions:
+            uid: str = _workload(workloads, item)
+            if workloads.get(uid, {}).get("finished_at"):
+                completed.add(uid)
+
+        if workloads and len(completed) == len(workloads):
+            logfire.info("All workloads finished.")
+            break
 
-            elif condition["type"] == "Finished" and condition["status"] == "True":
-                workloads[uid]["finished_at"] = datetime.now()
-                completed += 1
-                logfire.info(f"{workloads.get(uid, {}).get('name')} succeeded.")
+    return workloads
 
-            elif condition["type"] == "Requeued" and condition["status"] == "True":
-                workloads[uid]["requeues"] += 1
-                logfire.info(f"{workloads.get(uid, {}).get('name')} requeued.")
 
-        if workloads and completed == len(workloads):
-            logfire.info("All workloads finished.")
-            watcher.stop()
+def timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an RFC 3339 timestamp from a raw API object."""
+    return datetime.fromisoformat(value) if value else None
 
-    return workloads
+
+@dataclass
+class JobRevision:
+    """The fields of a Job revision the tracker reads.
+
+    Attributes:
+        name (str): Name of the job.
+        resource_version (Optional[str]): Resource version of the revision.
+        creation (Optional[datetime]): Creation timestamp of the job.
+        completion (Optional[datetime]): Completion time of the job, if any.
+        conditions (Dict[str, Tuple[Optional[datetime], Optional[str]]]): Last
+            transition time and reason of every True condition, by type.
+    """
+
+    name: str
+    resource_version: Optional[str] = None
+    creation: Optional[datetime] = None
+    completion: Optional[datetime] = None
+    conditions: Dict[str, Tuple[Optional[datetime], Optional[str]]] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def from_raw(cls, data: Dict[str, Any]) -> "JobRevision":
+        """Read a revision from the JSON of a Job, without building a model.
+
+        Args:
+            data (Dict[str, Any]): Job object as decoded from the API response.
+
+        Returns:
+            JobRevision: Revision of the job.
+        """
+        metadata: Dict[str, Any] = data["metadata"]
+        status: Dict[str, Any] = data.get("status") or {}
+        return cls(
+            name=metadata["name"],
+            resource_version=metadata.get("resourceVersion"),
+            creation=timestamp(metadata.get("creationTimestamp")),
+            completion=timestamp(status.get("completionTime")),
+            conditions={
+                item["type"]: (
+                    timestamp(item.get("lastTransitionTime")),
+                    item.get("reason"),
+                )
+                for item in status.get("conditions") or []
+                if item.get("status") == "True"
+            },
+        )
+
+    @classmethod
+    def from_model(cls, job: client.V1Job) -> "JobRevision":
+        """Read a revision from a kubernetes client model.
+
+        Args:
+            job (client.V1Job): Job model.
+
+        Returns:
+            JobRevision: Revision of the job.
+        """
+        return cls(
+            name=job.metadata.name,
+            resource_version=job.metadata.resource_version,
+            creation=job.metadata.creation_timestamp,
+            completion=job.status.completion_time if job.status else None,
+            conditions={
+                item.type: (item.last_transition_time, item.reason)
+                for item in (job.status.conditions if job.status else None) or []
+                if item.status == "True"
+            },
+        )
+
+
+class JobTracker:
+    """Incremental state of the jobs of a run.
+
+    Every update is O(1): jobs move between per-state sets and the running
+    aggregates are updated in place, so tracking cost does not grow with the
+    number of jobs. Updates are serialized by a lock, so jobs can be tracked
+    or abandoned from another thread while events are applied.
+
+    Args:
+        prefix (str): Prefix of the job.metadata.name.
+        to_state (str): Desired state of the jobs. Defaults to "Complete".
+    """
+
+    def __init__(self, prefix: str, to_state: str = "Complete") -> None:
+        self.prefix = prefix
+        self.to_state = to_state
+        self.pending: Set[str] = set()
+        self.failed: Set[str] = set()
+        self.lost: Set[str] = set()
+        # Pending jobs that were seen on the server at least once.
+        self.seen: Set[str] = set()
+        self.done: Dict[str, JobTiming] = {}
+        self.events: int = 0
+        self.statistics = Statistics()
+        # Seconds between the server-side transition and its processing here.
+        self.lag_total: float = 0.0
+        self.lag_max: float = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return not self.pending
+
+    def track(self, name: str) -> None:
+        """Start waiting for a job, unless it already reached a final state."""
+        with self._lock:
+            final = name in self.done or name in self.failed or name in self.lost
+            if not final:
+                self.pending.add(name)
+
+    def remove(self, name: str) -> None:
+        """Stop waiting for a job that was deleted before reaching a final state."""
+        with self._lock:
+            if name in self.pending:
+                self.pending.discard(name)
+                self.seen.discard(name)
+                self.lost.add(name)
+                logfire.warning(f"{name} was deleted before reaching {self.to_state}")
+
+    def abandon(self, names: Iterable[str]) -> None:
+        """Stop waiting for jobs that could not be created."""
+        with self._lock:
+            for name in names:
+                if name in self.pending and name not in self.seen:
+                    self.pending.discard(name)
+                    self.lost.add(name)
+
+    def reconcile(self, listed: List[JobRevision]) -> None:
+        """Bring the tracker in line with a full list of the jobs.
+
+        Args:
+            listed (List[JobRevision]): Every job currently on the server.
+        """
+        names: Set[str] = set()
+        for job in listed:
+            names.add(job.name)
+            self.update(job)
+        # Jobs tracked ahead of their creation are not missing from the list.
+        for name in (self.pending & self.seen) - names:
+            self.remove(name)
+
+    def update(self, job: JobRevision) -> bool:
+        """Apply a job revision.
+
+        Args:
+            job (JobRevision): Latest revision of a tracked job.
+
+        Returns:
+            bool: True if the job left the pending set.
+        """
+        with self._lock:
+            return self._apply(job)
+
+    def _apply(self, job: JobRevision) -> bool:
+        self.events += 1
+        name: str = job.name
+        if name not in self.pending:
+            return False
+        self.seen.add(name)
+        reached = job.conditions.get(self.to_state)
+        if reached and job.creation:
+            transition: Optional[datetime] = reached[0]
+            completion: Optional[datetime] = job.completion or transition
+            if completion:
+                self._complete(name, job.creation, completion)
+                self._lag(transition or completion)
+                return True
+        failed = job.conditions.get("Failed")
+        if failed:
+            self.pending.discard(name)
+            self.seen.discard(name)
+            self.failed.add(name)
+            logfire.warning(f"{name} failed: {failed[1]}")
+            self._lag(failed[0])
+            return True
+        return False
+
+    def _complete(self, name: str, creation: datetime, completion: datetime) -> None:
+        duration: float = (completion - creation).total_seconds()
+        self.pending.discard(name)
+        self.seen.discard(name)
+        self.done[name] = (creation, completion, duration)
+        self.statistics.add(creation, completion, duration)
+        logfire.info(f"{name} reached state {self.to_state} in {duration:.2f} seconds.")
+
+    def _lag(self, transition: Optional[datetime]) -> None:
+        if transition is None:
+            return
+        lag: float = (datetime.now(timezone.utc) - transition).total_seconds()
+        self.lag_total += lag
+        self.lag_max = max(self.lag_max, lag)
+
+    def summary(self) -> Dict[str, Any]:
+        """Tracker self-check, to show it kept up with the event stream.
+
+        The lag compares the server-side transition time with the local clock,
+        so it includes any clock skew between this machine and the API server.
+        Timestamps have a resolution of one second.
+        """
+        observed: int = len(self.done) + len(self.failed)
+        return {
+            "tracker_events": self.events,
+            "tracker_failed": len(self.failed),
+            "tracker_lost": len(self.lost),
+            "tracker_lag_avg": self.lag_total / observed if observed else None,
+            "tracker_lag_max": self.lag_max if observed else None,
+        }
 
 
 def jobs(  # noqa: C901
     namespace: str,
     prefix: str,
     to_state: str = "Complete",
+    run_id: Optional[str] = None,
+    tracker: Optional[JobTracker] = None,
+    timeout: Optional[float] = None,
+    expected: Optional[Iterable[str]] = None,
+    ready: Optional[threading.Event] = None,
+    stop: Optional[threading.Event] = None,
 ) -> Dict[str, JobTiming]:
     """Track the status of Kubernetes Jobs.
 
@@ -151,81 +460,86 @@ def jobs(  # noqa: C901
         namespace (str): Namespace of the jobs.
         prefix (str): Prefix of the job.metadata.name.
         to_state (str): Desired state of the job. Defaults to "Complete".
+        run_id (Optional[str]): Run-id label of the jobs. When given, the API
+            server only returns jobs of this run.
+        tracker (Optional[JobTracker]): Tracker to update, pass one in to read
+            its aggregates and self-check afterwards.
+        timeout (Optional[float]): Seconds to track before giving up. Defaults to
+            None, tracking until every job reached a final state.
+        expected (Optional[Iterable[str]]): Names of jobs to wait for even if
+            they do not exist yet, to start tracking before submission.
+        ready (Optional[threading.Event]): Set once the jobs are listed and
+            every later change will be seen by the watch.
+        stop (Optional[threading.Event]): Stop tracking when set.
 
     Returns:
         Dict[str, JobTiming]: Dictionary of completed jobs. Where JobTiming is a tuple
             (creation_time, completion_time, duration_in_seconds).
     """
-    config.load_kube_config()
-    batch_v1: client.BatchV1Api = client.BatchV1Api()
-    watcher = watch.Watch()
+    batch_v1: client.BatchV1Api = kube.batch()
+    tracker = tracker or JobTracker(prefix, to_state)
 
     logfire.info(f"Tracking jobs with prefix '{prefix}' in namespace '{namespace}'")
 
-    pending: Dict[str, bool] = {}
-    done: Dict[str, JobTiming] = {}
-    data = batch_v1.list_namespaced_job(namespace)
-    version: str = data.metadata.resource_version
-
-    for item in data.items:
-        if item.metadata.name.startswith(prefix):
-            pending[item.metadata.name] = True
-
-    if not pending:
-        logfire.info(f"No jobs found with prefix '{prefix}' in namespace '{namespace}'")
-        logfire.info("Exiting...")
-        return done
-
-    # There is an edge case, where jobs can finish even before we start tracking them.
-    # So, we need to check if any of the jobs are already in the desired state.
-    for item in data.items:
-        if item.metadata.name in pending and status(item, to_state):
-            completion: datetime = item.status.completion_time
-            creation: datetime = item.metadata.creation_timestamp
-            duration: float = (completion - creation).total_seconds()
-            msg = f"{item.metadata.name} reached {to_state} in {duration:.2f} seconds."
-            logfire.info(msg)
-            done[item.metadata.name] = (creation, completion, duration)
-            pending[item.metadata.name] = False
-
-    logfire.info(f"{len(pending)} jobs need to be tracked.")
-    logfire.info(f"Starting to track jobs to state {to_state}...")
-
-    while any(pending.values()):
-        start = datetime.now()
-        for event in watcher.stream(
-            batch_v1.list_namespaced_job,
-            namespace=namespace,
-            resource_version=version,
-            timeout_seconds=600,
-        ):
-            logfire.debug(f"K8s Event: {event['type']}")
-            logfire.debug(f"Revision: {event['object']}")
-            item: client.V1Job = event["object"]
-            version = item.metadata.resource_version
-            name: str = item.metadata.name
-
-            if name not in pending:
-                continue
-
-            if status(item, to_state):
-                completion: datetime = item.status.completion_time
-                creation: datetime = item.metadata.creation_timestamp
-                duration: float = (completion - creation).total_seconds()
-                msg = f"{name} reached state {to_state} in {duration:.2f} seconds."
-                logfire.info(msg)
-                done[name] = (creation, completion, duration)
-                pending[name] = False
-
-            logfire.debug(f"Pending Jobs Left: {sum(pending.values())}")
-
-            if sum(pending.values()) == 0:
-                logfire.info(f"All jobs with prefix {prefix} reached state {to_state}")
-                watcher.stop()
-                break
-
-            if (datetime.now() - start).seconds > 600:
-                logfire.info("Timeout reached. Exiting...")
-                watcher.stop()
-                break
-    return done
+    for name in expected or []:
+        tracker.track(name)
+
+    selector: Optional[str] = f"{RUN_ID_LABEL}={run_id}" if run_id else None
+    listed: bool = False
+    reported: float = monotonic()
+    # Events are read as plain JSON; building V1Job models for each of them
+    # costs far more than the few fields the tracker needs.
+    for kind, item in kube.informer(
+        batch_v1.list_namespaced_job,
+        namespace,
+        label_selector=selector,
+        timeout=timeout,
+        raw=True,
+        stop=stop,
+    ):
+        if kind == kube.SYNC:
+            # The first list finds the jobs, later ones recover from a 410 Gone.
+            # Either way, jobs can finish before the watch sees them.
+            revisions: List[JobRevision] = [JobRevision.from_raw(job) for job in item]
+            logfire.debug(f"Listed {len(revisions)} jobs")
+            if not listed:
+                for job in revisions:
+                    if job.name.startswith(prefix):
+                        tracker.track(job.name)
+                if tracker.finished:
+                    logfire.info(
+                        f"No jobs found with prefix '{prefix}' "
+                        f"in namespace '{namespace}'"
+                    )
+                    logfire.info("Exiting...")
+                    break
+            tracker.reconcile(revisions)
+            if not listed:
+                logfire.info(f"{len(tracker.pending)} jobs need to be tracked.")
+                logfire.info(f"Starting to track jobs to state {to_state}...")
+                listed = True
+                if ready is not None:
+                    ready.set()
+        elif kind == "DELETED":
+            tracker.remove(item["metadata"]["name"])
+        elif tracker.update(JobRevision.from_raw(item)):
+            if monotonic() - reported >= REPORT_INTERVAL:
+                reported = monotonic()
+                logfire.info(
+                    f"{len(tracker.pending)} jobs pending, "
+                    f"{tracker.statistics.progress()}"
+                )
+
+        if tracker.finished:
+            logfire.info(f"All jobs with prefix {prefix} reached state {to_state}")
+            break
+    else:
+        reason: str = "Stopped" if stop is not None and stop.is_set() else "Timeout"
+        logfire.info(f"{reason}, {len(tracker.pending)} jobs still pending.")
+
+    summary = tracker.summary()
+    logfire.info(
+        f"Tracker processed {summary['tracker_events']} events, "
+        f"lag avg {summary['tracker_lag_avg']}s, max {summary['tracker_lag_max']}s"
+    )
+    return tracker.done
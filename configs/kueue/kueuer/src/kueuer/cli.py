@@ -1,13 +1,47 @@
 import typer
 
-from kueuer.benchmarks import benchmark, k8s, plot
+from kueuer.benchmarks import benchmark, compare, events, fake, k8s, plot, simulate
 from kueuer.resources import app as resources_app
+from kueuer.utils import kube
 
 app = typer.Typer()
 app.add_typer(benchmark.benchmark_cli, name="benchmark")
 app.add_typer(k8s.app, name="jobs")
+app.add_typer(events.app, name="events")
 app.add_typer(plot.app, name="plot")
 app.add_typer(resources_app, name="cluster")
+app.add_typer(fake.app, name="fake")
+app.command("compare")(compare.compare)
+app.command("simulate")(simulate.simulate)
+
+
+@app.callback()
+def main(
+    pool_size: int = (
+        typer.Option(
+            kube.DEFAULT_POOL_SIZE,
+            "--pool-size",
+            help="Connections kept open to the Kubernetes API server.",
+        )
+    ),
+    qps: float = (
+        typer.Option(
+            0.0,
+            "--qps",
+            help="Client-side Kubernetes API requests per second, 0 for unlimited.",
+        )
+    ),
+    burst: int = (
+        typer.Option(
+            0,
+            "--burst",
+            help="Requests allowed above --qps before throttling, defaults to 2x qps.",
+        )
+    ),
+) -> None:
+    """Kueue benchmarking toolkit."""
+    kube.configure(pool_size=pool_size, qps=qps, burst=burst)
+
 
 if __name__ == "__main__":
     app()
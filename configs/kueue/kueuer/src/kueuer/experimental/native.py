@@ -1,6 +1,7 @@
 from typing import Optional
 
 from kubernetes.client import (
+    V1Affinity,
     V1Capabilities,
     V1Container,
     V1EmptyDirVolumeSource,
@@ -67,7 +68,7 @@ class Job(BaseModel):
             name=self.name,
             image=self.image,
             image_pull_policy="IfNotPresent",
-            command=[self.command],
+            command=self.command,
             args=self.args,
             resources=self.resources(),
             security_context=V1SecurityContext(
@@ -113,7 +114,7 @@ class Job(BaseModel):
         return V1PodSpec(
             containers=[self.container()],
             restart_policy="Never",
-            affinity=self.affinity(),
+            affinity=V1Affinity(node_affinity=self.affinity()),
             security_context=V1PodSecurityContext(
                 run_as_user=99999,
                 run_as_group=99999,
@@ -30,13 +30,14 @@ from decimal import Decimal, getcontext
 from typing import Annotated, Dict, Iterable, List, Optional, Sequence
 
 import typer
-from kubernetes import client, config
 from kubernetes.client import CoreV1Api, V1Node
 from kubernetes.utils.quantity import parse_quantity
 from pydantic import BaseModel, Field, RootModel, ValidationError, field_validator
 from rich.console import Console
 from typing_extensions import Literal
 
+from kueuer.utils import kube
+
 # High precision for CPU arithmetic (Decimal) and for stringifying without loss
 getcontext().prec = 50
 
@@ -65,6 +66,9 @@ class Settings(BaseModel):
         default=None, description="Regex patterns for node names."
     )
     field: Literal["capacity", "allocatable"] = "capacity"
+    selector: Optional[str] = Field(
+        default=None, description="Label selector for nodes, applied server-side."
+    )
     pretty: bool = False
 
     @field_validator("patterns")
@@ -95,17 +99,6 @@ class TotalsAcc:
 # =========================
 
 
-def _load_kube() -> CoreV1Api:
-    """
-    Try standard kubeconfig first, then fall back to in-cluster config.
-    """
-    try:
-        config.load_kube_config()
-    except Exception:
-        config.load_incluster_config()
-    return client.CoreV1Api()
-
-
 def _compile_patterns(patterns: Optional[Sequence[str]]) -> Optional[List[re.Pattern]]:
     if not patterns:
         return None
@@ -118,9 +111,12 @@ def _node_matches(name: str, compiled: Optional[List[re.Pattern]]) -> bool:
     return any(p.search(name) for p in compiled)
 
 
-def _collect_nodes(v1: CoreV1Api, patterns: Optional[Sequence[str]]) -> List[V1Node]:
+def _collect_nodes(
+    v1: CoreV1Api, patterns: Optional[Sequence[str]], selector: Optional[str] = None
+) -> List[V1Node]:
     compiled = _compile_patterns(patterns)
-    all_nodes = v1.list_node().items
+    # Label selectors are applied by the API server; name regexes cannot be.
+    all_nodes = kube.paginate(v1.list_node, label_selector=selector)
     # Deduplicate by UID so overlapping regex patterns don't double count
     dedup: Dict[str, V1Node] = {}
     for n in all_nodes:
@@ -236,7 +232,9 @@ def _sum_resources(nodes: List[V1Node], field: str) -> TotalsAcc:
 
 
 def total(
-    patterns: Optional[List[str]] = None, field: str = "capacity"
+    patterns: Optional[List[str]] = None,
+    field: str = "capacity",
+    selector: Optional[str] = None,
 ) -> Dict[str, Dict[str, str]]:
     """
     Calculate total cluster resources across nodes matching any of the given regex patterns.
@@ -244,6 +242,7 @@ def total(
     Args:
         patterns: List of regex strings to match node names. If None or empty, includes all nodes.
         field:    Which field to sum: "capacity" (default) or "allocatable".
+        selector: Label selector for nodes, applied by the API server.
 
     Returns:
         dict[str, dict[str, str]] mapping resource name -> {"value": <str>, "unit": <str>}
@@ -251,12 +250,12 @@ def total(
     """
     # Validate inputs with Pydantic
     try:
-        cfg = Settings(patterns=patterns, field=field)
+        cfg = Settings(patterns=patterns, field=field, selector=selector)
     except ValidationError as e:
         raise ValueError(str(e)) from e
 
-    v1 = _load_kube()
-    nodes = _collect_nodes(v1, cfg.patterns)
+    v1 = kube.core()
+    nodes = _collect_nodes(v1, cfg.patterns, cfg.selector)
     acc = _sum_resources(nodes, cfg.field)
 
     # Build a dynamic map (omit unavailable resources)
@@ -306,6 +305,14 @@ def resources(
             help='Resource field to sum on each node: "capacity" or "allocatable".',
         ),
     ] = "capacity",
+    selector: Annotated[
+        Optional[str],
+        typer.Option(
+            "-l",
+            "--selector",
+            help="Label selector for nodes, applied by the API server.",
+        ),
+    ] = None,
     scale: Annotated[
         float,
         typer.Option(
@@ -321,7 +328,7 @@ def resources(
     assert field in ["capacity", "allocatable"]
     assert scale > 0.0 and scale <= 1.0, "Percentage must be in (0, 1]"
     try:
-        result = total(patterns or None, field=field)
+        result = total(patterns or None, field=field, selector=selector)
         console.print(result, width=120)
         if scale != 1.0:
             console.print(f"Scaling by {scale * 100}%...")
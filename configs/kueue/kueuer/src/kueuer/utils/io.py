@@ -1,12 +1,15 @@
 """Input/Output utilities for reading and writing files."""
 
 import csv
+import gzip
+import json
 import os
 from datetime import datetime
-from typing import Any, Dict, List, Set
+from typing import IO, Any, Callable, Dict, List, Set
 
 import yaml
 
+from kueuer.utils import store
 from kueuer.utils.logging import logger
 
 
@@ -24,40 +27,173 @@ def read_yaml(filepath: str) -> Dict[Any, Any]:
         return yaml.load(data, Loader=yaml.FullLoader)  # type: ignore
 
 
+def _append_csv(
+    rows: List[Dict[str, Any]],
+    filename: str,
+    fieldnames: List[str],
+    opener: Callable[..., IO[str]] = open,
+) -> None:
+    """
+    Append rows to a CSV file under the header it already has.
+
+    Rows are blank where they lack a column of the header. Only rows with new
+    columns rewrite the file once, under the header followed by those columns,
+    so files written by earlier versions stay readable.
+
+    Args:
+        rows: Rows to append
+        filename: Path of the CSV file
+        fieldnames: Header of a new file, every key of the rows
+        opener: Opens the file in text mode, e.g. `gzip.open`
+    """
+    header: List[str] = []
+    if os.path.isfile(filename):
+        with opener(filename, mode="rt", newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+    added: List[str] = [name for name in fieldnames if name not in header]
+    target: str = filename
+    if header and added:
+        logger.info("Adding columns %s to %s", added, filename)
+        with opener(filename, mode="rt", newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f)) + rows
+        fieldnames = header + added
+        target = f"{filename}.tmp"
+    elif header:
+        fieldnames = header
+    mode: str = "at" if target == filename else "wt"
+    with opener(target, mode=mode, newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        if target != filename or not header:
+            writer.writeheader()
+        for row in rows:
+            # Handle datetime objects by converting them to strings
+            writer.writerow(
+                {
+                    key: value.isoformat() if isinstance(value, datetime) else value
+                    for key, value in row.items()
+                }
+            )
+    if target != filename:
+        os.replace(target, filename)
+
+
 def save_performance_to_csv(results: List[Dict[str, Any]], filename: str) -> None:
     """
     Save benchmark results to a CSV file.
 
+    Results are appended under the header of an existing file, see
+    `_append_csv`.
+
     Args:
         results: List of experiment result dictionaries
         filename: Path to save CSV file
     """
+    if not results:
+        return
     # Define fieldnames based on all possible keys in results
     fieldnames: Set[str] = set()
     for result in results:
         fieldnames.update(result.keys())
-    fieldnames = sorted(fieldnames)  # type: ignore
+    _append_csv(results, filename, sorted(fieldnames))
+    logger.info("Results saved to %s", filename)
 
-    # Check if file exists to determine if header is needed
-    file_exists = os.path.isfile(filename)
 
-    with open(filename, mode="a", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+def save_results(results: List[Dict[str, Any]], filename: str) -> None:
+    """
+    Save benchmark results to a store or, by its extension, a CSV file.
 
-        if not file_exists:
-            writer.writeheader()
+    Results saved to a store (`.db`, `.sqlite`, `.sqlite3`) replace earlier
+    ones with the same run id, see `kueuer.utils.store`.
 
-        for result in results:
-            # Handle datetime objects by converting them to strings
-            row_data = {}
-            for key, value in result.items():
-                if isinstance(value, datetime):
-                    row_data[key] = value.isoformat()
-                else:
-                    row_data[key] = value
-            writer.writerow(row_data)  # type: ignore
+    Args:
+        results: List of experiment result dictionaries
+        filename: Path to save the results to
+    """
+    if store.supports(filename):
+        store.upsert(results, filename)
+    else:
+        save_performance_to_csv(results, filename)
 
-    logger.info("Results saved to %s", filename)
+
+def sibling(filename: str, suffix: str) -> str:
+    """Path of a file stored next to a results file.
+
+    Args:
+        filename: Path of the results, e.g. `results.db`
+        suffix: What replaces the extension of the results, e.g.
+            `.jobs.csv.gz` for the per-job dataset
+
+    Returns:
+        Path of the file, e.g. `results.jobs.csv.gz`
+    """
+    root, _ext = os.path.splitext(filename)
+    return f"{root}{suffix}"
+
+
+def save_metadata(digest: str, snapshot: Dict[str, Any], filename: str) -> None:
+    """
+    Save a cluster snapshot once per content hash, next to the results.
+
+    Snapshots go to the results store, or to a JSON file next to a results
+    CSV file, e.g. `results.metadata.json`.
+
+    Args:
+        digest: Content hash of the snapshot
+        snapshot: Cluster configuration
+        filename: Path of the results
+    """
+    if store.supports(filename):
+        new = store.remember(digest, snapshot, filename)
+    else:
+        path = sibling(filename, ".metadata.json")
+        saved: Dict[str, Any] = {}
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+        new = digest not in saved
+        if new:
+            saved[digest] = snapshot
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(saved, f, indent=2, sort_keys=True, default=str)
+    if new:
+        logger.info("Cluster snapshot %s saved", digest)
+
+
+def read_metadata(filename: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Cluster snapshots saved next to the results, by content hash.
+
+    Args:
+        filename: Path of the results
+
+    Returns:
+        Snapshots saved by `save_metadata`, empty if there are none
+    """
+    if store.supports(filename):
+        return store.snapshots(filename)
+    path = sibling(filename, ".metadata.json")
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_jobs_to_csv(rows: List[Dict[str, Any]], filename: str) -> None:
+    """
+    Append per-job timings to a gzip compressed CSV file.
+
+    Each call appends one gzip member, which readers such as pandas decompress
+    as a single stream, so earlier runs are never rewritten unless rows add
+    columns, see `_append_csv`.
+
+    Args:
+        rows: One dictionary per job, with the same keys for every row
+        filename: Path to save the compressed CSV file
+    """
+    if not rows:
+        return
+    _append_csv(rows, filename, list(rows[0].keys()), gzip.open)
+    logger.info("Timings of %s jobs saved to %s", len(rows), filename)
 
 
 def save_evictions_to_yaml(
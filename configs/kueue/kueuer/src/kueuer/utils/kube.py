@@ -0,0 +1,426 @@
+"""Kubernetes API helpers shared across kueuer."""
+
+import json
+import socket
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from time import monotonic, sleep
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from kubernetes import client, config, watch
+from kubernetes.client.rest import ApiException
+from kubernetes.watch.watch import iter_resp_lines
+from urllib3.connection import HTTPConnection
+
+from kueuer.utils.logging import logger
+
+DEFAULT_PAGE_SIZE: int = 500
+DEFAULT_POOL_SIZE: int = 64
+# Seconds a single watch request stays open before it is renewed.
+WATCH_WINDOW: int = 300
+# Event type yielded by informer() with the full list of objects.
+SYNC: str = "SYNC"
+# Longest watch window when an informer can be stopped, so it notices quickly.
+STOP_WINDOW: int = 5
+
+
+@dataclass
+class Settings:
+    """Process-wide client settings.
+
+    Attributes:
+        pool_size (int): Connections kept open per API server.
+        qps (float): Client-side requests per second, 0 for unlimited.
+        burst (int): Requests allowed above qps before throttling.
+    """
+
+    pool_size: int = DEFAULT_POOL_SIZE
+    qps: float = 0.0
+    burst: int = 0
+
+
+class _Throttle:
+    """Token bucket shared by every request made through the client."""
+
+    def __init__(self, qps: float, burst: int) -> None:
+        self.qps = qps
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.qps <= 0:
+            return
+        with self.lock:
+            now = monotonic()
+            elapsed = now - self.updated
+            self.tokens = min(self.burst, self.tokens + elapsed * self.qps)
+            self.updated = now
+            # Reserve a token even when short, so waiters queue up in order.
+            self.tokens -= 1
+            delay = -self.tokens / self.qps if self.tokens < 0 else 0.0
+        if delay:
+            sleep(delay)
+
+
+class _ThrottledPool:
+    """Wraps the urllib3 pool manager to apply the client-side rate limit."""
+
+    def __init__(self, pool: Any, throttle: _Throttle) -> None:
+        self.pool = pool
+        self.throttle = throttle
+
+    def request(self, *args: Any, **kwargs: Any) -> Any:
+        self.throttle.acquire()
+        return self.pool.request(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pool, name)
+
+
+settings = Settings()
+_client: Optional[client.ApiClient] = None
+# Connection stats of clients replaced by configure().
+_retired: Counter = Counter()
+_lock = threading.Lock()
+
+# Objects received from the API server per list call, keyed by the call name.
+transferred: Counter = Counter()
+
+
+def configure(
+    pool_size: Optional[int] = None,
+    qps: Optional[float] = None,
+    burst: Optional[int] = None,
+) -> None:
+    """Change the client settings; the next `api_client()` call applies them.
+
+    Args:
+        pool_size (Optional[int]): Connections kept open per API server.
+        qps (Optional[float]): Client-side requests per second, 0 for unlimited.
+        burst (Optional[int]): Requests allowed above qps before throttling.
+    """
+    global _client
+    with _lock:
+        if pool_size is not None:
+            settings.pool_size = pool_size
+        if qps is not None:
+            settings.qps = qps
+        if burst is not None:
+            settings.burst = burst
+        # API objects created earlier keep their client, so it is not closed.
+        if _client is not None:
+            _retired.update(_pool_stats(_client))
+        _client = None
+
+
+def api_client() -> client.ApiClient:
+    """Shared API client, loading kubeconfig or in-cluster config once.
+
+    Returns:
+        client.ApiClient: Client with a pooled, keep-alive, rate limited
+            connection manager.
+    """
+    global _client
+    with _lock:
+        if _client is not None:
+            return _client
+        configuration = client.Configuration()
+        try:
+            config.load_kube_config(client_configuration=configuration)
+        except Exception:
+            config.load_incluster_config(client_configuration=configuration)
+        configuration.connection_pool_maxsize = settings.pool_size
+        configuration.socket_options = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        ]
+        api = client.ApiClient(configuration)
+        api.rest_client.pool_manager = _ThrottledPool(
+            api.rest_client.pool_manager,
+            _Throttle(settings.qps, settings.burst or int(settings.qps * 2)),
+        )
+        logger.debug(
+            "Kubernetes client for %s (pool %s, qps %s, burst %s)",
+            configuration.host,
+            settings.pool_size,
+            settings.qps or "unlimited",
+            settings.burst,
+        )
+        _client = api
+        return api
+
+
+def batch() -> client.BatchV1Api:
+    """BatchV1Api on the shared client."""
+    return client.BatchV1Api(api_client())
+
+
+def core() -> client.CoreV1Api:
+    """CoreV1Api on the shared client."""
+    return client.CoreV1Api(api_client())
+
+
+def custom() -> client.CustomObjectsApi:
+    """CustomObjectsApi on the shared client."""
+    return client.CustomObjectsApi(api_client())
+
+
+def _pool_stats(api: client.ApiClient) -> Counter:
+    stats: Counter = Counter()
+    pools = api.rest_client.pool_manager.pools
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        stats["requests"] += pool.num_requests
+        stats["connections"] += pool.num_connections
+    return stats
+
+
+def connections() -> Dict[str, int]:
+    """Requests served and connections opened by the shared client.
+
+    Returns:
+        Dict[str, int]: `requests`, `connections` and `reused`, the number of
+            requests that went over an already open connection.
+    """
+    stats: Counter = Counter(_retired)
+    if _client is not None:
+        stats.update(_pool_stats(_client))
+    return {
+        "requests": stats["requests"],
+        "connections": stats["connections"],
+        "reused": max(stats["requests"] - stats["connections"], 0),
+    }
+
+
+def _page(response: Any) -> Tuple[List[Any], Optional[str], Optional[str]]:
+    """Split a list response into (items, continue token, resourceVersion).
+
+    Typed clients return models, the CustomObjectsApi returns plain dicts.
+    """
+    if isinstance(response, dict):
+        metadata = response.get("metadata") or {}
+        return (
+            response.get("items") or [],
+            metadata.get("continue"),
+            metadata.get("resourceVersion"),
+        )
+    metadata = response.metadata
+    return (
+        response.items or [],
+        getattr(metadata, "_continue", None),
+        getattr(metadata, "resource_version", None),
+    )
+
+
+def paginate(
+    func: Callable[..., Any],
+    *args: Any,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    **kwargs: Any,
+) -> Iterator[Any]:
+    """Iterate over every item of a list call, one page at a time.
+
+    Args:
+        func (Callable[..., Any]): List call, e.g. `BatchV1Api.list_namespaced_job`.
+        *args (Any): Positional arguments for the call.
+        page_size (int): Items per request. Defaults to 500.
+        **kwargs (Any): Keyword arguments for the call, e.g. `label_selector`.
+
+    Yields:
+        Any: Items from every page.
+    """
+    for items, _version in pages(func, *args, page_size=page_size, **kwargs):
+        yield from items
+
+
+def pages(
+    func: Callable[..., Any],
+    *args: Any,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    **kwargs: Any,
+) -> Iterator[Tuple[List[Any], Optional[str]]]:
+    """Iterate over the pages of a list call using limit/continue.
+
+    Args:
+        func (Callable[..., Any]): List call, e.g. `BatchV1Api.list_namespaced_job`.
+        *args (Any): Positional arguments for the call.
+        page_size (int): Items per request. Defaults to 500.
+        **kwargs (Any): Keyword arguments for the call, e.g. `label_selector`.
+
+    Yields:
+        Tuple[List[Any], Optional[str]]: Items and resourceVersion of each page.
+    """
+    name: str = getattr(func, "__name__", str(func))
+    selectors = {k: v for k, v in kwargs.items() if k.endswith("selector") and v}
+    token: Optional[str] = None
+    count: int = 0
+    requests: int = 0
+    while True:
+        if token:
+            kwargs["_continue"] = token
+        response = func(*args, limit=page_size, **kwargs)
+        if kwargs.get("_preload_content") is False:
+            response = json.loads(response.data)
+        items, token, version = _page(response)
+        count += len(items)
+        requests += 1
+        transferred[name] += len(items)
+        yield items, version
+        if not token:
+            break
+    logger.debug(
+        "%s returned %s objects in %s requests, selectors: %s",
+        name,
+        count,
+        requests,
+        selectors or "none",
+    )
+
+
+def collect(
+    func: Callable[..., Any],
+    *args: Any,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    **kwargs: Any,
+) -> Tuple[List[Any], Optional[str]]:
+    """List every item of a list call.
+
+    Returns:
+        Tuple[List[Any], Optional[str]]: Items and the resourceVersion of the
+            list snapshot, which can be used to start a watch.
+    """
+    items: List[Any] = []
+    version: Optional[str] = None
+    for page, snapshot in pages(func, *args, page_size=page_size, **kwargs):
+        items.extend(page)
+        version = snapshot
+    return items, version
+
+
+def _version(obj: Any) -> Optional[str]:
+    if isinstance(obj, dict):
+        return (obj.get("metadata") or {}).get("resourceVersion")
+    metadata = getattr(obj, "metadata", None)
+    return getattr(metadata, "resource_version", None)
+
+
+def stream(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Iterator[Any]:
+    """Watch a resource without deserializing the objects into models.
+
+    Same events as `watch.Watch().stream`, but the objects are the plain dicts
+    decoded from the response lines.
+
+    Args:
+        func (Callable[..., Any]): List call, e.g. `BatchV1Api.list_namespaced_job`.
+        *args (Any): Positional arguments for the call.
+        **kwargs (Any): Keyword arguments for the call, e.g. `resource_version`.
+
+    Yields:
+        Dict[str, Any]: Events with `type`, `object` and `raw_object`.
+    """
+    response = func(*args, watch=True, _preload_content=False, **kwargs)
+    try:
+        for line in iter_resp_lines(response):
+            if not line or line.isspace():
+                continue
+            event: Dict[str, Any] = json.loads(line)
+            event["raw_object"] = event["object"]
+            yield event
+    finally:
+        # Like watch.Watch, a half-read watch must not go back to the pool
+        response.close()
+        response.release_conn()
+
+
+def _expired(deadline: Optional[float], stop: Optional[threading.Event]) -> bool:
+    if stop is not None and stop.is_set():
+        return True
+    return deadline is not None and monotonic() >= deadline
+
+
+def _window(deadline: Optional[float], stop: Optional[threading.Event]) -> int:
+    """Seconds the next watch request may stay open."""
+    window: float = WATCH_WINDOW if stop is None else STOP_WINDOW
+    if deadline is not None:
+        window = min(window, max(deadline - monotonic(), 1))
+    return int(window)
+
+
+def informer(
+    func: Callable[..., Any],
+    *args: Any,
+    resource_version: Optional[str] = None,
+    timeout: Optional[float] = None,
+    raw: bool = False,
+    stop: Optional[threading.Event] = None,
+    **kwargs: Any,
+) -> Iterator[Tuple[str, Any]]:
+    """List and watch a resource without missing transitions.
+
+    Watches are renewed every `WATCH_WINDOW` seconds from the last seen
+    resourceVersion, which bookmarks keep fresh even when nothing changes.
+    If the server has compacted that version away (410 Gone), the resource
+    is listed again and the watch resumes from the new list.
+
+    Args:
+        func (Callable[..., Any]): List call, e.g. `BatchV1Api.list_namespaced_job`.
+        *args (Any): Positional arguments for the call.
+        resource_version (Optional[str]): Start watching from this version
+            instead of listing first.
+        timeout (Optional[float]): Stop after this many seconds, unbounded if None.
+        raw (bool): Yield the objects as plain dicts instead of client models,
+            which skips the costly model construction for every event.
+        stop (Optional[threading.Event]): Return when set, checked after every
+            event and at least every `STOP_WINDOW` seconds.
+        **kwargs (Any): Keyword arguments for the call, e.g. `label_selector`.
+
+    Yields:
+        Tuple[str, Any]: (`SYNC`, list of all objects) after every list, then
+            (event type, object) for ADDED, MODIFIED and DELETED events.
+    """
+    deadline: Optional[float] = monotonic() + timeout if timeout else None
+    listing: Dict[str, Any] = {"_preload_content": False} if raw else {}
+    if resource_version is None:
+        items, resource_version = collect(func, *args, **listing, **kwargs)
+        yield SYNC, items
+    watcher = watch.Watch()
+    events: Callable[..., Iterator[Any]] = stream if raw else watcher.stream
+    try:
+        while not _expired(deadline, stop):
+            try:
+                for event in events(
+                    func,
+                    *args,
+                    resource_version=resource_version,
+                    allow_watch_bookmarks=True,
+                    timeout_seconds=_window(deadline, stop),
+                    **kwargs,
+                ):
+                    kind: str = event["type"]
+                    if kind == "ERROR":
+                        code = (event.get("raw_object") or {}).get("code")
+                        raise ApiException(status=code, reason="Watch error event")
+                    version = _version(
+                        event["raw_object"] if kind == "BOOKMARK" else event["object"]
+                    )
+                    resource_version = version or resource_version
+                    if kind != "BOOKMARK":
+                        yield kind, event["object"]
+                    if _expired(deadline, stop):
+                        break
+            except ApiException as error:
+                if error.status != 410:
+                    raise
+                logger.warning(
+                    "%s watch expired at version %s, relisting",
+                    getattr(func, "__name__", func),
+                    resource_version,
+                )
+                items, resource_version = collect(func, *args, **listing, **kwargs)
+                yield SYNC, items
+    finally:
+        watcher.stop()
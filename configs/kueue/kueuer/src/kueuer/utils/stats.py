@@ -0,0 +1,250 @@
+"""Streaming statistics that can be updated per event and merged."""
+
+import itertools
+import math
+import random
+from collections import Counter
+from statistics import fmean
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_ACCURACY: float = 0.01
+DEFAULT_CONFIDENCE: float = 0.95
+DEFAULT_RESAMPLES: int = 1000
+QUANTILES: Tuple[float, ...] = (0.50, 0.90, 0.95, 0.99)
+
+
+class Sketch:
+    """Quantile sketch with a relative accuracy guarantee (DDSketch).
+
+    Values are counted in logarithmically sized buckets, so any quantile is
+    estimated within `accuracy` of its true value, memory only grows with the
+    range of the values, and sketches with the same accuracy merge exactly.
+    Values at or below zero share a single bucket.
+
+    Args:
+        accuracy (float): Relative accuracy of the quantiles. Defaults to 1%.
+    """
+
+    def __init__(self, accuracy: float = DEFAULT_ACCURACY) -> None:
+        self.accuracy = accuracy
+        self.gamma: float = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma: float = math.log(self.gamma)
+        self.buckets: Counter = Counter()
+        self.zeros: int = 0
+        self.count: int = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        self.buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+
+    def merge(self, other: "Sketch") -> None:
+        """Add the values of another sketch with the same accuracy."""
+        if other.accuracy != self.accuracy:
+            raise ValueError("Only sketches with the same accuracy can be merged")
+        self.buckets.update(other.buckets)
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q, None if the sketch is empty."""
+        if not self.count:
+            return None
+        rank: float = q * (self.count - 1)
+        seen: int = self.zeros
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return 2 * self.gamma**index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class Stream:
+    """Running count, mean, variance, extremes and quantiles of a series.
+
+    The mean and variance use Welford's algorithm, and merging two streams
+    combines them exactly (Chan et al.), so streams from several namespaces
+    or repeated runs can be aggregated without keeping the values.
+
+    Args:
+        accuracy (float): Relative accuracy of the quantiles. Defaults to 1%.
+    """
+
+    def __init__(self, accuracy: float = DEFAULT_ACCURACY) -> None:
+        self.count: int = 0
+        self.mean: float = 0.0
+        self._m2: float = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.sketch = Sketch(accuracy)
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta: float = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.sketch.add(value)
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "Stream") -> None:
+        """Add the values of another stream."""
+        if not other.count:
+            return
+        total: int = self.count + other.count
+        delta: float = other.mean - self.mean
+        self._m2 += other._m2 + delta**2 * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        if self.min is None or (other.min is not None and other.min < self.min):
+            self.min = other.min
+        if self.max is None or (other.max is not None and other.max > self.max):
+            self.max = other.max
+        self.sketch.merge(other.sketch)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q, kept within the observed range."""
+        value: Optional[float] = self.sketch.quantile(q)
+        if value is None or self.min is None or self.max is None:
+            return value
+        return min(max(value, self.min), self.max)
+
+    def summary(self, prefix: str = "") -> Dict[str, Optional[float]]:
+        """Mean, standard deviation, p50/p90/p95/p99 and max.
+
+        Args:
+            prefix (str): Prefix for the keys, e.g. `duration_`.
+
+        Returns:
+            Dict[str, Optional[float]]: Statistics, None when nothing was added.
+        """
+        result: Dict[str, Optional[float]] = {
+            f"{prefix}mean": self.mean if self.count else None,
+            f"{prefix}stddev": self.stddev if self.count else None,
+        }
+        for q in QUANTILES:
+            result[f"{prefix}p{int(q * 100)}"] = self.quantile(q)
+        result[f"{prefix}max"] = self.max
+        return result
+
+
+def bootstrap(
+    values: Sequence[float],
+    confidence: float = DEFAULT_CONFIDENCE,
+    statistic: Callable[[Sequence[float]], float] = fmean,
+    resamples: int = DEFAULT_RESAMPLES,
+    seed: Optional[int] = None,
+) -> Tuple[Optional[float], Optional[float]]:
+    """Percentile bootstrap confidence interval of a statistic.
+
+    The values are resampled with replacement, the statistic is computed on
+    every resample and the interval is read from the spread of those
+    estimates, so no distribution is assumed for the values.
+
+    Args:
+        values (Sequence[float]): Observations, e.g. one metric of repeated runs.
+        confidence (float): Confidence level of the interval. Defaults to 95%.
+        statistic (Callable[[Sequence[float]], float]): Statistic of interest.
+            Defaults to the mean.
+        resamples (int): Number of resamples. Defaults to 1000.
+        seed (Optional[int]): Seed of the resampling, for reproducible intervals.
+
+    Returns:
+        Tuple[Optional[float], Optional[float]]: Lower and upper bounds, None
+            with fewer than two values.
+    """
+    if len(values) < 2:
+        return None, None
+    generator = random.Random(seed)
+    estimates = sorted(
+        statistic(generator.choices(values, k=len(values))) for _ in range(resamples)
+    )
+    tail: float = (1 - confidence) / 2
+    return (
+        estimates[int(tail * (resamples - 1))],
+        estimates[math.ceil((1 - tail) * (resamples - 1))],
+    )
+
+
+def permutation_test(
+    first: Sequence[float],
+    second: Sequence[float],
+    resamples: int = DEFAULT_RESAMPLES * 10,
+    seed: Optional[int] = None,
+) -> Optional[float]:
+    """Two-sided p-value of the difference in means of two samples.
+
+    The values are reassigned to the two samples at random and the p-value
+    is the fraction of reassignments whose difference in means is at least
+    the observed one. When there are fewer distinct reassignments than
+    `resamples`, all of them are enumerated and the p-value is exact.
+
+    Args:
+        first (Sequence[float]): Observations of the first sample.
+        second (Sequence[float]): Observations of the second sample.
+        resamples (int): Random reassignments. Defaults to 10000.
+        seed (Optional[int]): Seed of the reassignments, for reproducible values.
+
+    Returns:
+        Optional[float]: p-value, None unless both samples have two values.
+    """
+    if len(first) < 2 or len(second) < 2:
+        return None
+    pooled: List[float] = [*first, *second]
+    size: int = len(first)
+    observed: float = abs(fmean(first) - fmean(second))
+    # Differences within rounding of the observed one count as extreme
+    tolerance: float = 1e-9 * max(1.0, observed)
+
+    def extreme(members: Sequence[int]) -> bool:
+        chosen = set(members)
+        left = [pooled[i] for i in chosen]
+        right = [value for i, value in enumerate(pooled) if i not in chosen]
+        return abs(fmean(left) - fmean(right)) >= observed - tolerance
+
+    if math.comb(len(pooled), size) <= resamples:
+        splits = list(itertools.combinations(range(len(pooled)), size))
+        return sum(extreme(split) for split in splits) / len(splits)
+    generator = random.Random(seed)
+    indices: List[int] = list(range(len(pooled)))
+    hits: int = sum(extreme(generator.sample(indices, size)) for _ in range(resamples))
+    # Counting the observed split keeps the p-value above zero
+    return (hits + 1) / (resamples + 1)
+
+
+def permutation_floor(
+    first: int, second: int, resamples: int = DEFAULT_RESAMPLES * 10
+) -> Optional[float]:
+    """Smallest p-value `permutation_test` can return for two sample sizes.
+
+    With few observations even the most extreme difference is not
+    significant, e.g. 0.1 for three against three.
+
+    Args:
+        first (int): Observations of the first sample.
+        second (int): Observations of the second sample.
+        resamples (int): Random reassignments of `permutation_test`.
+
+    Returns:
+        Optional[float]: Smallest p-value, None unless both samples have two
+            values.
+    """
+    if first < 2 or second < 2:
+        return None
+    splits: int = math.comb(first + second, first)
+    if splits <= resamples:
+        # The observed split, and its mirror image when the sizes are equal
+        return (2 if first == second else 1) / splits
+    return 1 / (resamples + 1)
@@ -0,0 +1,183 @@
+"""Append-only store of benchmark results in SQLite, one row per run id.
+
+Saving a result twice updates its row instead of duplicating it, and the
+table gains a column whenever a result carries a new metric, so results of
+older campaigns stay in the same file as new ones.
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from kueuer.utils.logging import logger
+
+SUFFIXES: Tuple[str, ...] = (".db", ".sqlite", ".sqlite3")
+TABLE: str = "results"
+KEY: str = "run_id"
+# Cluster snapshots referenced by results, once per content hash.
+METADATA: str = "metadata"
+# Columns most loads filter or sort on.
+INDEXED: Tuple[str, ...] = ("timestamp", "job_count", "use_kueue")
+
+
+def supports(filename: str) -> bool:
+    """True if a results file is a store rather than a CSV file."""
+    return os.path.splitext(filename)[1].lower() in SUFFIXES
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _value(value: Any) -> Any:
+    """Value as SQLite stores it, datetimes as ISO 8601 text."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _columns(connection: sqlite3.Connection) -> Set[str]:
+    rows = connection.execute(f"PRAGMA table_info({_quote(TABLE)})").fetchall()
+    return {row[1] for row in rows}
+
+
+def _connect(filename: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(filename)
+    connection.execute(
+        f"CREATE TABLE IF NOT EXISTS {_quote(TABLE)} ({_quote(KEY)} TEXT PRIMARY KEY)"
+    )
+    return connection
+
+
+def _evolve(connection: sqlite3.Connection, names: List[str]) -> None:
+    """Add the columns a table is missing, indexing the common filters."""
+    existing: Set[str] = _columns(connection)
+    for name in names:
+        if name in existing:
+            continue
+        connection.execute(f"ALTER TABLE {_quote(TABLE)} ADD COLUMN {_quote(name)}")
+        if name in INDEXED:
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(f'{TABLE}_{name}')} "
+                f"ON {_quote(TABLE)} ({_quote(name)})"
+            )
+        logger.debug("Added column %s to %s", name, TABLE)
+
+
+def upsert(results: List[Dict[str, Any]], filename: str) -> int:
+    """Insert results, or update the ones already saved with the same run id.
+
+    Args:
+        results: Experiment results, each with a `run_id`
+        filename: Path of the store, created if missing
+
+    Returns:
+        Number of results saved
+    """
+    with closing(_connect(filename)) as connection, connection:
+        for result in results:
+            names: List[str] = list(result)
+            if KEY not in result:
+                raise ValueError(f"Result without a {KEY} cannot be stored")
+            _evolve(connection, names)
+            columns: str = ", ".join(_quote(name) for name in names)
+            updates: str = ", ".join(
+                f"{_quote(name)} = excluded.{_quote(name)}"
+                for name in names
+                if name != KEY
+            )
+            connection.execute(
+                f"INSERT INTO {_quote(TABLE)} ({columns}) "
+                f"VALUES ({', '.join('?' for _ in names)}) "
+                f"ON CONFLICT({_quote(KEY)}) DO "
+                + (f"UPDATE SET {updates}" if updates else "NOTHING"),
+                [_value(result[name]) for name in names],
+            )
+    logger.info("Results saved to %s", filename)
+    return len(results)
+
+
+def select(
+    filename: str, since: Optional[str] = None, **filters: Any
+) -> List[Dict[str, Any]]:
+    """Load results, optionally filtered.
+
+    Args:
+        filename: Path of the store
+        since: Only results with a `timestamp` at or after this one, compared
+            as text, e.g. `20250301` or `20250301-120000`
+        **filters: Only results whose column equals the value, e.g.
+            `job_count=128`
+
+    Returns:
+        Results as dictionaries, oldest first, with `use_kueue` as a boolean
+    """
+    with closing(_connect(filename)) as connection:
+        existing: Set[str] = _columns(connection)
+        clauses: List[str] = []
+        params: List[Any] = []
+        if since is not None and "timestamp" in existing:
+            clauses.append(f"{_quote('timestamp')} >= ?")
+            params.append(since)
+        for name, value in filters.items():
+            if name not in existing:
+                return []
+            clauses.append(f"{_quote(name)} = ?")
+            params.append(_value(value))
+        query: str = f"SELECT * FROM {_quote(TABLE)}"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        if "timestamp" in existing:
+            query += f" ORDER BY {_quote('timestamp')}"
+        cursor = connection.execute(query, params)
+        names: List[str] = [column[0] for column in cursor.description]
+        rows: List[Dict[str, Any]] = [
+            dict(zip(names, row, strict=True)) for row in cursor
+        ]
+    for row in rows:
+        if row.get("use_kueue") is not None:
+            row["use_kueue"] = bool(row["use_kueue"])
+    return rows
+
+
+def remember(digest: str, snapshot: Dict[str, Any], filename: str) -> bool:
+    """Save a cluster snapshot unless one with the same hash is saved.
+
+    Args:
+        digest: Content hash of the snapshot
+        snapshot: Cluster configuration, serializable to JSON
+        filename: Path of the store, created if missing
+
+    Returns:
+        True if the snapshot was new
+    """
+    with closing(_connect(filename)) as connection, connection:
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {_quote(METADATA)} "
+            "(hash TEXT PRIMARY KEY, snapshot TEXT)"
+        )
+        cursor = connection.execute(
+            f"INSERT OR IGNORE INTO {_quote(METADATA)} VALUES (?, ?)",
+            (digest, json.dumps(snapshot, sort_keys=True, default=str)),
+        )
+        return cursor.rowcount > 0
+
+
+def snapshots(filename: str) -> Dict[str, Dict[str, Any]]:
+    """Cluster snapshots saved in a store, by content hash."""
+    with closing(_connect(filename)) as connection:
+        tables = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (METADATA,),
+        ).fetchall()
+        if not tables:
+            return {}
+        rows = connection.execute(
+            f"SELECT hash, snapshot FROM {_quote(METADATA)}"
+        ).fetchall()
+    return {digest: json.loads(snapshot) for digest, snapshot in rows}
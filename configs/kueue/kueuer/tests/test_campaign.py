@@ -0,0 +1,87 @@
+"""Tests of resuming benchmark campaigns with `--resume`."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from kueuer.benchmarks import campaign
+
+PLAN: dict[str, Any] = {"counts": [64, 16], "duration": 10, "kueue": "queue"}
+
+
+def result(run_id: str, count: int, use_kueue: bool, repetition: int = 0) -> dict:
+    """Result row of a finished experiment."""
+    return {
+        "run_id": run_id,
+        "job_count": count,
+        "use_kueue": use_kueue,
+        "repetition": repetition,
+        "start_time": datetime(2026, 1, 1, tzinfo=timezone.utc),
+    }
+
+
+def test_resume(tmp_path: Path) -> None:
+    """Finished experiments are skipped, interrupted ones are left to clean up."""
+    path = str(tmp_path / "results.campaign.json")
+    state = campaign.begin(path, PLAN)
+    assert state.cells == [
+        {"job_count": 16, "use_kueue": False},
+        {"job_count": 16, "use_kueue": True},
+        {"job_count": 64, "use_kueue": False},
+        {"job_count": 64, "use_kueue": True},
+    ]
+    state.start("direct-16")
+    state.finish(result("direct-16", 16, False))
+    state.start("kueue-16")
+
+    resumed = campaign.begin(path, PLAN, resume=True)
+    assert resumed.inflight == ["kueue-16"]
+    finished = resumed.result(16, False, 0)
+    assert finished is not None
+    assert finished["run_id"] == "direct-16"
+    assert finished["start_time"] == "2026-01-01 00:00:00+00:00"
+    assert resumed.result(16, True, 0) is None
+    assert resumed.result(16, False, 1) is None
+
+
+def test_start_over(tmp_path: Path) -> None:
+    """Without --resume, or without a saved campaign, everything runs again."""
+    path = tmp_path / "results.campaign.json"
+    state = campaign.begin(str(path), PLAN, resume=True)
+    assert path.is_file()
+    state.finish(result("direct-16", 16, False))
+
+    state = campaign.begin(str(path), PLAN)
+    assert state.completed == []
+    assert json.loads(path.read_text(encoding="utf-8"))["completed"] == []
+
+
+def test_resume_other_plan(tmp_path: Path) -> None:
+    """A campaign planned differently is not resumed."""
+    path = str(tmp_path / "results.campaign.json")
+    campaign.begin(path, PLAN)
+
+    with pytest.raises(ValueError, match="duration"):
+        campaign.begin(path, {**PLAN, "duration": 20}, resume=True)
+
+
+def test_cleanup(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Jobs of interrupted experiments are deleted before resuming."""
+    path = str(tmp_path / "results.campaign.json")
+    campaign.begin(path, PLAN).start("kueue-16")
+    deleted: list[str] = []
+    monkeypatch.setattr(
+        campaign.k8s,
+        "delete_jobs",
+        lambda namespace, prefix, **options: deleted.append(prefix),
+    )
+
+    resumed = campaign.begin(path, PLAN, resume=True)
+    resumed.cleanup("bench")
+    assert deleted == ["kueue-16"]
+    assert campaign.begin(path, PLAN, resume=True).inflight == []
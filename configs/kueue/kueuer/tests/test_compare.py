@@ -0,0 +1,131 @@
+"""Tests of the regression gate of `kr compare`."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from kueuer.benchmarks import compare
+from kueuer.cli import app
+from kueuer.utils import io, stats
+
+
+def results(
+    path: Path, durations: list[float], totals: list[float], count: int = 64
+) -> str:
+    """Write one result row per repetition of a Kueue cell to a CSV file.
+
+    Returns:
+        Path of the CSV file.
+    """
+    rows = [
+        {
+            "run_id": f"kueue-{path.stem}-{num}",
+            "job_count": count,
+            "use_kueue": True,
+            "cores": 1,
+            "ram": 1,
+            "storage": 1,
+            "job_duration": 1,
+            "total_execution_time": total,
+            "avg_time_from_creation_completion": duration,
+            "median_time_from_creation_completion": duration,
+            "p99_time_from_creation_completion": duration,
+        }
+        for num, (duration, total) in enumerate(zip(durations, totals, strict=True))
+    ]
+    io.save_performance_to_csv(rows, str(path))
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    ("first", "second", "floor"),
+    [(2, 2, 1 / 3), (3, 3, 0.1), (3, 4, 1 / 35), (1, 3, None)],
+)
+def test_permutation_floor(first: int, second: int, floor: float | None) -> None:
+    """The floor is the smallest p-value of the exact test."""
+    assert stats.permutation_floor(first, second) == pytest.approx(floor)
+    if floor is not None:
+        extreme = stats.permutation_test(
+            [float(num) for num in range(first)],
+            [100.0 + num for num in range(second)],
+            seed=0,
+        )
+        assert extreme == pytest.approx(floor)
+
+
+def test_three_runs_regress(tmp_path: Path) -> None:
+    """Three runs a side cannot reach p < 0.05, so the threshold decides."""
+    baseline = results(tmp_path / "before.csv", [10.0, 10.5, 9.5], [20.0, 21, 19])
+    candidate = results(tmp_path / "after.csv", [20.0, 20.5, 19.5], [40.0, 41, 39])
+
+    found = compare.deltas(compare.load(baseline), compare.load(candidate))
+    assert {delta.metric for delta in found if delta.regressed} == {
+        "throughput",
+        "avg_time_from_creation_completion",
+        "median_time_from_creation_completion",
+        "p99_time_from_creation_completion",
+    }
+    assert all(delta.p_value == pytest.approx(0.1) for delta in found)
+
+    outcome = CliRunner().invoke(app, ["compare", baseline, candidate])
+    assert outcome.exit_code == 1
+
+
+def test_noise_passes(tmp_path: Path) -> None:
+    """Enough runs to test, and a change that is not significant, pass."""
+    baseline = results(
+        tmp_path / "before.csv", [10.0, 12.0, 9.0, 11.0], [20.0, 24, 18, 22]
+    )
+    candidate = results(
+        tmp_path / "after.csv", [9.5, 13.0, 10.0, 13.5], [19.0, 26, 20, 27]
+    )
+
+    found = compare.deltas(compare.load(baseline), compare.load(candidate))
+    assert not any(delta.regressed for delta in found)
+
+    outcome = CliRunner().invoke(app, ["compare", baseline, candidate])
+    assert outcome.exit_code == 0
+
+
+def test_metadata_filter(tmp_path: Path) -> None:
+    """Results of another cluster configuration are left out on request."""
+    path = tmp_path / "mixed.csv"
+    results(path, [10.0, 30.0], [20.0, 60])
+    df = pd.read_csv(path)
+    df["metadata_hash"] = ["aaaa1111", "bbbb2222"]
+    df.to_csv(path, index=False)
+
+    assert len(compare.load(str(path))) == 2
+    only = compare.load(str(path), "aaaa")
+    assert only["avg_time_from_creation_completion"].tolist() == [10.0]
+    with pytest.raises(ValueError):
+        compare.load(str(path), "cccc")
+
+
+def test_no_common_cell(tmp_path: Path) -> None:
+    """Results with nothing to compare cannot pass the gate."""
+    baseline = results(tmp_path / "before.csv", [10.0, 10.5], [20.0, 21])
+    candidate = results(tmp_path / "after.csv", [10.0, 10.5], [20.0, 21], count=128)
+
+    assert compare.missing(compare.load(baseline), compare.load(candidate)) == [
+        "64 kueue 1c/1G/1G/1s"
+    ]
+    outcome = CliRunner().invoke(app, ["compare", baseline, candidate])
+    assert outcome.exit_code == 2
+
+
+def test_missing_cell(tmp_path: Path) -> None:
+    """A candidate without every cell of the baseline fails the gate."""
+    path = tmp_path / "before.csv"
+    results(path, [10.0, 10.5], [20.0, 21])
+    results(path, [10.0, 10.5], [40.0, 42], count=128)
+    candidate = results(tmp_path / "after.csv", [10.0, 10.5], [20.0, 21])
+
+    outcome = CliRunner().invoke(app, ["compare", str(path), candidate])
+    assert outcome.exit_code == 2
+    outcome = CliRunner().invoke(app, ["compare", candidate, str(path)])
+    assert outcome.exit_code == 0
@@ -0,0 +1,165 @@
+"""Tests of the fake API server's selectors and controllers."""
+
+from __future__ import annotations
+
+import heapq
+from time import monotonic
+from typing import Any
+
+import pytest
+
+from kueuer.benchmarks import DEFAULT_KUEUE, DEFAULT_NAMESPACE, fake
+from kueuer.benchmarks.fake import selector
+
+
+def test_selector_sets() -> None:
+    """Set-based terms keep their commas apart from the term separator."""
+    matches = selector("kueue.x-k8s.io/job-uid in (a, b),tier notin (low),run")
+    assert matches({"kueue.x-k8s.io/job-uid": "b", "run": "1"})
+    assert not matches({"kueue.x-k8s.io/job-uid": "c", "run": "1"})
+    assert not matches({"kueue.x-k8s.io/job-uid": "a", "tier": "low", "run": "1"})
+    assert not matches({"kueue.x-k8s.io/job-uid": "a"})
+
+
+def test_selector_equality() -> None:
+    """Equality, inequality and negated existence terms."""
+    matches = selector("app=bench,tier!=low,!skip")
+    assert matches({"app": "bench"})
+    assert not matches({"app": "bench", "tier": "low"})
+    assert not matches({"app": "bench", "skip": ""})
+
+
+def cluster(**settings: Any) -> fake.Cluster:
+    """A fake cluster of 4-core nodes whose timers run through `due`."""
+    return fake.Cluster(fake.Settings(cores=4, **settings))
+
+
+def due(server: fake.Cluster) -> None:
+    """Run the timers that are due, as the controller thread would."""
+    with server.lock:
+        while server.timers and server.timers[0][0] <= monotonic():
+            _due, _order, callback, args = heapq.heappop(server.timers)
+            callback(*args)
+
+
+def submit(
+    server: fake.Cluster, name: str, cores: int, priority: str | None = None
+) -> None:
+    """Create a job of a few cores, queued to Kueue when it has a priority."""
+    labels: dict[str, str] = {}
+    if priority:
+        labels = {fake.QUEUE_LABEL: DEFAULT_KUEUE, fake.PRIORITY_LABEL: priority}
+    container = {
+        "name": name,
+        "args": ["--timeout", "3600"],
+        "resources": {"requests": {"cpu": str(cores)}},
+    }
+    server.create(
+        "jobs",
+        DEFAULT_NAMESPACE,
+        {
+            "metadata": {"name": name, "labels": labels},
+            "spec": {
+                "suspend": bool(priority),
+                "template": {"spec": {"containers": [container]}},
+            },
+        },
+    )
+    due(server)
+
+
+def job(server: fake.Cluster, name: str) -> dict[str, Any]:
+    """A job as stored by the fake cluster."""
+    return server.collections["jobs"].objects[(DEFAULT_NAMESPACE, name)]
+
+
+def node(server: fake.Cluster, name: str) -> str | None:
+    """Node of the pod of a job, None while it is pending or has no pod."""
+    key = server.pods.get((DEFAULT_NAMESPACE, name))
+    pod = server.collections["pods"].objects.get(key) if key else None
+    return (pod or {}).get("spec", {}).get("nodeName")
+
+
+def conditions(server: fake.Cluster, name: str) -> dict[str, str]:
+    """Condition statuses of the workload of a job, by type."""
+    key = server.workloads[(DEFAULT_NAMESPACE, name)]
+    workload = server.collections["workloads"].objects[key]
+    return {
+        condition["type"]: condition["status"]
+        for condition in workload["status"].get("conditions") or []
+    }
+
+
+def test_placement_skips_unfit_pods() -> None:
+    """A pod that fits no node stays pending without blocking smaller ones."""
+    server = cluster(nodes=2)
+    for name, cores in (("a", 3), ("b", 3), ("c", 3), ("d", 1)):
+        submit(server, name, cores)
+
+    assert [node(server, name) for name in "abcd"] == [
+        "fake-node-0",
+        "fake-node-1",
+        None,
+        "fake-node-0",
+    ]
+    assert all(job(server, name)["status"].get("startTime") for name in "abcd")
+
+    server.delete("jobs", DEFAULT_NAMESPACE, "b")
+    due(server)
+    assert node(server, "c") == "fake-node-1"
+
+
+def test_admission_within_quota() -> None:
+    """Workloads beyond the ClusterQueue quota wait, their jobs suspended."""
+    server = cluster(nodes=2, quota=0.5)
+    for name in "abc":
+        submit(server, name, 2, priority="low")
+
+    for name in "ab":
+        assert conditions(server, name)["Admitted"] == "True"
+        assert job(server, name)["spec"]["suspend"] is False
+        assert job(server, name)["status"]["startTime"]
+    assert "Admitted" not in conditions(server, "c")
+    assert job(server, "c")["spec"]["suspend"] is True
+    assert "startTime" not in job(server, "c")["status"]
+    assert node(server, "c") is None
+
+    server.delete("jobs", DEFAULT_NAMESPACE, "a")
+    due(server)
+    assert conditions(server, "c")["Admitted"] == "True"
+    assert node(server, "c") is not None
+
+
+def test_priority_preemption() -> None:
+    """A high priority workload preempts the newest low priority one only."""
+    server = cluster(nodes=1)
+    submit(server, "old", 2, priority="low")
+    submit(server, "new", 2, priority="low")
+    submit(server, "urgent", 2, priority="high")
+
+    assert conditions(server, "urgent")["Admitted"] == "True"
+    assert conditions(server, "old")["Admitted"] == "True"
+    assert conditions(server, "new")["Evicted"] == "True"
+    assert conditions(server, "new")["Admitted"] == "False"
+    assert job(server, "new")["spec"]["suspend"] is True
+    assert "startTime" not in job(server, "new")["status"]
+    assert node(server, "new") is None
+
+
+def test_watch_older_than_history() -> None:
+    """Watches from before the kept history get 410 Gone."""
+    server = cluster(nodes=1, history=2)
+    start: int = server.version
+    for num in range(4):
+        submit(server, f"job-{num}", 1)
+
+    with pytest.raises(fake.ApiError) as error:
+        server.changes("jobs", start, DEFAULT_NAMESPACE, selector(None), monotonic())
+    assert error.value.code == 410
+
+    kept: list[int] = server.collections["jobs"].versions
+    lines, version = server.changes(
+        "jobs", kept[-2], DEFAULT_NAMESPACE, selector(None), monotonic()
+    )
+    assert len(lines) == 1
+    assert version == kept[-1]
@@ -0,0 +1,40 @@
+"""Tests of the results and per-job timings files."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from kueuer.utils import io
+
+
+def test_jobs_gain_columns(tmp_path: Path) -> None:
+    """Rows with a new column keep older timings files readable."""
+    filename = str(tmp_path / "results.jobs.csv.gz")
+    io.save_jobs_to_csv([{"run_id": "a", "name": "a-0", "duration": 2.0}], filename)
+    io.save_jobs_to_csv(
+        [{"run_id": "b", "name": "b-0", "shape": "large", "duration": 3.0}], filename
+    )
+    io.save_jobs_to_csv([{"run_id": "c", "name": "c-0", "duration": 4.0}], filename)
+
+    jobs = pd.read_csv(filename)
+    assert jobs["run_id"].tolist() == ["a", "b", "c"]
+    assert jobs["duration"].tolist() == [2.0, 3.0, 4.0]
+    assert jobs["shape"].fillna("").tolist() == ["", "large", ""]
+
+
+def test_results_gain_columns(tmp_path: Path) -> None:
+    """Results with a new column keep older results files readable."""
+    filename = str(tmp_path / "results.csv")
+    io.save_performance_to_csv([{"jobs": 16, "use_kueue": True, "avg": 2.0}], filename)
+    io.save_performance_to_csv(
+        [{"jobs": 16, "use_kueue": True, "avg": 5.0, "arrival_rate": 2.0}], filename
+    )
+    io.save_performance_to_csv([{"jobs": 32, "avg": 4.0}], filename)
+
+    results = pd.read_csv(filename)
+    assert list(results.columns) == ["avg", "jobs", "use_kueue", "arrival_rate"]
+    assert results["avg"].tolist() == [2.0, 5.0, 4.0]
+    assert results["jobs"].tolist() == [16, 16, 32]
+    assert results["arrival_rate"].fillna(0).tolist() == [0, 2.0, 0]
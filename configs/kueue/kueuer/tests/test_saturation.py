@@ -0,0 +1,86 @@
+"""Tests of the saturation search of `kr benchmark performance --search`."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable
+
+import pytest
+
+from kueuer.benchmarks import saturation
+from kueuer.benchmarks.saturation import Probe
+
+
+def cluster(
+    throughput: Callable[[int], float], p99: Callable[[int], float]
+) -> Callable[[int], Awaitable[Probe]]:
+    """A probe measuring a modelled cluster instead of running jobs."""
+
+    async def probe(count: int) -> Probe:
+        return Probe(count=count, throughput=throughput(count), p99=p99(count))
+
+    return probe
+
+
+def congested(count: int) -> float:
+    """Throughput growing up to 300 jobs, then dropping."""
+    return count / 10 if count <= 300 else 300**2 / (10 * count)
+
+
+def search(
+    probe: Callable[[int], Awaitable[Probe]], **options: float
+) -> saturation.Saturation:
+    """Search between 16 and 4096 jobs."""
+    return asyncio.run(saturation.search(probe, 16, 4096, **options))
+
+
+def bracket(result: saturation.Saturation) -> tuple[int, int]:
+    """Last good and first saturated job count of the search."""
+    assert result.knee is not None
+    good = max(probe.count for probe in result.probes if probe.count < result.knee)
+    return good, result.knee
+
+
+def test_throughput_knee() -> None:
+    """The ramp doubles until throughput drops, then bisects around the knee."""
+    result = search(cluster(congested, lambda count: 10.0))
+
+    counts = [probe.count for probe in result.probes]
+    assert counts[:6] == [16, 32, 64, 128, 256, 512]
+    # 320 jobs are past the peak but still faster than any smaller count
+    assert bracket(result) == (320, 352)
+    assert 352 - 320 <= saturation.DEFAULT_RESOLUTION * 320
+    assert result.max_throughput == max(congested(count) for count in counts)
+    assert result.max_throughput_count == 320
+    assert result.p99_doubled is None
+
+
+def test_latency_knee() -> None:
+    """A doubled p99 saturates even while throughput still grows."""
+    result = search(cluster(lambda count: count / 10, lambda count: 1 + count / 100))
+
+    good, bad = bracket(result)
+    assert result.reference_p99 == pytest.approx(1.16)
+    assert 1 + good / 100 < 2 * 1.16 <= 1 + bad / 100
+    assert result.p99_doubled == bad
+
+
+def test_resolution_stops_bisection() -> None:
+    """Bisection stops once the bracket is within the resolution."""
+    probes: list[int] = []
+    for resolution in (0.5, 0.1, 0.01):
+        result = search(cluster(congested, lambda count: 10.0), resolution=resolution)
+        good, bad = bracket(result)
+        assert bad - good <= max(1, resolution * good)
+        probes.append(len(result.probes))
+    assert probes[0] < probes[1] < probes[2]
+
+
+def test_upper_bound() -> None:
+    """A cluster that never saturates is probed up to the upper bound."""
+    result = search(cluster(lambda count: count / 10, lambda count: 10.0))
+
+    assert [probe.count for probe in result.probes] == [16 * 2**num for num in range(9)]
+    assert result.knee is None
+    assert result.max_throughput_count == 4096
+    assert result.record()["probes"] == 9
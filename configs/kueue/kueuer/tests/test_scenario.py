@@ -0,0 +1,111 @@
+"""Tests of the scenario files of `kr benchmark scenario`."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from kueuer.benchmarks import DEFAULT_JOBSPEC_FILEPATH, DEFAULT_NAMESPACE, scenario
+from kueuer.benchmarks.scenario import Cell
+
+SCENARIO = """
+namespace: bench
+defaults:
+  duration: 10
+  kueue: queue
+  priority: high
+  use_kueue: [false, true]
+grid:
+  count: [16, 64]
+  cores: [1, 4]
+cells:
+  - {count: 16, cores: 1}
+  - {count: 32, priority: [low, high], use_kueue: true}
+  - {count: 8, arrival: poisson, rate: 2}
+"""
+
+
+def test_parse(tmp_path: Path) -> None:
+    """Grid and cells expand over defaults, without duplicates."""
+    path = tmp_path / "scenario.yaml"
+    path.write_text(SCENARIO, encoding="utf-8")
+    found = scenario.load(str(path))
+
+    assert found.namespace == "bench"
+    assert found.filepath == DEFAULT_JOBSPEC_FILEPATH
+    assert len(found.cells) == 2 * 2 * 2 + 2 + 2
+    # The product follows the order of the keys, defaults first
+    assert [(cell.use_kueue, cell.count, cell.cores) for cell in found.cells[:8]] == [
+        (False, 16, 1),
+        (False, 16, 4),
+        (False, 64, 1),
+        (False, 64, 4),
+        (True, 16, 1),
+        (True, 16, 4),
+        (True, 64, 1),
+        (True, 64, 4),
+    ]
+    assert found.cells[4] == Cell(
+        count=16, duration=10, use_kueue=True, kueue="queue", priority="high"
+    )
+    assert [cell.priority for cell in found.cells if cell.count == 32] == [
+        "low",
+        "high",
+    ]
+    paced = [cell for cell in found.cells if cell.count == 8]
+    assert [cell.use_kueue for cell in paced] == [False, True]
+    assert all(cell.process().paced for cell in paced)
+    # Queueing fields only tell Kueue cells apart
+    assert all(cell.kueue is None for cell in found.cells if not cell.use_kueue)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"grid": {"count": [1], "gpus": [1]}},
+        {"grid": {"cores": [1, 2]}},
+        {"cells": [{"count": 1, "use_kueue": True, "kueue": "queue"}]},
+        {"cells": [{"count": 1, "arrival": "poisson"}]},
+        {"namespace": "bench"},
+    ],
+)
+def test_parse_errors(data: dict[str, Any]) -> None:
+    """Unknown fields, missing counts, queues or rates, and empty scenarios."""
+    with pytest.raises(ValueError):
+        scenario.parse(data)
+
+
+def test_parse_defaults() -> None:
+    """A scenario without a namespace runs in the default one."""
+    found = scenario.parse({"cells": [{"count": 1}]})
+    assert found.namespace == DEFAULT_NAMESPACE
+    assert found.cells == [Cell(count=1)]
+
+
+def test_order() -> None:
+    """Shapes run back to back, counts alternate direction between shapes."""
+    cells = [
+        Cell(count=count, cores=cores, use_kueue=kueue, kueue="q" if kueue else None)
+        for kueue in (True, False)
+        for cores in (4, 1)
+        for count in (16, 64, 256)
+    ]
+
+    ordered = scenario.order(cells)
+    assert sorted(ordered, key=repr) == sorted(cells, key=repr)
+    assert [(cell.cores, cell.count, cell.use_kueue) for cell in ordered] == [
+        (1, 16, False),
+        (1, 16, True),
+        (1, 64, False),
+        (1, 64, True),
+        (1, 256, False),
+        (1, 256, True),
+        (4, 256, False),
+        (4, 256, True),
+        (4, 64, False),
+        (4, 64, True),
+        (4, 16, False),
+        (4, 16, True),
+    ]
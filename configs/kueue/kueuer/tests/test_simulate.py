@@ -0,0 +1,100 @@
+"""Tests of the admission simulation of `kr simulate`."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from kueuer.benchmarks import simulate
+from kueuer.benchmarks.trace import Arrival
+
+
+def queue(
+    name: str,
+    cores: int,
+    cohort: str | None = None,
+    borrowing: int | None = None,
+    lending: int | None = None,
+    **policies: str,
+) -> simulate.ClusterQueue:
+    """A ClusterQueue with a CPU quota of one flavor."""
+    return simulate.ClusterQueue(
+        name=name,
+        cohort=cohort,
+        groups=[(("cpu",), ("default",))],
+        quotas={
+            ("default", "cpu"): simulate.Quota(
+                nominal=cores * simulate.MILLI,
+                borrowing=None if borrowing is None else borrowing * simulate.MILLI,
+                lending=None if lending is None else lending * simulate.MILLI,
+            )
+        },
+        **policies,
+    )
+
+
+def job(submit: float, cores: float, **options: Any) -> Arrival:
+    """A CPU-only job that outlasts the tests."""
+    return Arrival(
+        submit=submit, cores=cores, ram=0, storage=0, duration=100.0, **options
+    )
+
+
+def tallies(report: simulate.Report, field: str) -> dict[tuple[str, str], int]:
+    """A column of the report by ClusterQueue and priority."""
+    return {(row["clusterqueue"], row["priority"]): row[field] for row in report.queues}
+
+
+def test_preemption_spares_victims() -> None:
+    """A high 20c job preempts a low 20c job only.
+
+    The 4c job, admitted last, is the first candidate but is put back once
+    the 20c job behind it made its eviction unnecessary.
+    """
+    config = simulate.Config(
+        clusterqueues={"cq": queue("cq", 48, within="LowerPriority")},
+        priorities={"low": 1, "high": 2},
+    )
+    arrivals = [
+        job(0.0, 20, priority="low"),
+        job(0.1, 20, priority="low"),
+        job(0.2, 4, priority="low"),
+        job(1.0, 20, priority="high"),
+    ]
+
+    report = simulate.Simulator(config).run(arrivals, until=2.0)
+    assert tallies(report, "preemptions") == {("cq", "low"): 1, ("cq", "high"): 0}
+    assert tallies(report, "admitted") == {("cq", "low"): 3, ("cq", "high"): 1}
+
+
+@pytest.mark.parametrize(
+    ("strategy", "admitted"), [("BestEffortFIFO", 2), ("StrictFIFO", 1)]
+)
+def test_head_of_line_blocking(strategy: str, admitted: int) -> None:
+    """Only StrictFIFO keeps a small job behind a head that does not fit."""
+    config = simulate.Config(clusterqueues={"cq": queue("cq", 10)})
+    arrivals = [job(0.0, 8), job(1.0, 4), job(2.0, 2)]
+
+    report = simulate.Simulator(config, strategy).run(arrivals, until=5.0)
+    assert tallies(report, "admitted") == {("cq", "0"): admitted}
+
+
+@pytest.mark.parametrize(
+    ("borrowing", "lending", "admitted"),
+    [(None, None, 20), (3, None, 13), (None, 2, 12)],
+)
+def test_cohort_limits(
+    borrowing: int | None, lending: int | None, admitted: int
+) -> None:
+    """A queue borrows what the cohort lends, up to its borrowing limit."""
+    config = simulate.Config(
+        clusterqueues={
+            "a": queue("a", 10, cohort="pool", borrowing=borrowing),
+            "b": queue("b", 10, cohort="pool", lending=lending),
+        }
+    )
+    arrivals = [job(0.0, 1, queue="a") for _num in range(24)]
+
+    report = simulate.Simulator(config).run(arrivals, until=1.0)
+    assert tallies(report, "admitted") == {("a", "0"): admitted}
@@ -0,0 +1,107 @@
+"""Tests of the streaming statistics of the benchmarks."""
+
+from __future__ import annotations
+
+import math
+import random
+import statistics
+
+import pytest
+
+from kueuer.utils import stats
+
+
+def durations(count: int, seed: int) -> list[float]:
+    """Skewed job durations, like those of a loaded cluster."""
+    rng = random.Random(seed)
+    return [rng.lognormvariate(3.0, 1.0) for _num in range(count)]
+
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+def test_sketch_accuracy(accuracy: float) -> None:
+    """Every quantile is within the relative accuracy of the exact one."""
+    values = durations(5000, seed=1)
+    sketch = stats.Sketch(accuracy)
+    for value in values:
+        sketch.add(value)
+
+    ranked = sorted(values)
+    for q in (0.0, 0.01, 0.25, 0.5, 0.9, 0.99, 1.0):
+        exact = ranked[math.floor(q * (len(ranked) - 1))]
+        estimate = sketch.quantile(q)
+        assert estimate is not None
+        assert abs(estimate - exact) <= accuracy * exact
+
+
+def test_sketch_zeros_and_empty() -> None:
+    """Values at or below zero share a bucket, an empty sketch has no quantile."""
+    sketch = stats.Sketch()
+    assert sketch.quantile(0.5) is None
+    for value in (0.0, -1.0, 0.0, 10.0):
+        sketch.add(value)
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(10.0, rel=stats.DEFAULT_ACCURACY)
+
+
+def test_sketch_merge() -> None:
+    """Merged sketches equal the sketch of all the values."""
+    values = durations(1000, seed=2)
+    whole, first, second = stats.Sketch(), stats.Sketch(), stats.Sketch()
+    for value in values:
+        whole.add(value)
+    for value in values[:300]:
+        first.add(value)
+    for value in values[300:]:
+        second.add(value)
+    first.merge(second)
+
+    assert first.count == whole.count
+    assert first.buckets == whole.buckets
+    assert first.quantile(0.99) == whole.quantile(0.99)
+    with pytest.raises(ValueError):
+        first.merge(stats.Sketch(0.05))
+
+
+def test_stream_moments() -> None:
+    """Welford's mean and variance stay exact on a large offset."""
+    values = [1e9 + value for value in durations(1000, seed=3)]
+    stream = stats.Stream()
+    stream.extend(values)
+
+    assert stream.count == len(values)
+    assert stream.mean == pytest.approx(statistics.fmean(values), rel=1e-12)
+    assert stream.stddev == pytest.approx(statistics.stdev(values), rel=1e-6)
+    assert (stream.min, stream.max) == (min(values), max(values))
+
+
+def test_stream_merge() -> None:
+    """Merged streams have the moments and extremes of all the values."""
+    values = durations(1000, seed=4)
+    merged, other = stats.Stream(), stats.Stream()
+    merged.extend(values[:10])
+    other.extend(values[10:])
+    merged.merge(other)
+    merged.merge(stats.Stream())
+
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(statistics.fmean(values))
+    assert merged.stddev == pytest.approx(statistics.stdev(values))
+    assert (merged.min, merged.max) == (min(values), max(values))
+    top = merged.quantile(1.0)
+    assert top is not None and top <= max(values)
+    assert top == pytest.approx(max(values), rel=stats.DEFAULT_ACCURACY)
+
+
+def test_stream_summary() -> None:
+    """Summaries of an empty stream are blank, not zero."""
+    summary = stats.Stream().summary("duration_")
+    assert set(summary) == {
+        "duration_mean",
+        "duration_stddev",
+        "duration_p50",
+        "duration_p90",
+        "duration_p95",
+        "duration_p99",
+        "duration_max",
+    }
+    assert all(value is None for value in summary.values())